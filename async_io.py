@@ -0,0 +1,87 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class IOTask:
+    """Handle for a blocking call running on the I/O pool"""
+
+    def __init__(self, future, on_done, on_error, group):
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.group = group
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the task; its callbacks will not run even if it already finished"""
+        self.cancelled = True
+        self.future.cancel()
+
+
+class AsyncIO:
+    """Run blocking I/O on a thread pool and deliver results on the Tk main loop.
+
+    Worker threads never touch Tk. Finished tasks are queued and picked up by an
+    after() poll on the main thread, which only runs while tasks are pending.
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=15):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+        self.finished = queue.SimpleQueue()
+        self.pending = set()
+        self.poll_id = None
+
+    def submit(self, func, *args, on_done=None, on_error=None, group=None):
+        """Run func(*args) on a worker and call on_done(result) on the main thread"""
+        future = self.executor.submit(func, *args)
+        task = IOTask(future, on_done, on_error, group)
+        self.pending.add(task)
+        future.add_done_callback(lambda f: self.finished.put(task))
+        if self.poll_id is None:
+            self.poll_id = self.root.after(self.poll_interval, self.poll)
+        return task
+
+    def cancel_group(self, group):
+        """Cancel every pending task submitted with the given group"""
+        for task in list(self.pending):
+            if task.group == group:
+                task.cancel()
+
+    def poll(self):
+        """Dispatch callbacks of finished tasks (main thread)"""
+        self.poll_id = None
+        while True:
+            try:
+                task = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(task)
+            if task.cancelled or task.future.cancelled():
+                continue
+
+            # A failing callback must not stop the poll, or later results would be dropped
+            try:
+                error = task.future.exception()
+                if error is not None:
+                    if task.on_error:
+                        task.on_error(error)
+                    else:
+                        print(f"Background task failed: {error}")
+                elif task.on_done:
+                    task.on_done(task.future.result())
+            except Exception as e:
+                print(f"Error in background task callback: {e}")
+
+        if self.pending:
+            self.poll_id = self.root.after(self.poll_interval, self.poll)
+
+    def shutdown(self, wait=False):
+        """Cancel pending tasks and stop the worker pool, optionally waiting for running ones"""
+        for task in list(self.pending):
+            task.cancel()
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,194 @@
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+
+def empty_stats():
+    """Create empty attempt aggregates"""
+    return {
+        "last_seq": 0,
+        "exercises": {},
+        "lessons": {}
+    }
+
+
+def fold_attempt(stats, event):
+    """Fold a single attempt event into the aggregates"""
+    for table, key in (("exercises", event["exercise_id"]), ("lessons", str(event["lesson"]))):
+        entry = stats[table].setdefault(key, {
+            "attempts": 0,
+            "correct": 0,
+            "total_latency": 0.0,
+            "last_attempt": 0.0
+        })
+        entry["attempts"] += 1
+        entry["correct"] += 1 if event["correct"] else 0
+        entry["total_latency"] += event["latency"]
+        entry["last_attempt"] = max(entry["last_attempt"], event["time"])
+        if table == "exercises":
+            entry["lesson"] = event["lesson"]
+    stats["last_seq"] = max(stats["last_seq"], event["seq"])
+
+
+class AttemptLog:
+    """Append-only exercise attempt log, written in batches on a background thread.
+
+    Each attempt is appended to the log as one JSON line carrying a sequence
+    number. Compaction folds logged attempts into per-exercise and per-lesson
+    aggregates, saves them with the last folded sequence number and truncates
+    the log, so an interrupted compaction never counts an attempt twice.
+    """
+
+    def __init__(self, log_file="attempts.log", stats_file="attempt_stats.json",
+                 batch_size=50, flush_interval=2.0,
+                 compact_bytes=4 * 1024 * 1024, compact_interval=300.0):
+        self.log_file = Path(log_file)
+        self.stats_file = Path(stats_file)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+        self.compact_interval = compact_interval
+
+        self.lock = threading.Lock()
+        self.stats = self.load_stats()
+        self.next_seq = self.stats["last_seq"] + 1
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run_writer, name="attempt-log", daemon=True)
+        self.thread.start()
+
+    def load_stats(self):
+        """Load compacted aggregates from file"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return empty_stats()
+        except (json.JSONDecodeError, IOError):
+            print("Error loading attempt statistics, starting fresh.")
+            return empty_stats()
+
+    def record(self, lesson_number, exercise_id, answer, correct, latency):
+        """Queue an attempt for writing; never blocks on disk I/O"""
+        self.queue.put({
+            "time": time.time(),
+            "lesson": lesson_number,
+            "exercise_id": exercise_id,
+            "answer": answer,
+            "correct": bool(correct),
+            "latency": round(latency, 4)
+        })
+
+    def get_exercise_stats(self, exercise_id):
+        """Get aggregates for one exercise, or None if never attempted"""
+        with self.lock:
+            entry = self.stats["exercises"].get(exercise_id)
+            return dict(entry) if entry else None
+
+    def get_lesson_stats(self, lesson_number):
+        """Get aggregates for one lesson, or None if never attempted"""
+        with self.lock:
+            entry = self.stats["lessons"].get(str(lesson_number))
+            return dict(entry) if entry else None
+
+    def close(self):
+        """Flush queued attempts, compact and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def run_writer(self):
+        """Writer thread: batch queued attempts into the log and compact periodically"""
+        self.compact()
+        last_compact = time.monotonic()
+
+        while True:
+            batch, stopping = self.next_batch()
+            if batch:
+                self.append(batch)
+
+            now = time.monotonic()
+            if stopping or self.log_size() >= self.compact_bytes or (
+                    now - last_compact >= self.compact_interval and self.log_size() > 0):
+                self.compact()
+                last_compact = now
+            if stopping:
+                return
+
+    def next_batch(self):
+        """Wait for up to batch_size attempts or flush_interval seconds"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                event = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if event is None:
+                return batch, True
+            batch.append(event)
+        return batch, False
+
+    def append(self, batch):
+        """Append a batch of attempts to the log and fold them into live aggregates"""
+        # Sequence numbers are assigned here, after the startup compaction has
+        # seen every attempt already in the log
+        for event in batch:
+            event["seq"] = self.next_seq
+            self.next_seq += 1
+        lines = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in batch)
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        except IOError as e:
+            print(f"Error writing attempt log: {e}")
+            return
+
+        with self.lock:
+            for event in batch:
+                fold_attempt(self.stats, event)
+
+    def log_size(self):
+        try:
+            return self.log_file.stat().st_size
+        except OSError:
+            return 0
+
+    def compact(self):
+        """Fold the log into the saved aggregates and truncate it"""
+        with self.lock:
+            stats = json.loads(json.dumps(self.stats))
+
+        # Replay attempts written since the last compaction (e.g. before a crash)
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from an interrupted write
+                    if event["seq"] > stats["last_seq"]:
+                        fold_attempt(stats, event)
+        except FileNotFoundError:
+            pass
+        except IOError as e:
+            print(f"Error reading attempt log: {e}")
+            return
+
+        try:
+            tmp_file = self.stats_file.with_name(self.stats_file.name + ".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, ensure_ascii=False)
+            os.replace(tmp_file, self.stats_file)
+            open(self.log_file, 'w').close()
+        except IOError as e:
+            print(f"Error compacting attempt log: {e}")
+            return
+
+        with self.lock:
+            self.stats = stats
+        self.next_seq = max(self.next_seq, stats["last_seq"] + 1)
@@ -0,0 +1,63 @@
+import time
+
+
+class ChunkedRenderer:
+    """Build long lists of widgets in time-sliced chunks on the Tk main loop.
+
+    Each slice calls build steps until the per-frame budget is used up, then
+    yields to the event loop with after() so the window can draw and handle
+    input before the next slice. The first slice runs right away, so the top
+    of the view appears without waiting for the rest.
+    """
+
+    def __init__(self, root, budget=0.012, delay=1):
+        self.root = root
+        self.budget = budget
+        self.delay = delay
+        self.steps = None
+        self.position = 0
+        self.on_done = None
+        self.after_id = None
+
+    @property
+    def pending(self):
+        return self.steps is not None
+
+    def run(self, steps, on_done=None):
+        """Call each step (a no-argument callable) in order, in budgeted slices"""
+        self.cancel()
+        self.steps = list(steps)
+        self.position = 0
+        self.on_done = on_done
+        self.run_slice()
+
+    def run_slice(self):
+        self.after_id = None
+        deadline = time.monotonic() + self.budget
+        steps = self.steps
+        while self.position < len(steps):
+            step = steps[self.position]
+            self.position += 1
+            step()
+            if self.steps is not steps:
+                # A step navigated away and cancelled this run
+                return
+            if time.monotonic() >= deadline:
+                break
+
+        if self.position < len(steps):
+            self.after_id = self.root.after(self.delay, self.run_slice)
+            return
+        on_done = self.on_done
+        self.steps = None
+        self.on_done = None
+        if on_done:
+            on_done()
+
+    def cancel(self):
+        """Drop the steps that have not run yet"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.steps = None
+        self.on_done = None
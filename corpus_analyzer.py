@@ -0,0 +1,249 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import statistics
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from grammar_index import lesson_grammar
+from hangul import normalize
+from lesson_compiler import CACHE_DIR_NAME, content_hash
+from lesson_manager import LESSON_FILE_PATTERN
+
+# Bump when the partial result format changes so cached results are recomputed
+ANALYZER_VERSION = 2
+CACHE_FILE_NAME = "analysis.json"
+SIZE_FIELDS = ("vocabulary", "grammar_rules", "example_sentences", "exercises", "bytes")
+PUNCTUATION = ".,!?\"'()[]…~:;"
+
+# Below this many changed files the process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+
+def sentence_tokens(text):
+    """Split a Korean sentence into words without surrounding punctuation"""
+    return [token for token in (t.strip(PUNCTUATION) for t in normalize(text).split()) if token]
+
+
+def analyze_lesson(lesson, size):
+    """Compute the partial result of one lesson (map step)"""
+    tokens = []
+    for sentence in lesson.get("example_sentences", []):
+        tokens.extend(sentence_tokens(sentence["korean"]))
+    return {
+        "lesson_number": lesson.get("lesson_number", 0),
+        "lesson_title": lesson.get("lesson_title", "Unknown"),
+        "sizes": {
+            "vocabulary": len(lesson.get("vocabulary", [])),
+            "grammar_rules": len(lesson.get("grammar_rules", [])),
+            "example_sentences": len(lesson.get("example_sentences", [])),
+            "exercises": len(lesson.get("exercises", [])),
+            "bytes": size
+        },
+        "vocabulary": [[normalize(v["korean"]), v["english"]] for v in lesson.get("vocabulary", [])],
+        "taught_rules": [rule["rule_id"] for rule in lesson.get("grammar_rules", [])],
+        "exercised_rules": [rule_id for rule_id, entry in lesson_grammar(lesson).items() if entry["exercises"]],
+        "sentences": [normalize(sentence["korean"]) for sentence in lesson.get("example_sentences", [])],
+        "sentence_tokens": tokens
+    }
+
+
+def analyze_file(path):
+    """Read, hash and analyze one lesson file in a worker process"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        lesson = json.loads(data.decode('utf-8'))
+        return path, content_hash(data), analyze_lesson(lesson, len(data)), None
+    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, IndexError, TypeError, AttributeError,
+            IOError) as e:
+        return path, None, None, str(e)
+
+
+class CorpusAnalyzer:
+    """Map-reduce analysis of every lesson, with per-file results cached by content hash.
+
+    Files whose size and mtime are unchanged reuse their cached partial
+    result without being read; the rest are analyzed in a process pool.
+    """
+
+    def __init__(self, lessons_dir="lessons", workers=None):
+        self.lessons_dir = Path(lessons_dir)
+        self.workers = workers
+        self.cache_file = self.lessons_dir / CACHE_DIR_NAME / CACHE_FILE_NAME
+        self.files = self.load_cache()
+        self.errors = {}
+
+    def load_cache(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, IOError):
+            return {}
+        return data.get("files", {}) if data.get("version") == ANALYZER_VERSION else {}
+
+    def save_cache(self):
+        self.cache_file.parent.mkdir(exist_ok=True)
+        tmp_path = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": ANALYZER_VERSION, "files": self.files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_file)
+
+    def collect(self, parallel=True):
+        """Bring cached partial results up to date, returning the number of files analyzed"""
+        stale = {}
+        current = {}
+        for entry in os.scandir(self.lessons_dir):
+            if not LESSON_FILE_PATTERN.match(entry.name):
+                continue
+            stat = entry.stat()
+            record = self.files.get(entry.name)
+            if record and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                current[entry.name] = record
+            else:
+                stale[entry.path] = (entry.name, stat)
+
+        if parallel and len(stale) >= POOL_THRESHOLD:
+            chunksize = max(1, len(stale) // ((self.workers or os.cpu_count() or 1) * 4))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(analyze_file, stale, chunksize=chunksize))
+        else:
+            results = [analyze_file(path) for path in stale]
+
+        analyzed = 0
+        for path, source_hash, partial, error in results:
+            name, stat = stale[path]
+            if error:
+                self.errors[name] = error
+                continue
+            record = self.files.get(name)
+            if not record or record["hash"] != source_hash:
+                record = {"hash": source_hash, "partial": partial}
+                analyzed += 1
+            record.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            current[name] = record
+
+        changed = bool(stale) or len(current) != len(self.files)
+        self.files = current
+        if changed:
+            try:
+                self.save_cache()
+            except IOError as e:
+                print(f"Error saving analysis cache: {e}")
+        return analyzed
+
+    def partials(self):
+        """Get the cached partial results in lesson order"""
+        return sorted((record["partial"] for record in self.files.values()),
+                      key=lambda partial: partial["lesson_number"])
+
+    def report(self, top=20):
+        """Reduce the partial results into a corpus report"""
+        partials = self.partials()
+
+        word_counts = Counter()
+        vocab_lessons = defaultdict(list)
+        vocab_english = defaultdict(set)
+        taught = defaultdict(list)
+        exercised = set()
+        fragments = set()
+        for partial in partials:
+            number = partial["lesson_number"]
+            word_counts.update(partial["sentence_tokens"])
+            for token in set(partial["sentence_tokens"]):
+                # A word counts as used when it is part of a sentence word (선생님 in 김선생님은)
+                fragments.update(token[start:end] for start in range(len(token))
+                                 for end in range(start + 1, len(token) + 1))
+            for korean, english in partial["vocabulary"]:
+                vocab_lessons[korean].append(number)
+                vocab_english[korean].add(english)
+            for rule_id in partial["taught_rules"]:
+                taught[rule_id].append(number)
+            exercised.update(partial["exercised_rules"])
+
+        duplicates = [{"korean": korean, "lessons": lessons, "english": sorted(vocab_english[korean])}
+                      for korean, lessons in vocab_lessons.items() if len(lessons) > 1]
+        duplicates.sort(key=lambda duplicate: (-len(duplicate["lessons"]), duplicate["korean"]))
+
+        # Verbs and adjectives appear conjugated, so look for their stem (먹다 -> 먹)
+        unused_vocab = []
+        for korean, lessons in vocab_lessons.items():
+            stem = korean[:-1] if korean.endswith("다") and len(korean) > 1 else korean
+            if stem not in fragments:
+                unused_vocab.append({"korean": korean, "lessons": lessons})
+
+        sizes = {}
+        for field in SIZE_FIELDS:
+            values = [partial["sizes"][field] for partial in partials]
+            if values:
+                sizes[field] = {"min": min(values), "median": statistics.median(values),
+                                "mean": round(statistics.fmean(values), 1), "max": max(values),
+                                "total": sum(values)}
+        largest = sorted(partials, key=lambda partial: -partial["sizes"]["bytes"])[:5]
+
+        return {
+            "lessons": len(partials),
+            "errors": self.errors,
+            "word_frequency": word_counts.most_common(top),
+            "duplicate_vocabulary": duplicates,
+            "rules_without_exercises": [{"rule_id": rule_id, "lessons": lessons}
+                                        for rule_id, lessons in sorted(taught.items())
+                                        if rule_id not in exercised],
+            "vocabulary_not_in_examples": unused_vocab,
+            "lesson_sizes": sizes,
+            "largest_lessons": [{"lesson": partial["lesson_number"], "title": partial["lesson_title"],
+                                 "bytes": partial["sizes"]["bytes"]} for partial in largest]
+        }
+
+
+def print_report(report, limit=20):
+    print(f"{report['lessons']} lessons analyzed")
+    for name, error in report["errors"].items():
+        print(f"  Error in {name}: {error}")
+
+    print("\nMost frequent words in example sentences:")
+    for word, count in report["word_frequency"]:
+        print(f"  {word}: {count}")
+
+    duplicates = report["duplicate_vocabulary"]
+    print(f"\nVocabulary in more than one lesson: {len(duplicates)}")
+    for duplicate in duplicates[:limit]:
+        print(f"  {duplicate['korean']} ({', '.join(duplicate['english'])}): "
+              f"lessons {', '.join(map(str, duplicate['lessons']))}")
+
+    rules = report["rules_without_exercises"]
+    print(f"\nGrammar rules without exercises: {len(rules)}")
+    for rule in rules[:limit]:
+        print(f"  {rule['rule_id']} (lessons {', '.join(map(str, rule['lessons']))})")
+
+    unused = report["vocabulary_not_in_examples"]
+    print(f"\nVocabulary never used in an example sentence: {len(unused)}")
+    for vocab in unused[:limit]:
+        print(f"  {vocab['korean']} (lessons {', '.join(map(str, vocab['lessons']))})")
+
+    print("\nLesson sizes (min / median / mean / max, total):")
+    for field, stats in report["lesson_sizes"].items():
+        print(f"  {field}: {stats['min']} / {stats['median']} / {stats['mean']} / {stats['max']}, "
+              f"{stats['total']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report duplicates, coverage gaps and sizes across all lessons")
+    parser.add_argument("lessons_dir", nargs="?", default="lessons")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--top", type=int, default=20, help="number of frequent words to list")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    analyzer = CorpusAnalyzer(args.lessons_dir, args.workers)
+    analyzer.collect()
+    report = analyzer.report(args.top)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from hangul import english_sort_key
+
+# Lessons without a "unit" field are grouped by number range
+UNIT_SIZE = 10
+
+
+def unit_for(lesson):
+    """Get the (key, title) of the unit a lesson belongs to"""
+    unit = lesson.get("unit")
+    if unit is None:
+        start = (lesson["number"] - 1) // UNIT_SIZE * UNIT_SIZE + 1
+        return ("range", start), f"Lessons {start}-{start + UNIT_SIZE - 1}"
+    if isinstance(unit, int):
+        return ("unit", unit), f"Unit {unit}"
+    return ("unit", unit), str(unit)
+
+
+class CourseTree:
+    """Group lessons into units with completion counts kept up to date.
+
+    Units are built once from the lesson list; marking a lesson completed
+    updates its unit's count in O(1), so the selection screen never has to
+    walk every lesson to show progress. rows() returns the flattened tree
+    for the units that are expanded. Locking comes from an optional
+    PrerequisiteGraph; without one every lesson is unlocked.
+    """
+
+    def __init__(self, lessons, completed_lessons=(), get_title=None, prerequisites=None):
+        self.get_title = get_title or (lambda lesson: lesson["title"])
+        self.prerequisites = prerequisites
+        self.completed = set(completed_lessons)
+        self.units = []
+        self.unit_of = {}
+        self.search_keys = None
+
+        units = {}
+        for lesson in lessons:
+            key, title = unit_for(lesson)
+            unit = units.get(key)
+            if unit is None:
+                unit = {"key": key, "title": title, "lessons": [], "completed": 0}
+                units[key] = unit
+                self.units.append(unit)
+            unit["lessons"].append(lesson)
+            self.unit_of[lesson["number"]] = unit
+            if lesson["number"] in self.completed:
+                unit["completed"] += 1
+
+        self.units.sort(key=lambda unit: unit["lessons"][0]["number"])
+
+    def is_completed(self, lesson_number):
+        return lesson_number in self.completed
+
+    def is_unlocked(self, lesson_number):
+        return self.prerequisites is None or self.prerequisites.is_unlocked(lesson_number)
+
+    def missing_prerequisites(self, lesson_number):
+        """Get the prerequisites of a lesson that are not completed yet"""
+        if self.prerequisites is None:
+            return []
+        return self.prerequisites.missing_prerequisites(lesson_number)
+
+    def mark_completed(self, lesson_number):
+        """Count a newly completed lesson towards its unit"""
+        if lesson_number in self.completed:
+            return
+        self.completed.add(lesson_number)
+        unit = self.unit_of.get(lesson_number)
+        if unit:
+            unit["completed"] += 1
+
+    def rows(self, expanded=()):
+        """Get ("unit", unit) and ("lesson", lesson) rows with expanded units opened"""
+        rows = []
+        for unit in self.units:
+            rows.append(("unit", unit))
+            if unit["key"] in expanded:
+                rows.extend(("lesson", lesson) for lesson in unit["lessons"])
+        return rows
+
+    def filter_rows(self, text):
+        """Get rows for lessons whose title or number matches, under their units"""
+        query = english_sort_key(text)
+        if not query:
+            return self.rows()
+        if self.search_keys is None:
+            # Built on first search so lazily listed lessons only read titles when needed
+            self.search_keys = {
+                lesson["number"]: english_sort_key(f"{lesson['number']} {self.get_title(lesson)}")
+                for unit in self.units for lesson in unit["lessons"]
+            }
+
+        rows = []
+        for unit in self.units:
+            matches = [lesson for lesson in unit["lessons"]
+                       if query in self.search_keys[lesson["number"]]]
+            if matches:
+                rows.append(("unit", unit))
+                rows.extend(("lesson", lesson) for lesson in matches)
+        return rows
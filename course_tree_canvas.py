@@ -0,0 +1,127 @@
+from vocab_cards import CARD_BG, CARD_BORDER, MUTED_COLOR, TEXT_COLOR, VocabCardCanvas
+
+UNIT_FONT = ('Arial', 16, 'bold')
+UNIT_PROGRESS_FONT = ('Arial', 12)
+LESSON_TITLE_FONT = ('Arial', 14, 'bold')
+
+UNIT_BG = '#e5e7eb'
+COMPLETED_BG = '#d1fae5'
+COMPLETED_COLOR = '#065f46'
+LOCKED_BG = '#f3f4f6'
+
+LESSON_INDENT = 30
+
+
+class CourseTreeCanvas(VocabCardCanvas):
+    """Show a CourseTree as collapsible unit rows with lesson rows underneath.
+
+    Only expanded units contribute lesson rows, and only rows in view are
+    drawn, so the cost of showing the tree does not grow with the number of
+    lessons in collapsed units. Clicking a unit toggles it; clicking an
+    unlocked lesson calls on_select with the lesson number.
+    """
+
+    def __init__(self, parent, tree, on_select, expanded=None, **kwargs):
+        super().__init__(parent, layout="inline", **kwargs)
+        self.tree = tree
+        self.on_select = on_select
+        self.expanded = expanded if expanded is not None else set()
+        self.filter_text = ""
+
+    def refresh(self, keep_position=True):
+        """Rebuild the rows from the tree, the expanded units and the filter"""
+        if self.filter_text:
+            rows = self.tree.filter_rows(self.filter_text)
+        else:
+            rows = self.tree.rows(self.expanded)
+        self.set_rows(rows, keep_position)
+
+    def set_filter(self, text):
+        """Only show lessons matching text, with their units opened"""
+        text = text.strip()
+        if text != self.filter_text:
+            self.filter_text = text
+            self.refresh(keep_position=False)
+
+    def toggle(self, unit):
+        """Expand or collapse a unit"""
+        if unit["key"] in self.expanded:
+            self.expanded.discard(unit["key"])
+        else:
+            self.expanded.add(unit["key"])
+        self.refresh()
+
+    def row_height(self, kind):
+        m = self.metrics
+        if kind == "unit":
+            return max(m.linespace(UNIT_FONT), m.linespace(UNIT_PROGRESS_FONT)) + 24, 4
+        return m.linespace(LESSON_TITLE_FONT) + 20, 3
+
+    def layout_row(self, index):
+        items = self.layout_cache.get(index)
+        if items is not None:
+            return items
+
+        kind, data = self.rows[index]
+        middle = self.heights[index] // 2
+        if kind == "unit":
+            is_open = self.filter_text or data["key"] in self.expanded
+            arrow = "▼" if is_open else "▶"
+            total = len(data["lessons"])
+            progress = f"{data['completed']}/{total} completed"
+            color = COMPLETED_COLOR if data["completed"] == total else MUTED_COLOR
+            items = [
+                (15, middle, f"{arrow}  {data['title']}", UNIT_FONT, TEXT_COLOR, "w"),
+                (-15, middle, progress, UNIT_PROGRESS_FONT, color, "e"),
+            ]
+        else:
+            title = f"Lesson {data['number']}: {self.tree.get_title(data)}"
+            if self.tree.is_completed(data["number"]):
+                items = [(15, middle, title + " ✓", LESSON_TITLE_FONT, COMPLETED_COLOR, "w")]
+            elif not self.tree.is_unlocked(data["number"]):
+                missing = ", ".join(str(number) for number in self.tree.missing_prerequisites(data["number"]))
+                items = [
+                    (15, middle, title, LESSON_TITLE_FONT, MUTED_COLOR, "w"),
+                    (-15, middle, f"🔒 needs lesson {missing}", UNIT_PROGRESS_FONT, MUTED_COLOR, "e"),
+                ]
+            else:
+                items = [(15, middle, title, LESSON_TITLE_FONT, TEXT_COLOR, "w")]
+
+        self.layout_cache[index] = items
+        return items
+
+    def draw_row(self, index):
+        kind, data = self.rows[index]
+        tag = f"row{index}"
+        left = self.padx
+        right = self.content_width() - self.padx
+        top = self.offsets[index]
+
+        if kind == "unit":
+            fill = UNIT_BG
+        else:
+            left += LESSON_INDENT
+            if self.tree.is_completed(data["number"]):
+                fill = COMPLETED_BG
+            elif not self.tree.is_unlocked(data["number"]):
+                fill = LOCKED_BG
+            else:
+                fill = CARD_BG
+        self.create_rectangle(left, top, right, top + self.heights[index],
+                              fill=fill, outline=CARD_BORDER, width=1, tags=(tag,))
+        for x, y, text, font, color, anchor in self.layout_row(index):
+            x = right + x if x < 0 else left + x
+            self.create_text(x, top + y, text=text, font=font, fill=color,
+                             anchor=anchor, tags=(tag,))
+        self.drawn[index] = True
+
+    def on_button_click(self, event):
+        index = self.row_at(self.canvasy(event.y))
+        if index is None:
+            return
+        kind, data = self.rows[index]
+        if kind == "unit":
+            if not self.filter_text:
+                self.toggle(data)
+        elif self.tree.is_unlocked(data["number"]):
+            self.on_select(data["number"])
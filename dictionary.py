@@ -0,0 +1,220 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+
+from hangul import normalize
+
+DICTIONARY_FILE = "dictionary.tsv"
+INDEX_SUFFIX = ".idx"
+
+# Index layout: magic, entry count, one little-endian offset per entry (in
+# headword order), then the records as "headword\tdefinition...\n" in UTF-8.
+# UTF-8 byte order is code point order, so headwords are compared as bytes.
+INDEX_MAGIC = b"KODICT01"
+HEADER = struct.Struct("<8sQ")
+OFFSET = struct.Struct("<Q")
+
+HEADER_WORDS = {"korean", "headword", "word"}
+PUNCTUATION = ".,!?\"'()[]…~:;"
+# Syllables that start a conjugated ending (먹어요, 갔어요, 먹습니다), where the
+# verb form (stem + 다) is a better guess than a noun spelled like the stem
+VERB_ENDING_STARTS = set("아어여았었였습")
+
+
+def parse_line(line):
+    """Split a dictionary line into (headword, definition fields), or None to skip it"""
+    line = line.rstrip("\r\n")
+    if not line.strip() or line.startswith("#"):
+        return None
+    headword, _, rest = line.partition("\t")
+    headword = normalize(headword)
+    if not headword or not rest.strip():
+        return None
+    return headword, [normalize(field) for field in rest.split("\t")]
+
+
+def compile_dictionary(source, index_path=None):
+    """Sort a headword<TAB>definition file into a binary-searchable index, returning the entry count"""
+    source = Path(source)
+    index_path = Path(index_path) if index_path else source.with_suffix(INDEX_SUFFIX)
+
+    records = []
+    with open(source, 'r', encoding='utf-8-sig') as f:
+        for line_number, line in enumerate(f):
+            parsed = parse_line(line)
+            if parsed is None or (line_number == 0 and parsed[0].casefold() in HEADER_WORDS):
+                continue
+            headword, fields = parsed
+            key = headword.encode('utf-8')
+            records.append((key, key + b"\t" + "\t".join(fields).encode('utf-8') + b"\n"))
+    # Stable sort keeps entries with the same headword in file order
+    records.sort(key=lambda record: record[0])
+
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, len(records)))
+        offset = 0
+        for _, record in records:
+            f.write(OFFSET.pack(offset))
+            offset += len(record)
+        for _, record in records:
+            f.write(record)
+    os.replace(tmp_path, index_path)
+    return len(records)
+
+
+class Dictionary:
+    """Read-only dictionary searched in place in a memory-mapped index.
+
+    Only the offset of each probed entry and its headword bytes are read
+    during a binary search, so lookups take a few microseconds and the
+    dictionary is never loaded into Python objects.
+    """
+
+    def __init__(self, index_path):
+        self.file = open(index_path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{index_path} is empty")
+        magic, self.count = HEADER.unpack_from(self.map, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{index_path} is not a dictionary index")
+        self.table = HEADER.size
+        self.records = self.table + self.count * OFFSET.size
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def record_start(self, i):
+        return self.records + OFFSET.unpack_from(self.map, self.table + i * OFFSET.size)[0]
+
+    def headword(self, i):
+        start = self.record_start(i)
+        return self.map[start:self.map.find(b"\t", start)]
+
+    def entry(self, i):
+        """Get (headword, definition fields) of the entry at a position"""
+        start = self.record_start(i)
+        record = self.map[start:self.map.find(b"\n", start)].decode('utf-8')
+        headword, *fields = record.split("\t")
+        return headword, fields
+
+    def lower_bound(self, key):
+        """Get the position of the first headword >= key (bytes)"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.headword(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, word):
+        """Get the definition fields of every entry for an exact headword"""
+        key = normalize(word).encode('utf-8')
+        results = []
+        i = self.lower_bound(key)
+        while i < self.count and self.headword(i) == key:
+            results.append(self.entry(i)[1])
+            i += 1
+        return results
+
+    def prefix(self, text, limit=20):
+        """Get up to limit (headword, fields) entries whose headword starts with text"""
+        key = normalize(text).encode('utf-8')
+        results = []
+        i = self.lower_bound(key)
+        while i < self.count and len(results) < limit and self.headword(i).startswith(key):
+            results.append(self.entry(i))
+            i += 1
+        return results
+
+    def lookup_word(self, word):
+        """Find the dictionary entry for a word as it appears in a sentence.
+
+        Words carry particles and endings (학생이에요, 먹어요), so the longest
+        leading part that is a headword wins, trying the verb form (stem + 다)
+        of each part too. Returns (headword, [definition fields]) or None.
+        """
+        word = normalize(word).strip(PUNCTUATION)
+        for end in range(len(word), 0, -1):
+            part = word[:end]
+            verb_first = end < len(word) and word[end] in VERB_ENDING_STARTS
+            for headword in ((part + "다", part) if verb_first else (part, part + "다")):
+                definitions = self.lookup(headword)
+                if definitions:
+                    return headword, definitions
+        return None
+
+
+def open_dictionary(source=DICTIONARY_FILE):
+    """Open the dictionary index, compiling it first if the source file is newer.
+
+    Returns None when there is no dictionary.
+    """
+    source = Path(source)
+    index_path = source.with_suffix(INDEX_SUFFIX)
+    try:
+        source_mtime = source.stat().st_mtime_ns
+    except FileNotFoundError:
+        source_mtime = None
+    try:
+        index_mtime = index_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        index_mtime = None
+
+    if source_mtime is not None and (index_mtime is None or index_mtime < source_mtime):
+        compile_dictionary(source, index_path)
+    elif index_mtime is None:
+        return None
+    return Dictionary(index_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and search the offline dictionary")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser("compile", help="build the index from a TSV file")
+    compile_parser.add_argument("source", nargs="?", default=DICTIONARY_FILE)
+    lookup_parser = subparsers.add_parser("lookup", help="look up words")
+    lookup_parser.add_argument("words", nargs="+")
+    lookup_parser.add_argument("--source", default=DICTIONARY_FILE)
+    lookup_parser.add_argument("--prefix", action="store_true", help="list headwords starting with each word")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        started = time.monotonic()
+        count = compile_dictionary(args.source)
+        print(f"Compiled {count} entries in {time.monotonic() - started:.2f}s")
+        return
+
+    dictionary = open_dictionary(args.source)
+    if dictionary is None:
+        print(f"No dictionary found at {args.source}")
+        return
+    for word in args.words:
+        if args.prefix:
+            for headword, fields in dictionary.prefix(word):
+                print(f"{headword}: {'; '.join(fields)}")
+            continue
+        result = dictionary.lookup_word(word)
+        if result is None:
+            print(f"{word}: not found")
+        else:
+            headword, definitions = result
+            print(f"{word} -> {headword}: {' / '.join('; '.join(fields) for fields in definitions)}")
+    dictionary.close()
+
+
+if __name__ == "__main__":
+    main()
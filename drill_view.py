@@ -0,0 +1,204 @@
+import time
+import tkinter as tk
+
+from grading import CORRECT_COLOR, INCORRECT_COLOR, answer_text, grade_exercise
+from hangul_ime import HangulComposer, bind_key, unbind_key
+
+DRILL_BG = '#ffffff'
+OPTION_BG = '#f9fafb'
+TEXT_COLOR = '#1f2937'
+KOREAN_COLOR = '#dc2626'
+MUTED_COLOR = '#6b7280'
+
+
+class DrillView(tk.Frame):
+    """Rapid-fire exercise drill answered with the number keys.
+
+    Exercise cards are stacked in one grid cell. While the learner works on
+    the current card, the next one is built underneath it, so answering only
+    grades, updates the feedback line and raises the prepared card; nothing
+    is torn down or laid out between questions. The old card is destroyed
+    after the swap has been drawn.
+
+    next_index() supplies exercise indexes (None when nothing is due yet) and
+    on_answer(index, answer, is_correct, latency) is told about every answer.
+    Keys and buttons go through dispatch(method name, *args), which by default
+    calls the method here; the app passes its own so input can be recorded.
+    """
+
+    def __init__(self, parent, exercises, answers, next_index, on_answer, on_stop, dispatch=None, **kwargs):
+        kwargs.setdefault("bg", DRILL_BG)
+        super().__init__(parent, **kwargs)
+        self.exercises = exercises
+        self.answers = answers
+        self.next_index = next_index
+        self.on_answer = on_answer
+        self.on_stop = on_stop
+        self.dispatch = dispatch or (lambda name, *args: getattr(self, name)(*args))
+        self.answered = 0
+        self.correct = 0
+        self.current = None
+        self.upcoming = None
+
+        self.status = tk.Label(self, text="", font=('Arial', 14), fg=MUTED_COLOR, bg=DRILL_BG)
+        self.status.pack(anchor=tk.W, pady=(0, 10))
+        self.stage = tk.Frame(self, bg=DRILL_BG)
+        self.stage.pack(fill=tk.BOTH, expand=True)
+        self.stage.grid_rowconfigure(0, weight=1)
+        self.stage.grid_columnconfigure(0, weight=1)
+        self.feedback = tk.Label(self, text="Press 1-9 to answer, Esc to stop", font=('Arial', 16),
+                                 fg=TEXT_COLOR, bg=DRILL_BG, wraplength=800, justify=tk.LEFT)
+        self.feedback.pack(fill=tk.X, pady=(10, 0), ipady=10)
+
+        self.root = self.winfo_toplevel()
+        self.key_binding = bind_key(self.root, self.on_key)
+        self.bind("<Destroy>", self.on_destroy)
+
+    def start(self):
+        index = self.next_index()
+        if index is None:
+            self.feedback.config(text="No exercises to drill.")
+            return
+        self.show(self.build_card(index))
+        self.update_status()
+        self.after(1, self.prepare_upcoming)
+
+    def build_card(self, index):
+        """Build an exercise card underneath the visible one"""
+        exercise = self.exercises[index]
+        frame = tk.Frame(self.stage, bg=DRILL_BG)
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.lower()
+        card = {"index": index, "exercise": exercise, "frame": frame, "word": HangulComposer(), "word_label": None}
+
+        if exercise["type"] == "multiple_choice":
+            question, options, option_color = exercise["question"], exercise["options"], TEXT_COLOR
+        elif exercise["type"] == "syllable_choice":
+            question = f"Complete the sentence: {exercise['sentence']}   (hint: {exercise['hint']})"
+            options, option_color = exercise["syllable_options"], KOREAN_COLOR
+        else:
+            question, options, option_color = exercise["question"], exercise["syllable_parts"], TEXT_COLOR
+
+        tk.Label(frame, text=question, font=('Arial', 18), fg=TEXT_COLOR, bg=DRILL_BG,
+                 wraplength=800, justify=tk.LEFT).pack(pady=(0, 15))
+        if exercise["type"] == "word_building":
+            card["word_label"] = tk.Label(frame, text="[ ]", font=('Arial', 24, 'bold'),
+                                          fg=KOREAN_COLOR, bg=DRILL_BG)
+            card["word_label"].pack(pady=(0, 10))
+            tk.Label(frame, text="Pick syllables or type them (2-beolsik), Backspace deletes, Enter submits",
+                     font=('Arial', 12),
+                     fg=MUTED_COLOR, bg=DRILL_BG).pack()
+
+        for i, option in enumerate(options[:9]):
+            tk.Button(frame, text=f"{i + 1}.  {option}", font=('Arial', 16), bg=OPTION_BG, fg=option_color,
+                      relief=tk.SOLID, bd=1, anchor=tk.W, padx=20, pady=6,
+                      command=lambda key=i: self.dispatch("choose", key)).pack(fill=tk.X, padx=50, pady=3)
+        if exercise["type"] == "word_building":
+            tk.Button(frame, text="Submit (Enter)", font=('Arial', 14, 'bold'), bg='#059669', fg='white',
+                      command=lambda: self.dispatch("submit_word")).pack(pady=10)
+        return card
+
+    def show(self, card):
+        card["frame"].tkraise()
+        card["shown_at"] = time.monotonic()
+        self.current = card
+
+    def prepare_upcoming(self):
+        """Build the next card while the learner reads the feedback or thinks"""
+        if self.upcoming is None and self.current is not None and self.winfo_exists():
+            index = self.next_index()
+            if index is not None:
+                self.upcoming = self.build_card(index)
+
+    def choose(self, key):
+        """Handle option key (0-based) for the current card"""
+        card = self.current
+        if card is None:
+            return
+        if card["exercise"]["type"] != "word_building":
+            self.answer(key)
+            return
+        parts = card["exercise"]["syllable_parts"]
+        if key < len(parts):
+            card["word"].insert(parts[key])
+            self.update_word(card)
+
+    def type_key(self, char):
+        """Type a Latin key as Hangul into the current word building card"""
+        card = self.current
+        if card and card["exercise"]["type"] == "word_building" and card["word"].key(char):
+            self.update_word(card)
+
+    def backspace_word(self):
+        card = self.current
+        if card and card["exercise"]["type"] == "word_building":
+            card["word"].backspace()
+            self.update_word(card)
+
+    def submit_word(self):
+        card = self.current
+        if card and card["exercise"]["type"] == "word_building":
+            self.answer(card["word"].text)
+
+    def update_word(self, card):
+        card["word_label"].config(text=f"[ {card['word'].text} ]")
+
+    def answer(self, value):
+        """Grade the current card, show feedback inline and switch to the prepared card"""
+        card = self.current
+        exercise = card["exercise"]
+        options = exercise.get("options") or exercise.get("syllable_options")
+        if exercise["type"] != "word_building" and value >= len(options):
+            return
+
+        latency = time.monotonic() - card["shown_at"]
+        is_correct, result_text = grade_exercise(exercise, value, self.answers[card["index"]])
+        self.on_answer(card["index"], answer_text(exercise, value), is_correct, latency)
+        self.answered += 1
+        self.correct += is_correct
+        self.feedback.config(text=("✓ " if is_correct else "✗ ") + result_text,
+                             bg=CORRECT_COLOR if is_correct else INCORRECT_COLOR)
+
+        # The answered exercise may be the only one due, so build late if nothing was ready
+        upcoming = self.upcoming or self.build_card_if_due()
+        self.upcoming = None
+        if upcoming is None:
+            self.current = None
+        else:
+            self.show(upcoming)
+        self.update_status()
+        self.after(1, lambda: self.retire(card))
+
+    def build_card_if_due(self):
+        index = self.next_index()
+        return self.build_card(index) if index is not None else None
+
+    def retire(self, card):
+        """Destroy an answered card once the swap is on screen, then prepare the next one"""
+        if not self.winfo_exists():
+            return
+        card["frame"].destroy()
+        self.prepare_upcoming()
+
+    def update_status(self):
+        accuracy = f" ({self.correct / self.answered:.0%} correct)" if self.answered else ""
+        self.status.config(text=f"Drill: {self.answered} answered{accuracy}")
+
+    def on_key(self, event):
+        if event.keysym == "Escape":
+            self.on_stop()
+        elif self.current is None:
+            return
+        elif event.char and event.char in "123456789":
+            self.dispatch("choose", int(event.char) - 1)
+        elif self.current["exercise"]["type"] == "word_building":
+            if event.keysym == "BackSpace":
+                self.dispatch("backspace_word")
+            elif event.keysym in ("Return", "KP_Enter"):
+                self.dispatch("submit_word")
+            elif event.char:
+                self.dispatch("type_key", event.char)
+
+    def on_destroy(self, event):
+        if event.widget is self:
+            unbind_key(self.root, self.key_binding)
@@ -0,0 +1,49 @@
+from hangul import normalize
+
+# Result colors shared by the front ends that can show them
+CORRECT_COLOR = '#d1fae5'
+INCORRECT_COLOR = '#fecaca'
+
+
+def grade_multiple_choice(exercise, selected_idx):
+    """Grade a multiple choice answer, returning (is_correct, result_text)"""
+    if selected_idx == exercise["correct"]:
+        return True, "Correct! " + exercise["explanation"]
+    return False, (f"Incorrect. The correct answer is: {exercise['options'][exercise['correct']]}. "
+                   + exercise["explanation"])
+
+
+def grade_syllable_choice(exercise, selected_idx):
+    """Grade a syllable choice answer, returning (is_correct, result_text)"""
+    if selected_idx == exercise["correct"]:
+        return True, "Correct!"
+    return False, f"Incorrect. The correct answer is: {exercise['syllable_options'][exercise['correct']]}"
+
+
+def grade_word_building(exercise, built_word, answer=None):
+    """Grade a built word against the (precomputed, normalized) target"""
+    if answer is None:
+        answer = normalize(exercise["target"])
+    if normalize(built_word) == answer:
+        return True, "Correct! Perfect!"
+    return False, f"Incorrect. The correct answer is: {exercise['target']}"
+
+
+def answer_text(exercise, answer):
+    """Get the text of an answer (option index or built word) for logging"""
+    if exercise["type"] == "multiple_choice":
+        return exercise["options"][answer]
+    if exercise["type"] == "syllable_choice":
+        return exercise["syllable_options"][answer]
+    return answer
+
+
+def grade_exercise(exercise, answer, normalized_answer=None):
+    """Grade any supported exercise type, returning (is_correct, result_text)"""
+    if exercise["type"] == "multiple_choice":
+        return grade_multiple_choice(exercise, answer)
+    if exercise["type"] == "syllable_choice":
+        return grade_syllable_choice(exercise, answer)
+    if exercise["type"] == "word_building":
+        return grade_word_building(exercise, answer, normalized_answer)
+    raise ValueError(f"Unknown exercise type: {exercise['type']}")
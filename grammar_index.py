@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+
+from lesson_compiler import CACHE_DIR_NAME, content_hash, exercise_id
+from lesson_manager import LESSON_FILE_PATTERN
+from romanization import romanize
+
+# Bump when the per-lesson entry format changes so the index is rebuilt
+INDEX_VERSION = 1
+INDEX_FILE_NAME = "grammar_index.json"
+
+
+def focus_ids(item):
+    """Get the rule ids an example sentence or exercise is tagged with"""
+    focus = item.get("grammar_focus") or item.get("rule_id") or ""
+    return [rule_id.strip() for rule_id in focus.split(",") if rule_id.strip()]
+
+
+def exercise_prompt(exercise):
+    """Get a one-line description of an exercise"""
+    return exercise.get("question") or exercise.get("sentence") or exercise.get("type", "")
+
+
+def lesson_grammar(lesson):
+    """Get {rule_id: entry} with the examples and exercises of one lesson.
+
+    Exercises are linked by their own grammar_focus/rule_id tag; untagged
+    exercises belong to the rule when the lesson teaches only one.
+    """
+    lesson_number = lesson.get("lesson_number", 0)
+    rules = {}
+    for rule in lesson.get("grammar_rules", []):
+        rules[rule["rule_id"]] = {
+            "title": rule["title"],
+            "explanation": rule["explanation"],
+            "pattern": rule.get("pattern", ""),
+            "examples": [],
+            "exercises": []
+        }
+
+    def entry(rule_id):
+        # Sentences can use rules taught in other lessons
+        if rule_id not in rules:
+            rules[rule_id] = {"title": None, "explanation": None, "pattern": None,
+                              "examples": [], "exercises": []}
+        return rules[rule_id]
+
+    for sentence in lesson.get("example_sentences", []):
+        for rule_id in focus_ids(sentence):
+            entry(rule_id)["examples"].append({
+                "korean": sentence["korean"],
+                "romanization": sentence.get("romanization") or romanize(sentence["korean"]),
+                "english": sentence["english"]
+            })
+
+    only_rule = [r["rule_id"] for r in lesson.get("grammar_rules", [])]
+    only_rule = only_rule if len(only_rule) == 1 else []
+    for i, exercise in enumerate(lesson.get("exercises", [])):
+        for rule_id in focus_ids(exercise) or only_rule:
+            entry(rule_id)["exercises"].append({
+                "id": exercise_id(lesson_number, i, exercise),
+                "prompt": exercise_prompt(exercise)
+            })
+    return rules
+
+
+class GrammarIndex:
+    """Inverted index from rule_id to the lessons, examples and exercises that use it.
+
+    Per-file entries are stored in lessons/.cache/grammar_index.json with the
+    file's size, mtime and content hash. update() only re-reads files whose
+    size or mtime changed and only re-parses those whose hash changed, so
+    keeping the index current is cheap even for large courses.
+    """
+
+    def __init__(self, lessons_dir="lessons"):
+        self.lessons_dir = Path(lessons_dir)
+        self.index_file = self.lessons_dir / CACHE_DIR_NAME / INDEX_FILE_NAME
+        self.files = self.load()
+        self.rules = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, IOError):
+            return {}
+        return data.get("files", {}) if data.get("version") == INDEX_VERSION else {}
+
+    def save(self):
+        self.index_file.parent.mkdir(exist_ok=True)
+        tmp_path = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_file)
+
+    def update(self):
+        """Bring the index in line with the lesson files, returning the number of files re-indexed"""
+        with self.lock:
+            return self.update_locked()
+
+    def update_locked(self):
+        if not self.lessons_dir.exists():
+            return 0
+
+        seen = set()
+        reindexed = 0
+        changed = False
+        for dir_entry in os.scandir(self.lessons_dir):
+            if not LESSON_FILE_PATTERN.match(dir_entry.name):
+                continue
+            seen.add(dir_entry.name)
+            stat = dir_entry.stat()
+            record = self.files.get(dir_entry.name)
+            if record and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                continue
+
+            try:
+                with open(dir_entry.path, 'rb') as f:
+                    data = f.read()
+                source_hash = content_hash(data)
+                if not record or record["hash"] != source_hash:
+                    lesson = json.loads(data.decode('utf-8'))
+                    record = {
+                        "lesson_number": lesson.get("lesson_number", 0),
+                        "lesson_title": lesson.get("lesson_title", "Unknown"),
+                        "rules": lesson_grammar(lesson)
+                    }
+                    reindexed += 1
+                record.update(hash=source_hash, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                self.files[dir_entry.name] = record
+                changed = True
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, IOError) as e:
+                print(f"Error indexing {dir_entry.path}: {e}")
+
+        for name in set(self.files) - seen:
+            del self.files[name]
+            changed = True
+
+        if changed:
+            try:
+                self.save()
+            except IOError as e:
+                print(f"Error saving grammar index: {e}")
+        if changed or not self.rules:
+            self.build_rules()
+        return reindexed
+
+    def invalidate(self, file_names):
+        """Forget entries for lesson files, so the next update() re-reads them"""
+        with self.lock:
+            for name in file_names:
+                self.files.pop(name, None)
+
+    def build_rules(self):
+        """Invert the per-file entries into {rule_id: [(lesson number, title, entry)]}"""
+        rules = {}
+        for record in self.files.values():
+            for rule_id, entry in record["rules"].items():
+                rules.setdefault(rule_id, []).append((record["lesson_number"], record["lesson_title"], entry))
+        for uses in rules.values():
+            uses.sort(key=lambda use: use[0])
+        self.rules = rules
+
+    def rule_ids(self):
+        """Get (rule_id, title) for every rule, sorted by title"""
+        result = []
+        for rule_id, uses in self.rules.items():
+            title = next((entry["title"] for _, _, entry in uses if entry["title"]), rule_id)
+            result.append((rule_id, title))
+        result.sort(key=lambda item: item[1].casefold())
+        return result
+
+    def lookup(self, rule_id):
+        """Get [(lesson number, lesson title, entry)] for a rule, in lesson order"""
+        return self.rules.get(rule_id, [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the grammar reference index and look up rules")
+    parser.add_argument("rule_id", nargs="?", help="rule to show (default: list all rules)")
+    parser.add_argument("--lessons-dir", default="lessons")
+    args = parser.parse_args()
+
+    index = GrammarIndex(args.lessons_dir)
+    reindexed = index.update()
+    print(f"Indexed {len(index.files)} lessons ({reindexed} re-read)")
+
+    if not args.rule_id:
+        for rule_id, title in index.rule_ids():
+            print(f"{rule_id}: {title}")
+        return
+    for lesson_number, lesson_title, entry in index.lookup(args.rule_id):
+        print(f"Lesson {lesson_number}: {lesson_title} - {len(entry['examples'])} examples, "
+              f"{len(entry['exercises'])} exercises")
+        for example in entry["examples"]:
+            print(f"  {example['korean']}  {example['english']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import unicodedata
+
+# Precomposed Hangul syllables are laid out as
+#   0xAC00 + (initial * 21 + medial) * 28 + final
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_LAST = 0xD7A3
+INITIAL_COUNT = 19
+MEDIAL_COUNT = 21
+FINAL_COUNT = 28
+
+# Index of ㄹ in the final consonant table (used by the 으로/로 rule)
+FINAL_RIEUL = 8
+
+
+def normalize(text):
+    """Normalize text to NFC with collapsed whitespace"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def is_syllable(char):
+    """Check if a character is a precomposed Hangul syllable"""
+    return SYLLABLE_BASE <= ord(char) <= SYLLABLE_LAST
+
+
+def decompose(char):
+    """Split a syllable into (initial, medial, final) jamo indexes, or None"""
+    code = ord(char) - SYLLABLE_BASE
+    if code < 0 or code > SYLLABLE_LAST - SYLLABLE_BASE:
+        return None
+    initial, rest = divmod(code, MEDIAL_COUNT * FINAL_COUNT)
+    medial, final = divmod(rest, FINAL_COUNT)
+    return initial, medial, final
+
+
+def compose(initial, medial, final=0):
+    """Build a syllable from (initial, medial, final) jamo indexes"""
+    return chr(SYLLABLE_BASE + (initial * MEDIAL_COUNT + medial) * FINAL_COUNT + final)
+
+
+def last_syllable(word):
+    """Get the last Hangul syllable of a word, ignoring trailing punctuation"""
+    for char in reversed(word):
+        if is_syllable(char):
+            return char
+    return None
+
+
+def final_consonant(word):
+    """Get the final consonant index of a word's last syllable (0 if none)"""
+    char = last_syllable(word)
+    if char is None:
+        return None
+    return (ord(char) - SYLLABLE_BASE) % FINAL_COUNT
+
+
+def has_batchim(word):
+    """Check if a word ends in a final consonant (batchim)"""
+    return bool(final_consonant(word))
+
+
+# Compatibility jamo (ㄱ, ㅏ, ...) mapped onto initial consonant indexes so that
+# standalone letters sort with the syllables they start. Clusters that can only
+# be finals (ㄳ, ㄺ, ...) sort under their first consonant, and vowels sort under
+# the silent initial ㅇ as vowel-initial words do in dictionaries.
+INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+COMPAT_CONSONANTS = "ㄱㄲㄳㄴㄵㄶㄷㄸㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅃㅄㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+COMPAT_VOWELS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+COMPAT_CLUSTER_BASE = {"ㄳ": "ㄱ", "ㄵ": "ㄴ", "ㄶ": "ㄴ", "ㄺ": "ㄹ", "ㄻ": "ㄹ", "ㄼ": "ㄹ",
+                       "ㄽ": "ㄹ", "ㄾ": "ㄹ", "ㄿ": "ㄹ", "ㅀ": "ㄹ", "ㅄ": "ㅂ"}
+
+# Collation keys encode each Hangul letter as three private-use characters
+# (initial, medial + 1, final) so that plain string comparison gives Korean
+# dictionary order; a missing medial (standalone consonant) sorts first.
+_KEY_INITIAL = 0xE100
+_KEY_MEDIAL = 0xE200
+_KEY_FINAL = 0xE300
+
+_COMPAT_KEYS = {}
+for _char in COMPAT_CONSONANTS:
+    _COMPAT_KEYS[_char] = (chr(_KEY_INITIAL + INITIALS.index(COMPAT_CLUSTER_BASE.get(_char, _char))) +
+                           chr(_KEY_MEDIAL) + chr(_KEY_FINAL))
+for _index, _char in enumerate(COMPAT_VOWELS):
+    _COMPAT_KEYS[_char] = (chr(_KEY_INITIAL + INITIALS.index("ㅇ")) +
+                           chr(_KEY_MEDIAL + _index + 1) + chr(_KEY_FINAL))
+
+
+def korean_sort_key(word):
+    """Get a collation key that orders words by jamo (Korean dictionary order)"""
+    key = []
+    for char in normalize(word):
+        jamo = decompose(char)
+        if jamo is not None:
+            initial, medial, final = jamo
+            key.append(chr(_KEY_INITIAL + initial) + chr(_KEY_MEDIAL + medial + 1) +
+                       chr(_KEY_FINAL + final))
+        else:
+            key.append(_COMPAT_KEYS.get(char) or char.casefold())
+    return "".join(key)
+
+
+def english_sort_key(text):
+    """Get a case-folded collation key for English text"""
+    return normalize(text).casefold()
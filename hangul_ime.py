@@ -0,0 +1,192 @@
+from hangul import COMPAT_VOWELS, INITIALS, compose
+
+# Standard 2-beolsik (dubeolsik) layout; shifted keys only differ for the
+# tense consonants and ㅒ/ㅖ, other capitals type the unshifted jamo
+DUBEOLSIK = {
+    "q": "ㅂ", "w": "ㅈ", "e": "ㄷ", "r": "ㄱ", "t": "ㅅ", "y": "ㅛ", "u": "ㅕ", "i": "ㅑ", "o": "ㅐ", "p": "ㅔ",
+    "a": "ㅁ", "s": "ㄴ", "d": "ㅇ", "f": "ㄹ", "g": "ㅎ", "h": "ㅗ", "j": "ㅓ", "k": "ㅏ", "l": "ㅣ",
+    "z": "ㅋ", "x": "ㅌ", "c": "ㅊ", "v": "ㅍ", "b": "ㅠ", "n": "ㅜ", "m": "ㅡ",
+    "Q": "ㅃ", "W": "ㅉ", "E": "ㄸ", "R": "ㄲ", "T": "ㅆ", "O": "ㅒ", "P": "ㅖ",
+}
+for _key in "yuiasdfghjklzxcvbnm":
+    DUBEOLSIK.setdefault(_key.upper(), DUBEOLSIK[_key])
+
+FINALS = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+INITIAL_INDEX = {jamo: i for i, jamo in enumerate(INITIALS)}
+MEDIAL_INDEX = {jamo: i for i, jamo in enumerate(COMPAT_VOWELS)}
+FINAL_INDEX = {jamo: i for i, jamo in enumerate(FINALS) if i}
+
+# Jamo typed as two keys
+COMPOUND_VOWELS = {("ㅗ", "ㅏ"): "ㅘ", ("ㅗ", "ㅐ"): "ㅙ", ("ㅗ", "ㅣ"): "ㅚ", ("ㅜ", "ㅓ"): "ㅝ",
+                   ("ㅜ", "ㅔ"): "ㅞ", ("ㅜ", "ㅣ"): "ㅟ", ("ㅡ", "ㅣ"): "ㅢ"}
+COMPOUND_FINALS = {("ㄱ", "ㅅ"): "ㄳ", ("ㄴ", "ㅈ"): "ㄵ", ("ㄴ", "ㅎ"): "ㄶ", ("ㄹ", "ㄱ"): "ㄺ",
+                   ("ㄹ", "ㅁ"): "ㄻ", ("ㄹ", "ㅂ"): "ㄼ", ("ㄹ", "ㅅ"): "ㄽ", ("ㄹ", "ㅌ"): "ㄾ",
+                   ("ㄹ", "ㅍ"): "ㄿ", ("ㄹ", "ㅎ"): "ㅀ", ("ㅂ", "ㅅ"): "ㅄ"}
+SPLIT_FINALS = {compound: pair for pair, compound in COMPOUND_FINALS.items()}
+
+EMPTY = (None, None, None)
+
+
+def syllable_text(state):
+    """Get the text of a (initial, medial, final) composition state"""
+    initial, medial, final = state
+    if initial and medial:
+        return compose(INITIAL_INDEX[initial], MEDIAL_INDEX[medial], FINAL_INDEX[final] if final else 0)
+    return initial or medial or ""
+
+
+def bind_key(root, callback):
+    """Add a <Key> handler to a window, keeping the handlers already bound; returns its id"""
+    return root.bind("<Key>", callback, add="+")
+
+
+def unbind_key(root, funcid):
+    """Remove one <Key> handler added with bind_key, keeping the others"""
+    # Misc.unbind clears every handler of the sequence, so the others are rebound
+    script = root.bind("<Key>")
+    root.bind("<Key>", "\n".join(line for line in script.split("\n") if funcid not in line))
+    root.deletecommand(funcid)
+
+
+class HangulComposer:
+    """Assemble typed jamo into Hangul syllables, one keystroke at a time.
+
+    The syllable being typed is an (initial, medial, final) state; every key
+    pushes the new state, so backspace just pops back to the previous one
+    (닭 -> 달 -> 다 -> ㄷ). Finished text is kept as a list of units (typed
+    syllables or inserted strings), which backspace removes one at a time,
+    and as a string updated with them, so reading the text never rejoins it.
+    """
+
+    def __init__(self):
+        self.committed = []
+        self.committed_text = ""
+        self.states = []
+
+    @property
+    def state(self):
+        return self.states[-1] if self.states else EMPTY
+
+    @property
+    def composing(self):
+        """Get the syllable being typed"""
+        return syllable_text(self.state)
+
+    @property
+    def text(self):
+        return self.committed_text + self.composing
+
+    def commit(self):
+        """Finish the syllable being typed"""
+        if self.states:
+            self.append(self.composing)
+            self.states = []
+
+    def append(self, unit):
+        self.committed.append(unit)
+        self.committed_text += unit
+
+    def start(self, *states):
+        """Finish the current syllable and start a new one from the given states"""
+        self.commit()
+        self.states.extend(states)
+
+    def key(self, char):
+        """Handle a Latin key, returning False if it is not on the Hangul layout"""
+        jamo = DUBEOLSIK.get(char)
+        if jamo is None:
+            return False
+        if jamo in MEDIAL_INDEX:
+            self.vowel(jamo)
+        else:
+            self.consonant(jamo)
+        return True
+
+    def consonant(self, jamo):
+        initial, medial, final = self.state
+        if initial and medial and not final and jamo in FINAL_INDEX:
+            self.states.append((initial, medial, jamo))
+        elif final and (final, jamo) in COMPOUND_FINALS:
+            self.states.append((initial, medial, COMPOUND_FINALS[final, jamo]))
+        else:
+            self.start((jamo, None, None))
+
+    def vowel(self, jamo):
+        initial, medial, final = self.state
+        if final:
+            # The final consonant moves on to start the new syllable (닭 + ㅏ -> 달가)
+            first, second = SPLIT_FINALS.get(final, (None, final))
+            self.states[-1] = (initial, medial, first)
+            self.start((second, None, None), (second, jamo, None))
+        elif medial and (medial, jamo) in COMPOUND_VOWELS:
+            self.states.append((initial, COMPOUND_VOWELS[medial, jamo], None))
+        elif initial and not medial:
+            self.states.append((initial, jamo, None))
+        else:
+            self.start((None, jamo, None))
+
+    def insert(self, text):
+        """Add text as one unit (a chosen syllable, a space or punctuation)"""
+        self.commit()
+        if text:
+            self.append(text)
+
+    def backspace(self):
+        """Remove the last typed jamo, or the last unit of finished text"""
+        if self.states:
+            self.states.pop()
+        elif self.committed:
+            unit = self.committed.pop()
+            self.committed_text = self.committed_text[:len(self.committed_text) - len(unit)]
+
+    def clear(self):
+        self.committed = []
+        self.committed_text = ""
+        self.states = []
+
+
+class HangulInput:
+    """Type Korean with a Latin keyboard in any part of a Tk window.
+
+    Keys pressed anywhere in the window go to a HangulComposer, and
+    on_change(text) is called after each one; Enter calls on_submit(text).
+    The Hangul key or Shift+Space switches between Korean and Latin letters.
+    Other <Key> handlers on the window are kept, and this one is removed
+    when the widget it belongs to is destroyed.
+    """
+
+    def __init__(self, widget, on_change, on_submit=None, composer=None):
+        self.widget = widget
+        self.on_change = on_change
+        self.on_submit = on_submit
+        self.composer = composer or HangulComposer()
+        self.korean = True
+        self.root = widget.winfo_toplevel()
+        self.key_binding = bind_key(self.root, self.on_key)
+        widget.bind("<Destroy>", self.on_destroy, add="+")
+
+    @property
+    def text(self):
+        return self.composer.text
+
+    def on_key(self, event):
+        if event.keysym in ("Hangul", "Hangul_Hanja") or (event.keysym == "space" and event.state & 0x1):
+            self.composer.commit()
+            self.korean = not self.korean
+        elif event.keysym == "BackSpace":
+            self.composer.backspace()
+        elif event.keysym in ("Return", "KP_Enter"):
+            if self.on_submit:
+                self.composer.commit()
+                self.on_submit(self.composer.text)
+            return "break"
+        elif not (self.korean and self.composer.key(event.char)):
+            if not event.char or not event.char.isprintable():
+                return None
+            self.composer.insert(event.char)
+        self.on_change(self.composer.text)
+        return "break"
+
+    def on_destroy(self, event):
+        if event.widget is self.widget:
+            unbind_key(self.root, self.key_binding)
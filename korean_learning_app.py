@@ -1,9 +1,35 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
+import itertools
 import json
 import os
+import time
 from pathlib import Path
+from async_io import AsyncIO
+from course_tree_canvas import CourseTreeCanvas
+from dictionary import PUNCTUATION, open_dictionary
+from drill_view import DrillView
+from grammar_index import GrammarIndex
+from hangul_ime import HangulInput
+from attempt_log import AttemptLog
+from chunked_render import ChunkedRenderer
+from grading import (CORRECT_COLOR, INCORRECT_COLOR, grade_multiple_choice,
+                     grade_syllable_choice, grade_word_building)
 from lesson_manager import LessonManager
+from lesson_updater import recover_update
+from media import MediaLoader
+from scheduler import AdaptiveScheduler
+from segmenter import corpus_segmenter
+from stall_watchdog import StallWatchdog
+from vocab_cards import VocabCardCanvas
+from vocab_export import export_vocabulary
+from vocab_table import VocabViews
+
+# Colours and lookup notes for the parts of segmented example sentences
+TOKEN_COLORS = {"noun": '#dc2626', "verb": '#dc2626', "particle": '#2563eb', "topic": '#2563eb',
+                "copula": '#7c3aed', "ending": '#059669', "punctuation": '#dc2626'}
+TOKEN_NOTES = {"particle": "particle", "topic": "topic/focus particle", "copula": "copula (to be)",
+               "ending": "verb ending"}
 
 class KoreanLearningApp:
     def __init__(self, root):
@@ -12,22 +38,88 @@ class KoreanLearningApp:
         self.root.geometry("1200x800")
         self.root.configure(bg='#ffffff')
         
-        # Initialize lesson manager
-        self.lesson_manager = LessonManager()
-        
-        # Load current lesson
-        current_lesson_num = self.lesson_manager.get_current_lesson()
-        self.current_lesson = self.lesson_manager.load_lesson(current_lesson_num)
+        # Background I/O; the lesson manager and current lesson load off the main thread
+        self.io = AsyncIO(self.root)
+        # Main loop stalls over 50 ms are logged to stalls.log with the blocking stack
+        self.watchdog = StallWatchdog(self.root)
+        self.watchdog.start()
+        self.media = MediaLoader(self.io)
+        # Long sections are built a few widgets per frame so the window stays responsive
+        self.renderer = ChunkedRenderer(self.root)
+        self.lesson_manager = None
+        self.current_lesson = None
+        self.attempt_log = AttemptLog()
         
         # Exercise state
         self.current_exercise_index = 0
         self.current_vocab_page = 0
         self.vocab_per_page = 3
         self.exercises_completed_count = 0
+        self.exercise_shown_at = time.monotonic()
+        self.adaptive_order = False
+        self.exercise_scheduler = None
+        self.drill = None
+        self.vocab_by_lesson = {}
+        self.vocab_views = None
+        self.learned_lesson_numbers = []
+        self.course_view = None
+        self.course_expanded = None
+        self.lesson_filter_var = None
+        self.lesson_filter_job = None
+        self.grammar_index = GrammarIndex()
+        self.dictionary = None
+        self.lookup_window = None
+        self.segmenter = None
         
         # Create UI
         self.create_widgets()
+        self.show_loading("Loading lessons...")
+        self.io.submit(self.load_startup_data, on_done=self.on_startup_data_loaded,
+                       on_error=self.on_startup_error)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def load_startup_data(self):
+        """Read progress, scan lessons and load the current lesson (worker thread)"""
+        # Finish a lesson pack update that was interrupted before reading any lessons
+        recover_update()
+        lesson_manager = LessonManager()
+        current_lesson = lesson_manager.load_lesson(lesson_manager.get_current_lesson())
+        return lesson_manager, current_lesson
+    
+    def on_startup_data_loaded(self, result):
+        self.lesson_manager, self.current_lesson = result
+        self.vocab_views = VocabViews(self.lesson_manager.vocab_table)
         self.show_lesson_selection()
+        # Bring the grammar reference up to date while the user picks a lesson
+        self.io.submit(self.grammar_index.update)
+        # The dictionary index is only compiled when dictionary.tsv is new or changed
+        self.io.submit(open_dictionary, on_done=self.on_dictionary_loaded, on_error=self.on_dictionary_error)
+    
+    def on_dictionary_loaded(self, dictionary):
+        self.dictionary = dictionary
+        # Segment every example sentence up front, using the dictionary to recognise stems
+        is_word = (lambda word: bool(dictionary.lookup(word))) if dictionary else None
+        self.io.submit(corpus_segmenter, "lessons", is_word, on_done=self.on_segmenter_loaded)
+    
+    def on_dictionary_error(self, error):
+        print(f"Error opening dictionary: {error}")
+        self.on_dictionary_loaded(None)
+    
+    def on_segmenter_loaded(self, segmenter):
+        self.segmenter = segmenter
+    
+    def on_startup_error(self, error):
+        self.show_loading(f"Error loading lessons: {error}")
+    
+    def on_close(self):
+        """Flush pending attempts and stop background I/O before closing the window"""
+        self.watchdog.stop()
+        # Tasks already running may be reading the dictionary, so wait for them before unmapping it
+        self.io.shutdown(wait=True)
+        self.attempt_log.close()
+        if self.dictionary:
+            self.dictionary.close()
+        self.root.destroy()
     
     def create_button(self, parent, text, command, 
                      font=('Arial', 14, 'bold'), 
@@ -89,7 +181,8 @@ class KoreanLearningApp:
             ("Lesson Overview", self.show_lesson_overview),
             ("Vocabulary", self.show_vocabulary),
             ("Grammar", self.show_grammar),
-            ("Exercises", self.show_exercises)
+            ("Exercises", self.show_exercises),
+            ("Drill", self.show_drill)
         ]
         
         for text, command in nav_buttons:
@@ -103,10 +196,20 @@ class KoreanLearningApp:
         self.nav_frame.pack_forget()
     
     def clear_content(self):
-        """Clear all widgets from content frame"""
+        """Clear all widgets from content frame and cancel loads for the old view"""
+        self.io.cancel_group("view")
+        self.media.cancel()
+        self.renderer.cancel()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
     
+    def show_loading(self, message):
+        """Show a placeholder while data loads in the background"""
+        self.clear_content()
+        loading_label = self.create_label(self.content_frame, message, 
+                                        font=('Arial', 16, 'italic'), fg='#6b7280')
+        loading_label.pack(pady=50)
+    
     def show_lesson_selection(self):
         """Show lesson selection interface"""
         self.hide_lesson_navigation()
@@ -133,7 +236,11 @@ class KoreanLearningApp:
         vocab_review_btn = self.create_button(self.top_frame, "📚 Review All Vocabulary", 
                                             self.show_vocabulary_review, 
                                             bg='#059669', fg='white', relief=tk.RAISED, bd=2)
-        vocab_review_btn.pack(pady=(0, 20))
+        vocab_review_btn.pack(pady=(0, 10))
+        
+        grammar_ref_btn = self.create_button(self.top_frame, "📖 Grammar Reference", 
+                                           self.show_grammar_reference)
+        grammar_ref_btn.pack(pady=(0, 20))
         
         # Lesson list
         lessons = self.lesson_manager.get_available_lessons()
@@ -144,60 +251,53 @@ class KoreanLearningApp:
             no_lessons.pack(pady=50)
             return
         
-        # Create scrollable frame for lessons
-        canvas = tk.Canvas(self.content_frame, bg='#ffffff')
-        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = self.create_content_frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Add lessons to scrollable frame
-        for lesson in lessons:
-            self.create_lesson_button(scrollable_frame, lesson)
-        
-        canvas.pack(side="left", fill="both", expand=True)
+        # Title filter; typing is debounced so large courses are not re-filtered per key
+        filter_frame = self.create_content_frame(self.top_frame)
+        filter_frame.pack(pady=(0, 10))
+        filter_label = self.create_label(filter_frame, "Find lesson:", font=('Arial', 14))
+        filter_label.pack(side=tk.LEFT, padx=(0, 10))
+        self.lesson_filter_var = tk.StringVar()
+        filter_entry = tk.Entry(filter_frame, textvariable=self.lesson_filter_var,
+                                font=('Arial', 14), width=30)
+        filter_entry.pack(side=tk.LEFT)
+        self.lesson_filter_var.trace_add("write", lambda *args: self.schedule_lesson_filter())
+        
+        # Units start collapsed except the one holding the current lesson
+        course_tree = self.lesson_manager.course_tree
+        if self.course_expanded is None:
+            current_unit = course_tree.unit_of.get(self.lesson_manager.get_current_lesson())
+            self.course_expanded = {current_unit["key"]} if current_unit else set()
+        
+        self.course_view = CourseTreeCanvas(self.content_frame, course_tree, self.select_lesson,
+                                            expanded=self.course_expanded)
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=self.course_view.yview)
+        self.course_view.configure(yscrollcommand=scrollbar.set)
+        
+        self.course_view.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+        self.course_view.refresh(keep_position=False)
     
-    def create_lesson_button(self, parent, lesson):
-        """Create a button for lesson selection"""
-        lesson_frame = self.create_content_frame(parent, bg='#f9fafb', relief=tk.SOLID, bd=1)
-        lesson_frame.pack(fill=tk.X, pady=5, padx=10)
-        
-        is_completed = self.lesson_manager.is_lesson_completed(lesson["number"])
-        
-        # Lesson info
-        lesson_title = f"Lesson {lesson['number']}: {lesson['title']}"
-        status = " ✓" if is_completed else ""
-        
-        # Different colors for completed vs incomplete lessons
-        if is_completed:
-            bg_color = '#d1fae5'
-            fg_color = '#065f46'
-            active_bg = '#a7f3d0'
-        else:
-            bg_color = '#f9fafb'
-            fg_color = '#1f2937'
-            active_bg = '#e5e7eb'
-        
-        lesson_btn = self.create_button(lesson_frame, lesson_title + status,
-                                      lambda l=lesson: self.select_lesson(l["number"]),
-                                      font=('Arial', 16, 'bold'),
-                                      bg=bg_color, fg=fg_color,
-                                      activebackground=active_bg, activeforeground=fg_color,
-                                      padx=20, pady=15, relief=tk.SOLID, bd=1)
-        lesson_btn.pack(fill=tk.X, padx=10, pady=10)
+    def schedule_lesson_filter(self):
+        """Apply the lesson filter shortly after the user stops typing"""
+        if self.lesson_filter_job:
+            self.root.after_cancel(self.lesson_filter_job)
+        self.lesson_filter_job = self.root.after(150, self.apply_lesson_filter)
+    
+    def apply_lesson_filter(self):
+        self.lesson_filter_job = None
+        if self.course_view.winfo_exists():
+            self.course_view.set_filter(self.lesson_filter_var.get())
     
     def select_lesson(self, lesson_number):
-        """Select and load a specific lesson"""
-        self.current_lesson = self.lesson_manager.load_lesson(lesson_number)
-        
-        if not self.current_lesson:
+        """Select a lesson and load it in the background"""
+        self.show_loading(f"Loading lesson {lesson_number}...")
+        self.io.submit(self.lesson_manager.load_lesson, lesson_number,
+                       on_done=lambda lesson: self.on_lesson_loaded(lesson_number, lesson),
+                       group="view")
+    
+    def on_lesson_loaded(self, lesson_number, lesson):
+        """Show a lesson once it has been loaded"""
+        if not lesson:
             # Show error message
             self.clear_content()
             error_label = self.create_label(self.content_frame, 
@@ -205,13 +305,14 @@ class KoreanLearningApp:
             error_label.pack(pady=50)
             return
         
+        self.current_lesson = lesson
+        
         # Update current lesson in progress
         self.lesson_manager.set_current_lesson(lesson_number)
         
         # Reset exercise state
-        self.current_exercise_index = 0
         self.current_vocab_page = 0
-        self.exercises_completed_count = 0
+        self.reset_exercise_order()
         
         # Show lesson navigation and overview
         self.show_lesson_navigation()
@@ -237,10 +338,20 @@ class KoreanLearningApp:
                                        font=('Arial', 14, 'bold'), fg=status_color)
         status_label.pack()
         
+        # Exercise accuracy from the compacted attempt aggregates
+        stats = self.attempt_log.get_lesson_stats(self.current_lesson['lesson_number'])
+        if stats:
+            accuracy = stats["correct"] / stats["attempts"] * 100
+            stats_label = self.create_label(self.top_frame, 
+                                          f"Accuracy: {accuracy:.0f}% over {stats['attempts']} attempts", 
+                                          font=('Arial', 14, 'italic'), fg='#6b7280')
+            stats_label.pack()
+        
+        counts = self.current_lesson["derived"]["counts"]
         overview_text = f"""
-{len(self.current_lesson['vocabulary'])} vocabulary words
-{len(self.current_lesson['grammar_rules'])} grammar rules  
-{len(self.current_lesson['exercises'])} exercises
+{counts['vocabulary']} vocabulary words
+{counts['grammar_rules']} grammar rules  
+{counts['exercises']} exercises
 
 Use the navigation buttons above to explore different sections of this lesson."""
         
@@ -271,21 +382,11 @@ Use the navigation buttons above to explore different sections of this lesson.""
         page_info.pack(pady=(0, 15), anchor=tk.W)
         
         # Show vocabulary for current page
-        for vocab in vocab_list[start_idx:end_idx]:
-            vocab_frame = self.create_content_frame(self.content_frame, bg='#f9fafb', relief=tk.SOLID, bd=1)
-            vocab_frame.pack(fill=tk.X, pady=10, padx=0)
-            
-            korean_label = self.create_label(vocab_frame, vocab["korean"], 
-                                           font=('Arial', 20, 'bold'), fg='#dc2626', bg='#f9fafb')
-            korean_label.pack(anchor=tk.W, padx=15, pady=(10, 5))
-            
-            rom_label = self.create_label(vocab_frame, f"[{vocab['romanization']}]", 
-                                        font=('Arial', 14, 'italic'), fg='#6b7280', bg='#f9fafb')
-            rom_label.pack(anchor=tk.W, padx=15)
-            
-            eng_label = self.create_label(vocab_frame, vocab["english"], 
-                                        font=('Arial', 16), fg='#1f2937', bg='#f9fafb')
-            eng_label.pack(anchor=tk.W, padx=15, pady=(0, 10))
+        cards = VocabCardCanvas(self.content_frame, layout="stacked", fit=True, padx=0,
+                                image_loader=self.media.load,
+                                on_click=lambda vocab: self.show_lookup(vocab["korean"]))
+        cards.pack(fill=tk.X)
+        cards.set_rows(("card", vocab) for vocab in vocab_list[start_idx:end_idx])
         
         # Navigation buttons
         if total_pages > 1:
@@ -327,12 +428,14 @@ Use the navigation buttons above to explore different sections of this lesson.""
             no_grammar.pack(pady=20)
             return
         
-        for rule in self.current_lesson["grammar_rules"]:
-            self.create_grammar_rule_display(rule)
-        
-        # Show example sentences
+        # Rules and examples are built in time-sliced chunks, first screenful first
+        steps = [lambda rule=rule: self.create_grammar_rule_display(rule)
+                 for rule in self.current_lesson["grammar_rules"]]
         if self.current_lesson["example_sentences"]:
-            self.create_example_sentences_display()
+            steps.append(self.create_example_sentences_title)
+            steps.extend(lambda example=example: self.create_example_display(example)
+                         for example in self.current_lesson["example_sentences"])
+        self.renderer.run(steps)
     
     def create_grammar_rule_display(self, rule):
         """Create display for a single grammar rule"""
@@ -355,28 +458,92 @@ Use the navigation buttons above to explore different sections of this lesson.""
             note = self.create_label(rule_frame, f"Note: {rule['formality_note']}", 
                                    font=('Arial', 12), bg='#f9fafb', fg='#6b7280')
             note.pack(anchor=tk.W, padx=15, pady=(0, 10))
+        
+        if rule.get("image"):
+            image_label = self.create_label(rule_frame, "", bg='#f9fafb')
+            image_label.pack(anchor=tk.W, padx=15, pady=(0, 10))
+            self.media.load(rule["image"], 240, lambda photo: self.show_image(image_label, photo))
     
-    def create_example_sentences_display(self):
-        """Create display for example sentences"""
+    def show_image(self, label, photo):
+        """Put a loaded image on a label, if the label still exists"""
+        if label.winfo_exists():
+            label.configure(image=photo)
+            label.image = photo
+    
+    def create_example_sentences_title(self):
+        """Create the heading of the example sentences section"""
         examples_title = self.create_label(self.content_frame, "Example Sentences", 
                                          font=('Arial', 18, 'bold'), fg='#1f2937')
         examples_title.pack(pady=(30, 15), anchor=tk.W)
+    
+    def create_example_display(self, example):
+        """Create display for a single example sentence"""
+        example_frame = self.create_content_frame(self.content_frame, bg='#f9fafb', relief=tk.SOLID, bd=1)
+        example_frame.pack(fill=tk.X, pady=5, padx=0)
         
-        for example in self.current_lesson["example_sentences"]:
-            example_frame = self.create_content_frame(self.content_frame, bg='#f9fafb', relief=tk.SOLID, bd=1)
-            example_frame.pack(fill=tk.X, pady=5, padx=0)
-            
-            korean_label = self.create_label(example_frame, example["korean"], 
-                                           font=('Arial', 20, 'bold'), fg='#dc2626', bg='#f9fafb')
-            korean_label.pack(anchor=tk.W, padx=15, pady=(10, 5))
-            
-            rom_label = self.create_label(example_frame, example["romanization"], 
-                                        font=('Arial', 14, 'italic'), fg='#6b7280', bg='#f9fafb')
-            rom_label.pack(anchor=tk.W, padx=15)
-            
-            eng_label = self.create_label(example_frame, example["english"], 
-                                        font=('Arial', 16), fg='#1f2937', bg='#f9fafb')
-            eng_label.pack(anchor=tk.W, padx=15, pady=(0, 10))
+        korean_frame = self.create_sentence_words(example_frame, example["korean"], bg='#f9fafb')
+        korean_frame.pack(anchor=tk.W, padx=15, pady=(10, 5))
+        
+        rom_label = self.create_label(example_frame, example["romanization"], 
+                                    font=('Arial', 14, 'italic'), fg='#6b7280', bg='#f9fafb')
+        rom_label.pack(anchor=tk.W, padx=15)
+        
+        eng_label = self.create_label(example_frame, example["english"], 
+                                    font=('Arial', 16), fg='#1f2937', bg='#f9fafb')
+        eng_label.pack(anchor=tk.W, padx=15, pady=(0, 10))
+    
+    def create_sentence_words(self, parent, sentence, bg='#ffffff'):
+        """Create a row of Korean words whose parts can each be clicked to look them up"""
+        frame = self.create_content_frame(parent, bg=bg)
+        # Segmentations are precomputed for every example sentence, so this is a dict lookup
+        if self.segmenter:
+            words = self.segmenter.segment(sentence)
+        else:
+            words = [[(word, "noun", word)] for word in sentence.split()]
+        
+        for tokens in words:
+            word_frame = self.create_content_frame(frame, bg=bg)
+            word_frame.pack(side=tk.LEFT, padx=(0, 8))
+            for text, kind, lemma in tokens:
+                token_label = self.create_label(word_frame, text, font=('Arial', 20, 'bold'),
+                                                fg=TOKEN_COLORS[kind], bg=bg, padx=0, bd=0)
+                token_label.pack(side=tk.LEFT)
+                if kind == "punctuation":
+                    continue
+                token_label.config(cursor="hand2")
+                token_label.bind("<Enter>", lambda e: e.widget.config(bg='#fde68a'))
+                token_label.bind("<Leave>", lambda e, bg=bg: e.widget.config(bg=bg))
+                token_label.bind("<Button-1>",
+                                 lambda e, lemma=lemma, kind=kind: self.show_lookup(lemma, TOKEN_NOTES.get(kind)))
+        return frame
+    
+    def show_lookup(self, word, note=None):
+        """Show the dictionary entry for a word in a small window near the pointer"""
+        word = word.strip(PUNCTUATION)
+        if self.dictionary is None:
+            text = f"{word}\n\nNo dictionary installed. Put a dictionary.tsv file (word<TAB>definition) next to the app."
+        else:
+            result = self.dictionary.lookup_word(word)
+            if result is None:
+                text = f"{word}\n\nNot found in the dictionary."
+            else:
+                headword, definitions = result
+                senses = "\n".join(f"{i}. {'; '.join(fields)}" for i, fields in enumerate(definitions[:8], 1))
+                text = f"{headword}\n\n{senses}" if headword == word else f"{word} → {headword}\n\n{senses}"
+        if note:
+            text = f"{note}\n{text}"
+        
+        if self.lookup_window is None or not self.lookup_window.winfo_exists():
+            self.lookup_window = tk.Toplevel(self.root, bg='#ffffff')
+            self.lookup_window.title("Dictionary")
+            self.lookup_window.transient(self.root)
+            self.lookup_label = self.create_label(self.lookup_window, "", wraplength=400)
+            self.lookup_label.pack(padx=15, pady=15)
+            self.lookup_window.bind("<Escape>", lambda e: self.lookup_window.destroy())
+        self.lookup_label.config(text=text)
+        self.lookup_window.geometry(f"+{self.root.winfo_pointerx() + 10}+{self.root.winfo_pointery() + 10}")
+        self.lookup_window.deiconify()
+        self.lookup_window.lift()
     
     def show_exercises(self):
         self.clear_content()
@@ -386,16 +553,22 @@ Use the navigation buttons above to explore different sections of this lesson.""
             no_exercises.pack(pady=50)
             return
         
-        if self.current_exercise_index >= len(self.current_lesson["exercises"]):
+        if self.exercises_completed_count >= len(self.current_lesson["exercises"]):
             self.show_exercises_completed()
             return
         
         exercise = self.current_lesson["exercises"][self.current_exercise_index]
         
         title = self.create_label(self.content_frame, 
-                                f"Exercise {self.current_exercise_index + 1} of {len(self.current_lesson['exercises'])}", 
+                                f"Exercise {self.exercises_completed_count + 1} of {len(self.current_lesson['exercises'])}", 
                                 font=('Arial', 20, 'bold'), fg='#1f2937')
-        title.pack(pady=(0, 30))
+        title.pack(pady=(0, 10))
+        
+        order_text = "Adaptive order: On" if self.adaptive_order else "Adaptive order: Off"
+        if self.exercise_scheduler:
+            order_text += f" (seed {self.exercise_scheduler.seed})"
+        order_btn = self.create_button(self.content_frame, order_text, self.toggle_adaptive_order)
+        order_btn.pack(pady=(0, 20))
         
         exercise_handlers = {
             "multiple_choice": self.show_multiple_choice_exercise,
@@ -406,6 +579,7 @@ Use the navigation buttons above to explore different sections of this lesson.""
         handler = exercise_handlers.get(exercise["type"])
         if handler:
             handler(exercise)
+        self.exercise_shown_at = time.monotonic()
     
     def show_exercises_completed(self):
         """Display completion message and options"""
@@ -413,8 +587,15 @@ Use the navigation buttons above to explore different sections of this lesson.""
                                           font=('Arial', 20, 'bold'), fg='#059669')
         completed_label.pack(pady=50)
         
-        # Mark lesson as completed
-        self.lesson_manager.mark_lesson_completed(self.current_lesson['lesson_number'])
+        # Mark lesson as completed and merge its words into the sorted review views
+        unlocked = self.lesson_manager.mark_lesson_completed(self.current_lesson['lesson_number'])
+        self.vocab_views.add_lesson(self.current_lesson)
+        
+        if unlocked:
+            unlocked_text = "Unlocked: " + ", ".join(f"Lesson {number}" for number in unlocked)
+            unlocked_label = self.create_label(self.content_frame, unlocked_text,
+                                             font=('Arial', 16), fg='#1f2937')
+            unlocked_label.pack(pady=(0, 10))
         
         button_frame = self.create_content_frame(self.content_frame)
         button_frame.pack(pady=20)
@@ -473,7 +654,14 @@ Use the navigation buttons above to explore different sections of this lesson.""
         self.built_word = ""
         self.word_display = self.create_label(self.content_frame, "[ ]", 
                                             font=('Arial', 24, 'bold'), fg='#dc2626')
-        self.word_display.pack(pady=(0, 20))
+        self.word_display.pack(pady=(0, 5))
+        # The word can also be typed on a Latin keyboard with the built-in Hangul input
+        self.word_input = HangulInput(self.word_display, self.update_built_word,
+                                      lambda text: self.check_word_building(exercise))
+        typing_hint = self.create_label(self.content_frame,
+                                        "Type with the 2-beolsik layout (Shift+Space switches Korean/Latin), "
+                                        "Enter submits", font=('Arial', 12), fg='#6b7280')
+        typing_hint.pack(pady=(0, 20))
         
         # Syllable buttons
         self.create_syllable_grid(exercise)
@@ -508,42 +696,48 @@ Use the navigation buttons above to explore different sections of this lesson.""
         submit_btn.pack(side=tk.LEFT, padx=10)
     
     def add_syllable(self, syllable, exercise):
-        self.built_word += syllable
-        self.word_display.config(text=f"[ {self.built_word} ]")
+        self.word_input.composer.insert(syllable)
+        self.update_built_word(self.word_input.text)
+    
+    def update_built_word(self, text):
+        self.built_word = text
+        self.word_display.config(text=f"[ {text} ]")
     
     def clear_built_word(self):
-        self.built_word = ""
-        self.word_display.config(text="[ ]")
+        self.word_input.composer.clear()
+        self.update_built_word("")
+    
+    def record_attempt(self, answer, is_correct, index=None, latency=None):
+        """Log the answer to an exercise (default: the current one) with its response time"""
+        if index is None:
+            index = self.current_exercise_index
+        if latency is None:
+            latency = time.monotonic() - self.exercise_shown_at
+        self.log_attempt(index, answer, is_correct, latency)
+        if self.exercise_scheduler:
+            self.exercise_scheduler.record(index, is_correct)
+    
+    def log_attempt(self, index, answer, is_correct, latency):
+        """Append an answer to the attempt log"""
+        derived = self.current_lesson["derived"]["exercises"][index]
+        self.attempt_log.record(self.current_lesson['lesson_number'], derived["id"],
+                                answer, is_correct, latency)
     
     def check_multiple_choice(self, exercise, selected_idx):
-        if selected_idx == exercise["correct"]:
-            result_text = "Correct! " + exercise["explanation"]
-            bg_color = '#d1fae5'
-        else:
-            result_text = f"Incorrect. The correct answer is: {exercise['options'][exercise['correct']]}. " + exercise["explanation"]
-            bg_color = '#fecaca'
-        
-        self.show_result(result_text, bg_color)
+        is_correct, result_text = grade_multiple_choice(exercise, selected_idx)
+        self.record_attempt(exercise["options"][selected_idx], is_correct)
+        self.show_result(result_text, CORRECT_COLOR if is_correct else INCORRECT_COLOR)
     
     def check_syllable_choice(self, exercise, selected_idx):
-        if selected_idx == exercise["correct"]:
-            result_text = "Correct!"
-            bg_color = '#d1fae5'
-        else:
-            result_text = f"Incorrect. The correct answer is: {exercise['syllable_options'][exercise['correct']]}"
-            bg_color = '#fecaca'
-        
-        self.show_result(result_text, bg_color)
+        is_correct, result_text = grade_syllable_choice(exercise, selected_idx)
+        self.record_attempt(exercise["syllable_options"][selected_idx], is_correct)
+        self.show_result(result_text, CORRECT_COLOR if is_correct else INCORRECT_COLOR)
     
     def check_word_building(self, exercise):
-        if self.built_word == exercise["target"]:
-            result_text = "Correct! Perfect!"
-            bg_color = '#d1fae5'
-        else:
-            result_text = f"Incorrect. The correct answer is: {exercise['target']}"
-            bg_color = '#fecaca'
-        
-        self.show_result(result_text, bg_color)
+        answer = self.current_lesson["derived"]["exercises"][self.current_exercise_index]["answer"]
+        is_correct, result_text = grade_word_building(exercise, self.built_word, answer)
+        self.record_attempt(self.built_word, is_correct)
+        self.show_result(result_text, CORRECT_COLOR if is_correct else INCORRECT_COLOR)
     
     def show_result(self, result_text, bg_color):
         self.clear_content()
@@ -559,15 +753,136 @@ Use the navigation buttons above to explore different sections of this lesson.""
         next_btn.pack(pady=20)
     
     def next_exercise(self):
-        self.current_exercise_index += 1
         self.exercises_completed_count += 1
+        if self.exercise_scheduler:
+            self.current_exercise_index = self.exercise_scheduler.next()
+        else:
+            self.current_exercise_index += 1
         self.show_exercises()
     
     def restart_exercises(self):
-        self.current_exercise_index = 0
+        self.reset_exercise_order()
+        self.show_exercises()
+    
+    def reset_exercise_order(self, seed=None):
+        """Start a new exercise session, in file order or scheduled by past mistakes"""
         self.exercises_completed_count = 0
+        self.current_exercise_index = 0
+        self.exercise_scheduler = None
+        if not self.adaptive_order or not self.current_lesson["exercises"]:
+            return
+        
+        self.exercise_scheduler = self.create_exercise_scheduler(seed)
+        self.current_exercise_index = self.exercise_scheduler.next()
+    
+    def create_exercise_scheduler(self, seed=None):
+        """Schedule the current lesson's exercises by their logged mistakes"""
+        exercise_ids = [derived["id"] for derived in self.current_lesson["derived"]["exercises"]]
+        return AdaptiveScheduler(exercise_ids, self.attempt_log.get_exercise_stats, seed)
+    
+    def toggle_adaptive_order(self):
+        self.adaptive_order = not self.adaptive_order
+        self.reset_exercise_order()
         self.show_exercises()
     
+    def show_drill(self):
+        """Drill the lesson's exercises back to back, answered from the keyboard"""
+        self.clear_content()
+        exercises = self.current_lesson["exercises"]
+        if not exercises:
+            no_exercises = self.create_label(self.content_frame, "No exercises in this lesson.")
+            no_exercises.pack(pady=50)
+            return
+        
+        # The drill never runs out: adaptive order reschedules answered items, file order wraps around.
+        # It has its own scheduler so the exercise screen's order and position are left alone.
+        scheduler = self.create_exercise_scheduler() if self.adaptive_order else None
+        if scheduler:
+            next_index = scheduler.next
+        else:
+            order = itertools.cycle(range(len(exercises)))
+            next_index = lambda: next(order)
+        
+        def on_answer(index, answer, is_correct, latency):
+            self.log_attempt(index, answer, is_correct, latency)
+            if scheduler:
+                scheduler.record(index, is_correct)
+        
+        answers = [derived["answer"] for derived in self.current_lesson["derived"]["exercises"]]
+        self.drill = DrillView(self.content_frame, exercises, answers, next_index,
+                               on_answer=on_answer, on_stop=self.show_exercises,
+                               dispatch=self.drill_input)
+        self.drill.pack(fill=tk.BOTH, expand=True)
+        self.drill.start()
+    
+    def drill_input(self, name, *args):
+        """Pass a key or button press to the drill (a method of DrillView and its arguments)"""
+        if self.drill and self.drill.winfo_exists():
+            getattr(self.drill, name)(*args)
+    
+    def show_grammar_reference(self):
+        """Show every rule with its examples and exercises from across the course"""
+        self.hide_lesson_navigation()
+        for widget in self.top_frame.winfo_children():
+            widget.destroy()
+        
+        title = self.create_label(self.top_frame, "📖 Grammar Reference", font=('Arial', 24, 'bold'), fg='#1f2937')
+        title.pack(pady=(0, 10))
+        back_btn = self.create_button(self.top_frame, "← Back to Lessons", self.show_lesson_selection)
+        back_btn.pack(pady=(0, 20))
+        
+        # Only lesson files changed since the last update are re-read
+        self.show_loading("Updating grammar index...")
+        self.io.submit(self.grammar_index.update,
+                       on_done=lambda reindexed: self.display_grammar_reference(), group="view")
+    
+    def display_grammar_reference(self):
+        self.clear_content()
+        rules = self.grammar_index.rule_ids()
+        if not rules:
+            no_rules = self.create_label(self.content_frame, "No grammar rules found in the lessons.")
+            no_rules.pack(pady=50)
+            return
+        
+        rule_list = tk.Listbox(self.content_frame, font=('Arial', 14), width=32, exportselection=False)
+        rule_list.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 20))
+        for _, rule_title in rules:
+            rule_list.insert(tk.END, rule_title)
+        
+        detail_frame = self.create_content_frame(self.content_frame)
+        detail_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.grammar_ref_label = self.create_label(detail_frame, "", wraplength=700)
+        self.grammar_ref_label.pack(anchor=tk.W, pady=(0, 10))
+        # Clicking an example opens the lesson it comes from
+        self.grammar_ref_cards = VocabCardCanvas(detail_frame, layout="stacked",
+                                                 on_click=lambda example: self.select_lesson(example["lesson_number"]))
+        scrollbar = ttk.Scrollbar(detail_frame, orient="vertical", command=self.grammar_ref_cards.yview)
+        self.grammar_ref_cards.configure(yscrollcommand=scrollbar.set)
+        self.grammar_ref_cards.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        rule_list.bind("<<ListboxSelect>>",
+                       lambda e: self.show_grammar_rule_uses(rules[rule_list.curselection()[0]][0])
+                       if rule_list.curselection() else None)
+        rule_list.selection_set(0)
+        self.show_grammar_rule_uses(rules[0][0])
+    
+    def show_grammar_rule_uses(self, rule_id):
+        """Show the explanation, examples and exercise counts of one rule by lesson"""
+        uses = self.grammar_index.lookup(rule_id)
+        taught = next((entry for _, _, entry in uses if entry["explanation"]), None)
+        if taught:
+            self.grammar_ref_label.config(text=f"{taught['explanation']}\nPattern: {taught['pattern']}")
+        else:
+            self.grammar_ref_label.config(text=f"{rule_id} is used in examples but not taught in any lesson.")
+        
+        rows = []
+        for lesson_number, lesson_title, entry in uses:
+            rows.append(("header", f"Lesson {lesson_number}: {lesson_title} "
+                                   f"({len(entry['examples'])} examples, {len(entry['exercises'])} exercises)"))
+            rows.extend(("card", dict(example, lesson_number=lesson_number)) for example in entry["examples"])
+        self.grammar_ref_cards.set_rows(rows)
+    
     def show_vocabulary_review(self):
         """Show vocabulary review for all completed lessons plus current lesson"""
         self.clear_content()
@@ -584,8 +899,16 @@ Use the navigation buttons above to explore different sections of this lesson.""
                                     self.show_lesson_selection)
         back_btn.pack(pady=(0, 20))
         
-        # Get vocabulary from completed lessons + current lesson
-        vocab_by_lesson = self.get_learned_vocabulary()
+        # Load vocabulary from completed lessons + current lesson in the background
+        self.show_loading("Loading vocabulary...")
+        self.learned_lesson_numbers = self.get_learned_lesson_numbers()
+        self.io.submit(self.get_learned_vocabulary, self.learned_lesson_numbers,
+                       on_done=self.on_learned_vocabulary_loaded, group="view")
+    
+    def on_learned_vocabulary_loaded(self, vocab_by_lesson):
+        """Show the vocabulary review once the learned lessons have been read"""
+        self.clear_content()
+        self.vocab_by_lesson = vocab_by_lesson
         
         if not vocab_by_lesson:
             no_vocab = self.create_label(self.content_frame, 
@@ -594,9 +917,9 @@ Use the navigation buttons above to explore different sections of this lesson.""
             return
         
         # Create vocabulary display options
-        self.vocab_review_mode = "by_lesson"  # or "all_words"
+        self.vocab_review_mode = "by_lesson"  # or "all_words" / "all_words_english"
         self.create_vocabulary_review_controls()
-        self.display_vocabulary_review(vocab_by_lesson)
+        self.display_vocabulary_review(self.vocab_by_lesson)
     
     def create_vocabulary_review_controls(self):
         """Create controls for vocabulary review display"""
@@ -614,8 +937,15 @@ Use the navigation buttons above to explore different sections of this lesson.""
                                          lambda: self.switch_vocab_mode("all_words"))
         all_words_btn.pack(side=tk.LEFT, padx=5)
         
+        english_btn = self.create_button(controls_frame, "All Words (English)", 
+                                       lambda: self.switch_vocab_mode("all_words_english"))
+        english_btn.pack(side=tk.LEFT, padx=5)
+        
+        export_btn = self.create_button(controls_frame, "Export...", self.export_learned_vocabulary)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        
         # Stats
-        vocab_by_lesson = self.get_learned_vocabulary()
+        vocab_by_lesson = self.vocab_by_lesson
         total_words = sum(len(words) for words in vocab_by_lesson.values())
         total_lessons = len(vocab_by_lesson)
         
@@ -623,11 +953,28 @@ Use the navigation buttons above to explore different sections of this lesson.""
         stats_label = self.create_label(controls_frame, stats_text, 
                                       font=('Arial', 14, 'italic'), fg='#6b7280')
         stats_label.pack(side=tk.RIGHT)
+        self.vocab_stats_label = stats_label
+    
+    def export_learned_vocabulary(self):
+        """Ask for a file and stream the learned vocabulary to it in the background"""
+        path = filedialog.asksaveasfilename(
+            title="Export Vocabulary",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("TSV", "*.tsv"), ("Anki text", "*.txt")])
+        if not path:
+            return
+        
+        self.vocab_stats_label.config(text="Exporting...")
+        self.io.submit(export_vocabulary, path, None, str(self.lesson_manager.lessons_dir),
+                       self.learned_lesson_numbers,
+                       on_done=lambda count: self.vocab_stats_label.config(text=f"Exported {count} words"),
+                       on_error=lambda e: self.vocab_stats_label.config(text=f"Export failed: {e}"),
+                       group="view")
     
     def switch_vocab_mode(self, mode):
         """Switch between vocabulary review modes"""
         self.vocab_review_mode = mode
-        vocab_by_lesson = self.get_learned_vocabulary()
+        vocab_by_lesson = self.vocab_by_lesson
         
         # Clear existing display
         for widget in self.content_frame.winfo_children():
@@ -638,128 +985,59 @@ Use the navigation buttons above to explore different sections of this lesson.""
         
         self.display_vocabulary_review(vocab_by_lesson)
     
-    def get_learned_vocabulary(self):
-        """Get vocabulary from completed lessons plus current lesson"""
-        vocab_by_lesson = {}
-        
-        # Get completed lessons
-        completed_lessons = self.lesson_manager.progress_data["completed_lessons"]
-        current_lesson_num = self.lesson_manager.get_current_lesson()
-        
-        # Include current lesson in review
-        lessons_to_include = set(completed_lessons + [current_lesson_num])
-        
-        for lesson_num in sorted(lessons_to_include):
+    def get_learned_lesson_numbers(self):
+        """Get completed lessons plus the current lesson"""
+        return self.lesson_manager.get_learned_lessons()
+    
+    def get_learned_vocabulary(self, lesson_numbers):
+        """Get vocabulary from the given lessons (safe to call on a worker thread)"""
+        # Only lessons not yet merged into the sorted views are read from disk
+        for lesson_num in lesson_numbers:
+            if self.vocab_views.has_lesson(lesson_num):
+                continue
             lesson_data = self.lesson_manager.load_lesson(lesson_num)
-            if lesson_data and lesson_data.get("vocabulary"):
-                lesson_title = f"Lesson {lesson_num}: {lesson_data.get('lesson_title', 'Unknown')}"
-                vocab_by_lesson[lesson_title] = lesson_data["vocabulary"]
+            if lesson_data:
+                self.vocab_views.add_lesson(lesson_data)
         
-        return vocab_by_lesson
+        return self.vocab_views.by_lesson(lesson_numbers)
     
     def display_vocabulary_review(self, vocab_by_lesson):
         """Display vocabulary review based on current mode"""
-        # Create scrollable frame for vocabulary
-        canvas = tk.Canvas(self.content_frame, bg='#ffffff')
-        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = self.create_content_frame(canvas)
-        scrollable_frame.vocab_display = True  # Mark as vocab display frame
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # All cards are drawn on a single canvas; only visible rows get items
+        layout = "inline" if self.vocab_review_mode == "by_lesson" else "detail"
+        cards = VocabCardCanvas(self.content_frame, layout=layout,
+                                resolve=lambda ref: self.lesson_manager.vocab_table.entry(*ref),
+                                image_loader=self.media.load,
+                                on_click=lambda vocab: self.show_lookup(vocab["korean"]))
+        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=cards.yview)
+        cards.configure(yscrollcommand=scrollbar.set)
         
         if self.vocab_review_mode == "by_lesson":
-            self.display_vocab_by_lesson(scrollable_frame, vocab_by_lesson)
+            self.display_vocab_by_lesson(cards, vocab_by_lesson)
         else:
-            self.display_all_vocab_words(scrollable_frame, vocab_by_lesson)
+            self.display_all_vocab_words(cards, vocab_by_lesson)
         
-        canvas.pack(side="left", fill="both", expand=True)
+        cards.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def display_vocab_by_lesson(self, parent, vocab_by_lesson):
+    def display_vocab_by_lesson(self, cards, vocab_by_lesson):
         """Display vocabulary organized by lesson"""
-        for lesson_title, vocabulary in vocab_by_lesson.items():
-            # Lesson header
-            lesson_header = self.create_label(parent, lesson_title, 
-                                            font=('Arial', 18, 'bold'), fg='#1f2937')
-            lesson_header.pack(anchor=tk.W, pady=(20, 10))
-            
-            # Vocabulary cards for this lesson
-            for vocab in vocabulary:
-                vocab_frame = self.create_content_frame(parent, bg='#f9fafb', relief=tk.SOLID, bd=1)
-                vocab_frame.pack(fill=tk.X, pady=5, padx=10)
-                
-                # Horizontal layout for compact display
-                content_frame = self.create_content_frame(vocab_frame)
-                content_frame.pack(fill=tk.X, padx=15, pady=10)
-                
-                korean_label = self.create_label(content_frame, vocab["korean"], 
-                                               font=('Arial', 18, 'bold'), fg='#dc2626', bg='#f9fafb')
-                korean_label.pack(side=tk.LEFT)
-                
-                rom_label = self.create_label(content_frame, f"[{vocab['romanization']}]", 
-                                            font=('Arial', 14, 'italic'), fg='#6b7280', bg='#f9fafb')
-                rom_label.pack(side=tk.LEFT, padx=(10, 0))
-                
-                eng_label = self.create_label(content_frame, f"- {vocab['english']}", 
-                                            font=('Arial', 16), fg='#1f2937', bg='#f9fafb')
-                eng_label.pack(side=tk.LEFT, padx=(10, 0))
-    
-    def display_all_vocab_words(self, parent, vocab_by_lesson):
-        """Display all vocabulary words in alphabetical order"""
-        # Flatten all vocabulary
-        all_vocab = []
-        for lesson_title, vocabulary in vocab_by_lesson.items():
-            for vocab in vocabulary:
-                vocab_with_lesson = vocab.copy()
-                vocab_with_lesson["lesson"] = lesson_title
-                all_vocab.append(vocab_with_lesson)
-        
-        # Sort by Korean word
-        all_vocab.sort(key=lambda x: x["korean"])
-        
-        # Display header
-        header = self.create_label(parent, f"All Vocabulary ({len(all_vocab)} words)", 
-                                 font=('Arial', 18, 'bold'), fg='#1f2937')
-        header.pack(anchor=tk.W, pady=(10, 20))
-        
-        # Display vocabulary
-        for vocab in all_vocab:
-            vocab_frame = self.create_content_frame(parent, bg='#f9fafb', relief=tk.SOLID, bd=1)
-            vocab_frame.pack(fill=tk.X, pady=3, padx=10)
-            
-            # Main content
-            content_frame = self.create_content_frame(vocab_frame)
-            content_frame.pack(fill=tk.X, padx=15, pady=8)
-            
-            # Korean and pronunciation
-            top_line = self.create_content_frame(content_frame)
-            top_line.pack(fill=tk.X)
-            
-            korean_label = self.create_label(top_line, vocab["korean"], 
-                                           font=('Arial', 18, 'bold'), fg='#dc2626', bg='#f9fafb')
-            korean_label.pack(side=tk.LEFT)
-            
-            rom_label = self.create_label(top_line, f"[{vocab['romanization']}]", 
-                                        font=('Arial', 14, 'italic'), fg='#6b7280', bg='#f9fafb')
-            rom_label.pack(side=tk.LEFT, padx=(10, 0))
-            
-            # English and lesson info
-            bottom_line = self.create_content_frame(content_frame)
-            bottom_line.pack(fill=tk.X)
-            
-            eng_label = self.create_label(bottom_line, vocab["english"], 
-                                        font=('Arial', 16), fg='#1f2937', bg='#f9fafb')
-            eng_label.pack(side=tk.LEFT)
-            
-            lesson_label = self.create_label(bottom_line, f"({vocab['lesson']})", 
-                                           font=('Arial', 12), fg='#6b7280', bg='#f9fafb')
-            lesson_label.pack(side=tk.RIGHT)
+        rows = []
+        for lesson_title, vocab_ids in vocab_by_lesson.items():
+            rows.append(("header", lesson_title))
+            rows.extend(("card", (vocab_id, None)) for vocab_id in vocab_ids)
+        
+        cards.set_rows(rows)
+    
+    def display_all_vocab_words(self, cards, vocab_by_lesson):
+        """Display all vocabulary words in Korean dictionary or English order"""
+        # (vocab id, lesson) references from the cached sorted view, no re-sort
+        order = "english" if self.vocab_review_mode == "all_words_english" else "korean"
+        all_vocab = self.vocab_views.get(order, self.learned_lesson_numbers)
+        
+        rows = [("header", f"All Vocabulary ({len(all_vocab)} words)")]
+        rows.extend(("card", ref) for ref in all_vocab)
+        cards.set_rows(rows)
 
 if __name__ == "__main__":
     root = tk.Tk()
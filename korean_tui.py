@@ -0,0 +1,396 @@
+import curses
+import locale
+import time
+import unicodedata
+
+from attempt_log import AttemptLog
+from grading import answer_text, grade_exercise
+from lesson_manager import LessonManager
+from lesson_updater import recover_update
+
+
+def display_width(text):
+    """Get the number of terminal cells a string occupies"""
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def clip(text, width):
+    """Truncate text to a number of terminal cells"""
+    used = 0
+    for i, char in enumerate(text):
+        used += 2 if unicodedata.east_asian_width(char) in "WF" else 1
+        if used > width:
+            return text[:i]
+    return text
+
+
+def wrap(text, width):
+    """Wrap text to a number of terminal cells, keeping words whole where possible"""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if display_width(candidate) <= width or not line:
+                line = candidate
+            else:
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+class KoreanTerminalApp:
+    """Curses front end sharing LessonManager and grading with the Tk app.
+
+    Each show_* method draws one screen, waits for a key and returns the next
+    screen method (or None to quit). Nothing here imports tkinter, and lessons
+    are listed from file names with titles read only for visible rows and
+    prerequisites read only for lessons changed since the last start, so
+    startup does not parse the whole course.
+    """
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        recover_update()
+        # print() would draw over the curses screen, so errors are kept and shown with "!"
+        self.errors = []
+        self.lesson_manager = LessonManager(lazy_scan=True, on_error=self.errors.append)
+        self.attempt_log = None
+        self.current_lesson = None
+
+        self.selected_index = 0
+        self.list_top = 0
+        self.current_vocab_page = 0
+        self.grammar_top = 0
+        self.current_exercise_index = 0
+        self.unlocked_lessons = []
+        self.built_parts = []
+        self.shown_exercise = None
+        self.exercise_shown_at = time.monotonic()
+
+    def run(self):
+        curses.curs_set(0)
+        self.stdscr.keypad(True)
+        screen = self.show_lesson_selection
+        try:
+            while screen:
+                screen = screen()
+        finally:
+            if self.attempt_log:
+                self.attempt_log.close()
+
+    def put(self, y, x, text, attr=0):
+        """Draw text clipped to the window, ignoring writes off screen"""
+        height, width = self.stdscr.getmaxyx()
+        if 0 <= y < height and x < width - 1:
+            try:
+                self.stdscr.addstr(y, x, clip(text, width - 1 - x), attr)
+            except curses.error:
+                pass
+
+    def draw_header(self, title, help_text):
+        """Clear the screen and draw a title and a key help line"""
+        self.stdscr.erase()
+        height, _ = self.stdscr.getmaxyx()
+        self.put(0, 0, title, curses.A_BOLD)
+        self.put(height - 1, 0, help_text, curses.A_DIM)
+
+    def show_lesson_selection(self):
+        lessons = self.lesson_manager.get_available_lessons()
+        progress = self.lesson_manager.get_progress_summary()
+        self.draw_header("Korean Learning App - Select Lesson",
+                         "↑/↓ move  Enter open  q quit")
+        self.put(1, 0, f"Progress: {progress['completed_lessons']}/{progress['total_lessons']} "
+                       f"lessons completed ({progress['completion_percentage']:.0f}%)")
+        if self.errors:
+            self.put(2, 0, f"{len(self.errors)} errors while reading lessons (! to show)", curses.A_DIM)
+
+        if not lessons:
+            self.put(3, 0, "No lessons found. Please add lesson files to the 'lessons' folder.")
+            return None if self.stdscr.getch() in (ord("q"), 27) else self.show_lesson_selection
+
+        height, _ = self.stdscr.getmaxyx()
+        rows = max(height - 4, 1)
+        self.selected_index = min(self.selected_index, len(lessons) - 1)
+        if self.selected_index < self.list_top:
+            self.list_top = self.selected_index
+        elif self.selected_index >= self.list_top + rows:
+            self.list_top = self.selected_index - rows + 1
+
+        completed = set(self.lesson_manager.progress_data["completed_lessons"])
+        for row, lesson in enumerate(lessons[self.list_top:self.list_top + rows]):
+            index = self.list_top + row
+            title = self.lesson_manager.get_lesson_title(lesson)
+            if lesson["number"] in completed:
+                status = " ✓"
+            elif not self.lesson_manager.is_lesson_unlocked(lesson["number"]):
+                missing = self.lesson_manager.get_missing_prerequisites(lesson["number"])
+                status = f"  (locked: needs lesson {', '.join(str(number) for number in missing)})"
+            else:
+                status = ""
+            attr = curses.A_REVERSE if index == self.selected_index else 0
+            self.put(3 + row, 2, f"Lesson {lesson['number']}: {title}{status}", attr)
+
+        key = self.stdscr.getch()
+        if key in (curses.KEY_UP, ord("k")):
+            self.selected_index = max(self.selected_index - 1, 0)
+        elif key in (curses.KEY_DOWN, ord("j")):
+            self.selected_index = min(self.selected_index + 1, len(lessons) - 1)
+        elif key == curses.KEY_PPAGE:
+            self.selected_index = max(self.selected_index - rows, 0)
+        elif key == curses.KEY_NPAGE:
+            self.selected_index = min(self.selected_index + rows, len(lessons) - 1)
+        elif key in (curses.KEY_ENTER, 10, 13):
+            lesson_number = lessons[self.selected_index]["number"]
+            if self.lesson_manager.is_lesson_unlocked(lesson_number):
+                return self.select_lesson(lesson_number)
+        elif key == ord("!") and self.errors:
+            return self.show_errors
+        elif key in (ord("q"), 27):
+            return None
+        return self.show_lesson_selection
+
+    def show_errors(self):
+        """List the errors reported while reading lessons and progress"""
+        height, width = self.stdscr.getmaxyx()
+        self.draw_header(f"Errors ({len(self.errors)})", "Press any key to return")
+        lines = [line for error in self.errors for line in wrap(error, width - 1)]
+        for row, line in enumerate(lines[:max(height - 3, 1)]):
+            self.put(2 + row, 0, line)
+        self.stdscr.getch()
+        return self.show_lesson_selection
+
+    def select_lesson(self, lesson_number):
+        """Load a lesson and reset per-lesson state"""
+        lesson = self.lesson_manager.load_lesson(lesson_number)
+        if not lesson:
+            self.draw_header("Error", "Press any key to return")
+            self.put(2, 0, f"Error loading lesson {lesson_number}. Please check the lesson file.")
+            self.stdscr.getch()
+            return self.show_lesson_selection
+
+        self.current_lesson = lesson
+        self.lesson_manager.set_current_lesson(lesson_number)
+        self.current_exercise_index = 0
+        self.unlocked_lessons = []
+        self.current_vocab_page = 0
+        self.grammar_top = 0
+        return self.show_lesson_overview
+
+    def lesson_menu_key(self, key, current):
+        """Handle the section keys shared by all lesson screens (current for other keys)"""
+        sections = {
+            ord("o"): self.show_lesson_overview,
+            ord("v"): self.show_vocabulary,
+            ord("g"): self.show_grammar,
+            ord("e"): self.show_exercises,
+            ord("b"): self.show_lesson_selection,
+            27: self.show_lesson_selection,
+        }
+        if key == ord("q"):
+            return None
+        return sections.get(key, current)
+
+    def show_lesson_overview(self):
+        lesson = self.current_lesson
+        counts = lesson["derived"]["counts"]
+        is_completed = self.lesson_manager.is_lesson_completed(lesson["lesson_number"])
+        self.draw_header(f"Lesson {lesson['lesson_number']}: {lesson['lesson_title']}",
+                         "v vocabulary  g grammar  e exercises  b back to lessons  q quit")
+        self.put(1, 0, "✓ Completed" if is_completed else "In Progress")
+        self.put(3, 0, f"{counts['vocabulary']} vocabulary words")
+        self.put(4, 0, f"{counts['grammar_rules']} grammar rules")
+        self.put(5, 0, f"{counts['exercises']} exercises")
+
+        return self.lesson_menu_key(self.stdscr.getch(), self.show_lesson_overview)
+
+    def show_vocabulary(self):
+        vocab_list = self.current_lesson["vocabulary"]
+        height, _ = self.stdscr.getmaxyx()
+        vocab_per_page = max((height - 4) // 4, 1)
+        total_pages = max((len(vocab_list) + vocab_per_page - 1) // vocab_per_page, 1)
+        self.current_vocab_page = min(self.current_vocab_page, total_pages - 1)
+
+        self.draw_header("Vocabulary",
+                         "n/p next/previous page  o overview  g grammar  e exercises  b back")
+        if not vocab_list:
+            self.put(2, 0, "No vocabulary items in this lesson.")
+        else:
+            self.put(1, 0, f"Page {self.current_vocab_page + 1} of {total_pages}", curses.A_DIM)
+            start_idx = self.current_vocab_page * vocab_per_page
+            for i, vocab in enumerate(vocab_list[start_idx:start_idx + vocab_per_page]):
+                y = 3 + i * 4
+                self.put(y, 2, vocab["korean"], curses.A_BOLD)
+                self.put(y + 1, 2, f"[{vocab['romanization']}]", curses.A_DIM)
+                self.put(y + 2, 2, vocab["english"])
+
+        key = self.stdscr.getch()
+        if key in (ord("n"), curses.KEY_RIGHT, curses.KEY_NPAGE):
+            self.current_vocab_page = min(self.current_vocab_page + 1, total_pages - 1)
+        elif key in (ord("p"), curses.KEY_LEFT, curses.KEY_PPAGE):
+            self.current_vocab_page = max(self.current_vocab_page - 1, 0)
+        else:
+            return self.lesson_menu_key(key, self.show_vocabulary)
+        return self.show_vocabulary
+
+    def grammar_lines(self, width):
+        """Lay out grammar rules and example sentences as (text, attr) lines"""
+        lines = []
+        for rule in self.current_lesson["grammar_rules"]:
+            lines.append((rule["title"], curses.A_BOLD))
+            lines.extend((line, 0) for line in wrap(rule["explanation"], width))
+            lines.append((f"Pattern: {rule['pattern']}", curses.A_DIM))
+            if "formality_note" in rule:
+                lines.extend((line, curses.A_DIM) for line in wrap(f"Note: {rule['formality_note']}", width))
+            lines.append(("", 0))
+
+        if self.current_lesson["example_sentences"]:
+            lines.append(("Example Sentences", curses.A_BOLD | curses.A_UNDERLINE))
+            for example in self.current_lesson["example_sentences"]:
+                lines.append((example["korean"], curses.A_BOLD))
+                lines.append((example["romanization"], curses.A_DIM))
+                lines.append((example["english"], 0))
+                lines.append(("", 0))
+        return lines
+
+    def show_grammar(self):
+        height, width = self.stdscr.getmaxyx()
+        self.draw_header("Grammar", "↑/↓ scroll  o overview  v vocabulary  e exercises  b back")
+        lines = self.grammar_lines(width - 3)
+        if not lines:
+            self.put(2, 0, "No grammar rules in this lesson.")
+
+        rows = max(height - 3, 1)
+        self.grammar_top = max(min(self.grammar_top, len(lines) - rows), 0)
+        for row, (text, attr) in enumerate(lines[self.grammar_top:self.grammar_top + rows]):
+            self.put(2 + row, 1, text, attr)
+
+        key = self.stdscr.getch()
+        if key in (curses.KEY_DOWN, ord("j")):
+            self.grammar_top += 1
+        elif key in (curses.KEY_UP, ord("k")):
+            self.grammar_top = max(self.grammar_top - 1, 0)
+        elif key == curses.KEY_NPAGE:
+            self.grammar_top += rows
+        elif key == curses.KEY_PPAGE:
+            self.grammar_top = max(self.grammar_top - rows, 0)
+        else:
+            return self.lesson_menu_key(key, self.show_grammar)
+        return self.show_grammar
+
+    def show_exercises(self):
+        exercises = self.current_lesson["exercises"]
+        if not exercises:
+            self.draw_header("Exercises", "o overview  v vocabulary  g grammar  b back")
+            self.put(2, 0, "No exercises in this lesson.")
+            return self.lesson_menu_key(self.stdscr.getch(), self.show_exercises)
+
+        if self.current_exercise_index >= len(exercises):
+            return self.show_exercises_completed()
+
+        exercise = exercises[self.current_exercise_index]
+        if self.shown_exercise != (self.current_lesson["lesson_number"], self.current_exercise_index):
+            # Response time is measured from the first draw, not from redraws
+            self.shown_exercise = (self.current_lesson["lesson_number"], self.current_exercise_index)
+            self.built_parts = []
+            self.exercise_shown_at = time.monotonic()
+        _, width = self.stdscr.getmaxyx()
+        self.draw_header(f"Exercise {self.current_exercise_index + 1} of {len(exercises)}",
+                         "1-9 answer  b back  q quit" if exercise["type"] != "word_building"
+                         else "1-9 add syllable  Backspace undo  c clear  Enter submit  b back")
+
+        y = 2
+        if exercise["type"] == "syllable_choice":
+            sentence_parts = exercise["sentence"].split("___")
+            sentence_text = (f"Complete the sentence: {sentence_parts[0]}____"
+                             f"{sentence_parts[1] if len(sentence_parts) > 1 else ''}")
+            self.put(y, 0, sentence_text)
+            self.put(y + 1, 0, f"Hint: {exercise['hint']}", curses.A_DIM)
+            y += 3
+            choices = exercise["syllable_options"]
+        else:
+            for line in wrap(exercise["question"], width - 1):
+                self.put(y, 0, line)
+                y += 1
+            y += 1
+            choices = exercise.get("options") or exercise.get("syllable_parts", [])
+
+        if exercise["type"] == "word_building":
+            self.put(y, 0, f"[ {''.join(self.built_parts)} ]", curses.A_BOLD)
+            y += 2
+        for i, choice in enumerate(choices[:9]):
+            self.put(y + i, 2, f"{i + 1}. {choice}")
+
+        key = self.stdscr.getch()
+        if ord("1") <= key <= ord("9") and key - ord("1") < len(choices):
+            choice = key - ord("1")
+            if exercise["type"] == "word_building":
+                self.built_parts.append(choices[choice])
+                return self.show_exercises
+            return self.check_answer(exercise, choice)
+        if exercise["type"] == "word_building":
+            if key in (curses.KEY_BACKSPACE, 127, 8):
+                self.built_parts = self.built_parts[:-1]
+                return self.show_exercises
+            if key == ord("c"):
+                self.built_parts = []
+                return self.show_exercises
+            if key in (curses.KEY_ENTER, 10, 13):
+                return self.check_answer(exercise, "".join(self.built_parts))
+        return self.lesson_menu_key(key, self.show_exercises)
+
+    def check_answer(self, exercise, answer):
+        """Grade with the shared grading rules, log the attempt and show the result"""
+        derived = self.current_lesson["derived"]["exercises"][self.current_exercise_index]
+        is_correct, result_text = grade_exercise(exercise, answer, derived["answer"])
+
+        if self.attempt_log is None:
+            # Started on first answer so that browsing never spawns the writer thread
+            self.attempt_log = AttemptLog()
+        self.attempt_log.record(self.current_lesson["lesson_number"], derived["id"],
+                                answer_text(exercise, answer), is_correct,
+                                time.monotonic() - self.exercise_shown_at)
+
+        _, width = self.stdscr.getmaxyx()
+        self.draw_header("Correct!" if is_correct else "Incorrect", "Press any key for the next exercise")
+        for i, line in enumerate(wrap(result_text, width - 1)):
+            self.put(2 + i, 0, line, curses.A_BOLD if is_correct else 0)
+        self.stdscr.getch()
+
+        self.current_exercise_index += 1
+        if self.current_exercise_index == len(self.current_lesson["exercises"]):
+            # Marked here rather than in show_exercises_completed, which runs on every redraw
+            self.unlocked_lessons = self.lesson_manager.mark_lesson_completed(
+                self.current_lesson["lesson_number"])
+        return self.show_exercises
+
+    def show_exercises_completed(self):
+        next_lesson_num = self.lesson_manager.get_next_lesson()
+        has_next = self.lesson_manager.get_lesson_info(next_lesson_num) is not None
+
+        help_text = "r restart  b back to lessons"
+        if has_next:
+            help_text += f"  n next lesson ({next_lesson_num})"
+        self.draw_header("All exercises completed! Great job!", help_text)
+        if self.unlocked_lessons:
+            self.put(2, 0, "Unlocked: " + ", ".join(f"Lesson {number}" for number in self.unlocked_lessons))
+
+        key = self.stdscr.getch()
+        if key == ord("r"):
+            self.current_exercise_index = 0
+            self.unlocked_lessons = []
+            self.shown_exercise = None
+            return self.show_exercises
+        if key == ord("n") and has_next:
+            return self.select_lesson(next_lesson_num)
+        return self.lesson_menu_key(key, self.show_exercises_completed)
+
+
+def main(stdscr):
+    KoreanTerminalApp(stdscr).run()
+
+
+if __name__ == "__main__":
+    locale.setlocale(locale.LC_ALL, "")
+    curses.wrapper(main)
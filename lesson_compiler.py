@@ -0,0 +1,209 @@
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from hangul import english_sort_key, has_batchim, korean_sort_key, normalize
+from romanization import missing_romanization
+
+# Bump when the derived data format changes so old sidecars are rebuilt
+COMPILER_VERSION = 6
+CACHE_DIR_NAME = ".cache"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def content_hash(data):
+    """Get the content hash used to key sidecar caches"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sidecar_path(lesson_file):
+    """Get the sidecar cache path for a lesson file"""
+    lesson_file = Path(lesson_file)
+    return lesson_file.parent / CACHE_DIR_NAME / lesson_file.name
+
+
+def search_tokens(*texts):
+    """Split texts into case-folded search tokens"""
+    tokens = []
+    for text in texts:
+        tokens.extend(TOKEN_PATTERN.findall(normalize(text).casefold()))
+    return tokens
+
+
+def exercise_answer(exercise):
+    """Get the normalized correct answer of an exercise"""
+    exercise_type = exercise.get("type")
+    if exercise_type == "multiple_choice":
+        return normalize(exercise["options"][exercise["correct"]])
+    if exercise_type == "syllable_choice":
+        return normalize(exercise["syllable_options"][exercise["correct"]])
+    if exercise_type == "word_building":
+        return normalize(exercise["target"])
+    return None
+
+
+def lesson_prerequisites(lesson):
+    """Get the sorted lesson numbers a lesson requires, raising TypeError unless they are a list of integers"""
+    prerequisites = lesson.get("prerequisites", [])
+    if not isinstance(prerequisites, list) or not all(
+            isinstance(number, int) and not isinstance(number, bool) for number in prerequisites):
+        raise TypeError(f"prerequisites must be a list of lesson numbers, not {prerequisites!r}")
+    return sorted(set(prerequisites))
+
+
+def exercise_id(lesson_number, index, exercise):
+    """Get a stable id for an exercise (explicit "id" field or lesson/position)"""
+    return exercise.get("id") or f"L{lesson_number:02d}-E{index + 1:02d}"
+
+
+def derive_lesson_data(lesson, source_hash):
+    """Compute derived fields for a parsed lesson"""
+    lesson_number = lesson.get("lesson_number", 0)
+    vocabulary = lesson.get("vocabulary", [])
+    exercises = lesson.get("exercises", [])
+    # Romanization is generated for items that were written without one
+    romanization = missing_romanization(lesson)
+    generated_vocab = romanization.get("vocabulary", {})
+
+    vocab_data = []
+    lesson_tokens = set()
+    for i, vocab in enumerate(vocabulary):
+        vocab_romanization = vocab.get("romanization") or generated_vocab[str(i)]
+        tokens = search_tokens(vocab["korean"], vocab_romanization, vocab["english"])
+        lesson_tokens.update(tokens)
+        vocab_data.append({
+            "sort_korean": korean_sort_key(vocab["korean"]),
+            "sort_english": english_sort_key(vocab["english"]),
+            "batchim": has_batchim(vocab["korean"]),
+            "tokens": tokens
+        })
+
+    return {
+        "compiler_version": COMPILER_VERSION,
+        "source_hash": source_hash,
+        "lesson_number": lesson_number,
+        "lesson_title": lesson.get("lesson_title", "Unknown"),
+        "unit": lesson.get("unit"),
+        "prerequisites": lesson_prerequisites(lesson),
+        "counts": {
+            "vocabulary": len(vocabulary),
+            "grammar_rules": len(lesson.get("grammar_rules", [])),
+            "example_sentences": len(lesson.get("example_sentences", [])),
+            "exercises": len(exercises)
+        },
+        "vocabulary": vocab_data,
+        "search_tokens": sorted(lesson_tokens),
+        "romanization": romanization,
+        "exercises": [
+            {
+                "id": exercise_id(lesson_number, i, exercise),
+                "answer": exercise_answer(exercise)
+            }
+            for i, exercise in enumerate(exercises)
+        ]
+    }
+
+
+def read_sidecar(lesson_file, source_hash):
+    """Load cached derived data if it matches the source hash, else None"""
+    try:
+        with open(sidecar_path(lesson_file), 'r', encoding='utf-8') as f:
+            derived = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, IOError):
+        return None
+
+    if (derived.get("source_hash") != source_hash or
+            derived.get("compiler_version") != COMPILER_VERSION):
+        return None
+    return derived
+
+
+def write_sidecar(lesson_file, derived):
+    """Atomically write derived data next to a lesson file"""
+    path = sidecar_path(lesson_file)
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(derived, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_or_compile(lesson_file, data=None):
+    """Get (lesson, derived) for a lesson file, compiling its sidecar if stale.
+
+    The lesson is only parsed when it is not already cached, so `lesson` is None
+    when a valid sidecar was found and `data` was not supplied.
+    """
+    if data is None:
+        with open(lesson_file, 'rb') as f:
+            data = f.read()
+    source_hash = content_hash(data)
+
+    derived = read_sidecar(lesson_file, source_hash)
+    if derived is not None:
+        return None, derived
+
+    lesson = json.loads(data.decode('utf-8'))
+    derived = derive_lesson_data(lesson, source_hash)
+    try:
+        write_sidecar(lesson_file, derived)
+    except IOError as e:
+        print(f"Error writing cache for {lesson_file}: {e}")
+    return lesson, derived
+
+
+def compile_lesson_file(lesson_file, force=False):
+    """Compile one lesson file, returning (file, status)"""
+    try:
+        with open(lesson_file, 'rb') as f:
+            data = f.read()
+        if force:
+            lesson = json.loads(data.decode('utf-8'))
+            write_sidecar(lesson_file, derive_lesson_data(lesson, content_hash(data)))
+            return str(lesson_file), "compiled"
+        lesson, _ = load_or_compile(lesson_file, data)
+        return str(lesson_file), "cached" if lesson is None else "compiled"
+    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, IndexError, TypeError, AttributeError,
+            IOError) as e:
+        return str(lesson_file), f"error: {e}"
+
+
+def compile_lessons(lessons_dir="lessons", workers=None, force=False):
+    """Compile every lesson in a directory in parallel, returning {file: status}"""
+    lesson_files = sorted(Path(lessons_dir).glob("lesson_*.json"))
+    if not lesson_files:
+        return {}
+
+    chunksize = max(1, len(lesson_files) // ((workers or os.cpu_count() or 1) * 4))
+    # concurrent.futures loads the process pool machinery on first access only,
+    # which keeps importing this module cheap for the front ends
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(compile_lesson_file, lesson_files,
+                               [force] * len(lesson_files), chunksize=chunksize)
+        return dict(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile lessons into cached derived-data sidecars")
+    parser.add_argument("lessons_dir", nargs="?", default="lessons")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--force", action="store_true", help="rebuild sidecars even if up to date")
+    args = parser.parse_args()
+
+    results = compile_lessons(args.lessons_dir, args.workers, args.force)
+    for lesson_file, status in results.items():
+        if status.startswith("error"):
+            print(f"{lesson_file}: {status}")
+
+    compiled = sum(1 for status in results.values() if status == "compiled")
+    cached = sum(1 for status in results.values() if status == "cached")
+    print(f"{len(results)} lessons: {compiled} compiled, {cached} up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,37 @@
+import bisect
 import json
 import os
+import re
 from pathlib import Path
 
+from course_tree import CourseTree
+from lesson_compiler import load_or_compile
+from prerequisites import PrerequisiteCache, PrerequisiteGraph
+from romanization import fill_romanization
+from vocab_table import VocabList, VocabTable
+
+LESSON_FILE_PATTERN = re.compile(r"lesson_(\d+)\.json$")
+
 class LessonManager:
-    def __init__(self):
+    def __init__(self, lazy_scan=False, on_error=print):
+        # Error messages go to on_error, so front ends that own the terminal can show them
+        self.on_error = on_error
         self.lessons_dir = Path("lessons")
         self.progress_file = Path("progress.json")
+        self.vocab_table = VocabTable()
         self.progress_data = self.load_progress()
-        self.available_lessons = self.scan_available_lessons()
+        # A lazy scan only lists file names and cached prerequisites; titles are read when first needed
+        self.available_lessons = (self.list_lesson_files() if lazy_scan
+                                  else self.scan_available_lessons())
+        self.prerequisites = PrerequisiteGraph(
+            {lesson["number"]: lesson["prerequisites"] for lesson in self.available_lessons},
+            self.progress_data["completed_lessons"])
+        for error in self.prerequisites.errors:
+            self.on_error(f"Error in lesson prerequisites: {error}")
+        self.course_tree = CourseTree(self.available_lessons,
+                                      self.progress_data["completed_lessons"],
+                                      self.get_lesson_title,
+                                      self.prerequisites)
     
     def load_progress(self):
         """Load user progress from file"""
@@ -18,7 +42,7 @@ class LessonManager:
             else:
                 return self.create_default_progress()
         except (json.JSONDecodeError, IOError):
-            print("Error loading progress file, creating new one.")
+            self.on_error("Error loading progress file, creating new one.")
             return self.create_default_progress()
     
     def create_default_progress(self):
@@ -36,32 +60,83 @@ class LessonManager:
             with open(self.progress_file, 'w', encoding='utf-8') as f:
                 json.dump(self.progress_data, f, indent=2, ensure_ascii=False)
         except IOError as e:
-            print(f"Error saving progress: {e}")
+            self.on_error(f"Error saving progress: {e}")
     
     def scan_available_lessons(self):
         """Scan lessons directory and return available lesson info"""
         if not self.lessons_dir.exists():
-            print("Lessons directory not found. Creating it...")
+            self.on_error("Lessons directory not found. Creating it...")
             self.lessons_dir.mkdir(exist_ok=True)
             return []
         
         lessons = []
         for lesson_file in sorted(self.lessons_dir.glob("lesson_*.json")):
             try:
-                with open(lesson_file, 'r', encoding='utf-8') as f:
-                    lesson_data = json.load(f)
-                    lessons.append({
-                        "number": lesson_data.get("lesson_number", 0),
-                        "title": lesson_data.get("lesson_title", "Unknown"),
-                        "file": lesson_file
-                    })
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error reading {lesson_file}: {e}")
+                # Number and title come from the compiled sidecar when it is up to date
+                _, derived = load_or_compile(lesson_file)
+                lessons.append({
+                    "number": derived["lesson_number"],
+                    "title": derived["lesson_title"],
+                    "unit": derived["unit"],
+                    "prerequisites": derived["prerequisites"],
+                    "file": lesson_file
+                })
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, IndexError, TypeError, AttributeError,
+                    IOError) as e:
+                self.on_error(f"Error reading {lesson_file}: {e}")
         
         # Update total available lessons in progress
         self.progress_data["total_lessons_available"] = len(lessons)
         return lessons
     
+    def list_lesson_files(self):
+        """List available lessons from file names, reading only lessons changed since the last listing"""
+        if not self.lessons_dir.exists():
+            return self.scan_available_lessons()
+        
+        # os.scandir avoids the per-entry overhead of Path.glob on large folders
+        lessons = []
+        prerequisite_cache = PrerequisiteCache(self.lessons_dir)
+        for entry in os.scandir(self.lessons_dir):
+            match = LESSON_FILE_PATTERN.match(entry.name)
+            if match:
+                title = None
+                try:
+                    prerequisites = prerequisite_cache.get(entry)
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError, IndexError, TypeError, AttributeError,
+                        IOError) as e:
+                    self.on_error(f"Error reading {entry.path}: {e}")
+                    # Already reported, so get_lesson_title does not read it again
+                    title = "Unknown"
+                    prerequisites = []
+                lessons.append({
+                    "number": int(match.group(1)),
+                    "title": title,
+                    "unit": None,
+                    "prerequisites": prerequisites,
+                    "file": entry.path
+                })
+        try:
+            prerequisite_cache.save()
+        except IOError as e:
+            self.on_error(f"Error saving prerequisite cache: {e}")
+        
+        lessons.sort(key=lambda lesson: lesson["number"])
+        self.progress_data["total_lessons_available"] = len(lessons)
+        return lessons
+    
+    def get_lesson_title(self, lesson):
+        """Get a lesson's title, reading it from the compiled sidecar if not known yet"""
+        if lesson["title"] is None:
+            try:
+                _, derived = load_or_compile(lesson["file"])
+                lesson["title"] = derived["lesson_title"]
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, IndexError, TypeError, AttributeError,
+                    IOError) as e:
+                self.on_error(f"Error reading {lesson['file']}: {e}")
+                lesson["title"] = "Unknown"
+        return lesson["title"]
+    
     def get_lesson_info(self, lesson_number):
         """Get basic info about a lesson without loading full content"""
         for lesson in self.available_lessons:
@@ -70,35 +145,61 @@ class LessonManager:
         return None
     
     def load_lesson(self, lesson_number):
-        """Load full lesson content"""
+        """Load full lesson content with its precomputed derived data and vocabulary ids"""
         lesson_file = self.lessons_dir / f"lesson_{lesson_number:02d}.json"
         
         try:
-            with open(lesson_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading lesson {lesson_number}: {e}")
+            with open(lesson_file, 'rb') as f:
+                data = f.read()
+            lesson, derived = load_or_compile(lesson_file, data)
+            if lesson is None:
+                lesson = json.loads(data.decode('utf-8'))
+            lesson["derived"] = derived
+            fill_romanization(lesson, derived["romanization"])
+            lesson["vocab_ids"] = self.vocab_table.add_all(lesson.get("vocabulary", []))
+            # The parsed dicts are dropped; entries are built from the table when read
+            lesson["vocabulary"] = VocabList(self.vocab_table, lesson["vocab_ids"])
+            return lesson
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, KeyError, IndexError, TypeError,
+                AttributeError) as e:
+            self.on_error(f"Error loading lesson {lesson_number}: {e}")
             return None
     
     def mark_lesson_completed(self, lesson_number):
-        """Mark a lesson as completed"""
-        if lesson_number not in self.progress_data["completed_lessons"]:
-            self.progress_data["completed_lessons"].append(lesson_number)
-            self.progress_data["completed_lessons"].sort()
+        """Mark a lesson as completed, returning the lesson numbers it unlocked"""
+        unlocked = []
+        if not self.course_tree.is_completed(lesson_number):
+            bisect.insort(self.progress_data["completed_lessons"], lesson_number)
+            self.course_tree.mark_completed(lesson_number)
+            unlocked = self.prerequisites.mark_completed(lesson_number)
         
         self.progress_data["last_completed_lesson"] = max(
             self.progress_data["last_completed_lesson"], 
             lesson_number
         )
         self.save_progress()
+        return unlocked
     
     def is_lesson_completed(self, lesson_number):
         """Check if a lesson is completed"""
-        return lesson_number in self.progress_data["completed_lessons"]
+        return self.course_tree.is_completed(lesson_number)
+    
+    def is_lesson_unlocked(self, lesson_number):
+        """Check if all of a lesson's prerequisites are completed"""
+        return self.prerequisites.is_unlocked(lesson_number)
+    
+    def get_missing_prerequisites(self, lesson_number):
+        """Get the prerequisites of a lesson that are not completed yet"""
+        return self.prerequisites.missing_prerequisites(lesson_number)
+    
+    def get_learned_lessons(self):
+        """Get completed lessons plus the current lesson, in order"""
+        completed_lessons = self.progress_data["completed_lessons"]
+        return sorted(set(completed_lessons + [self.get_current_lesson()]))
     
     def get_next_lesson(self):
-        """Get the next lesson number to study"""
-        return self.progress_data["last_completed_lesson"] + 1
+        """Get the lowest-numbered unlocked lesson not completed yet, or None"""
+        return self.prerequisites.next_lesson()
     
     def get_current_lesson(self):
         """Get currently selected lesson"""
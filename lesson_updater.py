@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from grammar_index import GrammarIndex
+from lesson_compiler import CACHE_DIR_NAME, content_hash, sidecar_path
+from lesson_manager import LESSON_FILE_PATTERN
+
+MANIFEST_NAME = "manifest.json"
+STAGING_DIR_NAME = ".update"
+JOURNAL_NAME = "journal.json"
+
+
+def hash_file(path):
+    with open(path, 'rb') as f:
+        return content_hash(f.read())
+
+
+def lesson_names(directory):
+    """Get the lesson file names in a directory"""
+    return [entry.name for entry in os.scandir(directory) if LESSON_FILE_PATTERN.match(entry.name)]
+
+
+def check_names(names, source):
+    """Raise ValueError unless every name is a plain lesson file name (no paths)"""
+    for name in names:
+        if not isinstance(name, str) or not LESSON_FILE_PATTERN.fullmatch(name):
+            raise ValueError(f"{source} lists {name!r}, which is not a lesson file name")
+
+
+def build_manifest(source_dir):
+    """Hash every lesson in a pack and write its manifest, returning {name: hash}"""
+    source_dir = Path(source_dir)
+    files = {name: hash_file(source_dir / name) for name in sorted(lesson_names(source_dir))}
+    write_json(source_dir / MANIFEST_NAME, {"version": 1, "files": files})
+    return files
+
+
+def read_source_manifest(source_dir):
+    """Get {name: hash} for a pack, from its manifest or by hashing its files"""
+    manifest_file = Path(source_dir) / MANIFEST_NAME
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            files = json.load(f)["files"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        source_dir = Path(source_dir)
+        return {name: hash_file(source_dir / name) for name in lesson_names(source_dir)}
+    if not isinstance(files, dict):
+        raise ValueError(f"{manifest_file} has no file list")
+    # Names are joined onto the lessons folder, so anything but a lesson file name is refused
+    check_names(files, manifest_file)
+    return files
+
+
+def write_json(path, data):
+    """Atomically write a JSON file"""
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class InstalledManifest:
+    """Hashes of the installed lessons, cached by file size and mtime.
+
+    Stored in lessons/.cache/manifest.json, so only files touched since the
+    last update are hashed again.
+    """
+
+    def __init__(self, lessons_dir):
+        self.lessons_dir = Path(lessons_dir)
+        self.path = self.lessons_dir / CACHE_DIR_NAME / MANIFEST_NAME
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f)["files"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.files = {}
+
+    def hashes(self):
+        """Get {name: hash} for the installed lessons"""
+        current = {}
+        for entry in os.scandir(self.lessons_dir):
+            if not LESSON_FILE_PATTERN.match(entry.name):
+                continue
+            stat = entry.stat()
+            record = self.files.get(entry.name)
+            if not record or record["size"] != stat.st_size or record["mtime_ns"] != stat.st_mtime_ns:
+                record = {"hash": hash_file(entry.path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            current[entry.name] = record
+        self.files = current
+        return {name: record["hash"] for name, record in current.items()}
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True)
+        write_json(self.path, {"version": 1, "files": self.files})
+
+
+def plan_update(source_hashes, installed_hashes, prune=False):
+    """Get (names to copy, names to delete) to turn the installed set into the source set"""
+    to_copy = sorted(name for name, digest in source_hashes.items() if installed_hashes.get(name) != digest)
+    to_delete = sorted(set(installed_hashes) - set(source_hashes)) if prune else []
+    return to_copy, to_delete
+
+
+def recover_update(lessons_dir="lessons"):
+    """Finish or discard an update that was interrupted, returning the names it finished.
+
+    Files are staged first and the journal is written last, so a journal means
+    every staged file is complete and the update is rolled forward; staged
+    files without a journal are from an incomplete copy and are discarded.
+    """
+    staging_dir = Path(lessons_dir) / STAGING_DIR_NAME
+    if not staging_dir.exists():
+        return []
+    journal_file = staging_dir / JOURNAL_NAME
+    try:
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return []
+
+    try:
+        commit_journal(lessons_dir, journal)
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Discarding interrupted lesson update: {e}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return []
+    return journal["copy"] + journal["delete"]
+
+
+def commit_journal(lessons_dir, journal):
+    """Move staged files into place and delete removed lessons; safe to repeat"""
+    lessons_dir = Path(lessons_dir)
+    staging_dir = lessons_dir / STAGING_DIR_NAME
+    journal_file = staging_dir / JOURNAL_NAME
+    check_names(journal["copy"], journal_file)
+    check_names(journal["delete"], journal_file)
+    for name in journal["copy"]:
+        staged = staging_dir / name
+        if staged.exists():
+            os.replace(staged, lessons_dir / name)
+    for name in journal["delete"]:
+        try:
+            os.remove(lessons_dir / name)
+        except FileNotFoundError:
+            pass
+    invalidate_caches(lessons_dir, journal["copy"] + journal["delete"])
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def invalidate_caches(lessons_dir, names):
+    """Drop cached data derived from the given lesson files only"""
+    for name in names:
+        try:
+            os.remove(sidecar_path(Path(lessons_dir) / name))
+        except FileNotFoundError:
+            pass
+    index = GrammarIndex(lessons_dir)
+    if index.files:
+        index.invalidate(names)
+        index.save()
+
+
+def update_lessons(source_dir, lessons_dir="lessons", prune=False, dry_run=False):
+    """Copy changed lessons from a pack into the installed folder, returning a summary"""
+    source_dir = Path(source_dir)
+    lessons_dir = Path(lessons_dir)
+    lessons_dir.mkdir(exist_ok=True)
+    recover_update(lessons_dir)
+
+    started = time.monotonic()
+    source_hashes = read_source_manifest(source_dir)
+    installed = InstalledManifest(lessons_dir)
+    to_copy, to_delete = plan_update(source_hashes, installed.hashes(), prune)
+    summary = {"copied": to_copy, "deleted": to_delete, "unchanged": len(source_hashes) - len(to_copy)}
+    if dry_run or not (to_copy or to_delete):
+        installed.save()
+        summary["seconds"] = time.monotonic() - started
+        return summary
+
+    # Stage every changed file next to the lessons (same file system, so the
+    # final moves are atomic renames), checking each copy against the manifest
+    staging_dir = lessons_dir / STAGING_DIR_NAME
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir()
+    for name in to_copy:
+        with open(source_dir / name, 'rb') as f:
+            data = f.read()
+        if content_hash(data) != source_hashes[name]:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise ValueError(f"{source_dir / name} does not match the pack manifest")
+        with open(staging_dir / name, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    journal = {"copy": to_copy, "delete": to_delete}
+    write_json(staging_dir / JOURNAL_NAME, journal)
+    commit_journal(lessons_dir, journal)
+
+    installed.hashes()
+    installed.save()
+    summary["seconds"] = time.monotonic() - started
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update installed lessons from a lesson pack, copying only changes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    manifest_parser = subparsers.add_parser("manifest", help="write the manifest of a lesson pack")
+    manifest_parser.add_argument("source", help="lesson pack folder")
+    update_parser = subparsers.add_parser("update", help="install changed lessons from a pack")
+    update_parser.add_argument("source", help="lesson pack folder")
+    update_parser.add_argument("--lessons-dir", default="lessons")
+    update_parser.add_argument("--prune", action="store_true", help="delete lessons that are not in the pack")
+    update_parser.add_argument("--dry-run", action="store_true", help="only show what would change")
+    args = parser.parse_args()
+
+    if args.command == "manifest":
+        files = build_manifest(args.source)
+        print(f"Wrote manifest for {len(files)} lessons")
+        return
+
+    try:
+        summary = update_lessons(args.source, args.lessons_dir, args.prune, args.dry_run)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    verb = "Would copy" if args.dry_run else "Copied"
+    print(f"{verb} {len(summary['copied'])} lessons, deleted {len(summary['deleted'])}, "
+          f"{summary['unchanged']} unchanged ({summary['seconds']:.2f}s)")
+    for name in summary["copied"]:
+        print(f"  {name}")
+
+
+if __name__ == "__main__":
+    main()
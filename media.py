@@ -0,0 +1,121 @@
+import base64
+import io
+import tkinter as tk
+from collections import OrderedDict
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Decoded images are kept up to this many bytes (4 bytes per pixel)
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def decode_image(path, max_size):
+    """Read an image and shrink it to fit max_size (worker thread).
+
+    With Pillow the image is fully decoded and scaled here and returned as PPM
+    data, which Tk loads without further decoding. Without it the file is read
+    and base64-encoded here, the form Tk takes as image data, but Tk still
+    decodes the pixels (PNG, GIF, PPM) and subsamples them on the main thread,
+    so large images can stall the window unless Pillow is installed.
+    """
+    if Image is None:
+        return base64.b64encode(Path(path).read_bytes()).decode("ascii")
+    with Image.open(path) as image:
+        image.thumbnail((max_size, max_size))
+        output = io.BytesIO()
+        image.convert("RGB").save(output, format="PPM")
+        return output.getvalue()
+
+
+def photo_from_data(data, max_size):
+    """Create a PhotoImage no larger than max_size from decoded data (main thread)"""
+    photo = tk.PhotoImage(data=data)
+    factor = -(-max(photo.width(), photo.height()) // max_size)
+    if factor > 1:
+        photo = photo.subsample(factor)
+    return photo
+
+
+class ImageCache:
+    """Least recently used PhotoImage cache with a byte budget"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.images = OrderedDict()
+
+    def get(self, key):
+        photo = self.images.get(key)
+        if photo is not None:
+            self.images.move_to_end(key)
+        return photo
+
+    def put(self, key, photo):
+        """Add an image, evicting the least recently used ones over budget"""
+        if key in self.images:
+            self.total_bytes -= self.image_bytes(self.images.pop(key))
+        self.images[key] = photo
+        self.total_bytes += self.image_bytes(photo)
+        while self.total_bytes > self.max_bytes and len(self.images) > 1:
+            _, evicted = self.images.popitem(last=False)
+            self.total_bytes -= self.image_bytes(evicted)
+
+    def clear(self):
+        self.images.clear()
+        self.total_bytes = 0
+
+    @staticmethod
+    def image_bytes(photo):
+        return photo.width() * photo.height() * 4
+
+
+class MediaLoader:
+    """Load lesson images on the I/O pool, sharing one cache and in-flight requests.
+
+    Widgets that are still showing an image keep their own reference to it, so
+    evicting it from the cache never blanks a visible card.
+    """
+
+    def __init__(self, io_pool, media_dir="lessons", cache=None):
+        self.io = io_pool
+        self.media_dir = Path(media_dir)
+        self.cache = cache or ImageCache()
+        self.waiting = {}
+
+    def load(self, path, max_size, callback, group="view"):
+        """Call callback(photo) with the image at path (relative to the lessons folder)"""
+        key = (path, max_size)
+        photo = self.cache.get(key)
+        if photo is not None:
+            callback(photo)
+            return
+        if key in self.waiting:
+            self.waiting[key].append(callback)
+            return
+        self.waiting[key] = [callback]
+        self.io.submit(decode_image, self.media_dir / path, max_size,
+                       on_done=lambda data: self.on_decoded(key, data),
+                       on_error=lambda error: self.on_error(key, error), group=group)
+
+    def on_decoded(self, key, data):
+        callbacks = self.waiting.pop(key, [])
+        try:
+            photo = photo_from_data(data, key[1])
+        except tk.TclError as e:
+            print(f"Error loading image {key[0]}: {e}")
+            return
+        self.cache.put(key, photo)
+        for callback in callbacks:
+            callback(photo)
+
+    def on_error(self, key, error):
+        self.waiting.pop(key, None)
+        print(f"Error loading image {key[0]}: {error}")
+
+    def cancel(self):
+        """Forget callbacks of requests made for a view that has been left"""
+        self.waiting.clear()
@@ -0,0 +1,222 @@
+import argparse
+import random
+import re
+
+from hangul import FINAL_COUNT, FINAL_RIEUL, SYLLABLE_BASE, SYLLABLE_LAST, last_syllable, normalize
+from vocab_export import iter_lesson_files, iter_lessons
+from vocab_importer import write_lesson
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Particle pairs as (form after a final consonant, form after a vowel)
+PARTICLES = {
+    "이/가": ("이", "가"),
+    "을/를": ("을", "를"),
+    "은/는": ("은", "는"),
+    "과/와": ("과", "와"),
+    "아/야": ("아", "야"),
+    "으로/로": ("으로", "로"),
+}
+
+# Particles whose vowel form is also used after ㄹ (서울로, not 서울으로)
+RIEUL_AS_VOWEL = {"으로/로"}
+
+# Which pair each form belongs to, for checking hand-written answers
+FORM_PARTICLES = {form: particle for particle, forms in PARTICLES.items() for form in forms}
+
+# Pairs checked in example sentences; the others are too easily confused with
+# the last syllable of an ordinary word
+SENTENCE_PARTICLES = ("이/가", "을/를", "은/는")
+
+BLANK = "___"
+BLANK_PATTERN = re.compile(r"(\S*?)___(\S*)")
+PUNCTUATION = ".,!?\"'()[]…~"
+
+# Final index of words without a Hangul syllable
+NO_HANGUL = -1
+
+
+def last_codes(words):
+    """Get the code point of each word's last Hangul syllable (0 if it has none)"""
+    codes = []
+    for word in words:
+        # Most words end in a syllable; only fall back to a scan when they don't
+        char = word[-1:] if word and SYLLABLE_BASE <= ord(word[-1]) <= SYLLABLE_LAST else last_syllable(word)
+        codes.append(ord(char) if char else 0)
+    return codes
+
+
+def final_indexes(words):
+    """Get each word's final consonant index: 0 for a vowel ending, NO_HANGUL without Hangul"""
+    codes = last_codes(words)
+    if np is not None:
+        offsets = np.asarray(codes, dtype=np.int32) - SYLLABLE_BASE
+        return np.where(offsets >= 0, offsets % FINAL_COUNT, NO_HANGUL)
+    return [(code - SYLLABLE_BASE) % FINAL_COUNT if code else NO_HANGUL for code in codes]
+
+
+def consonant_mask(finals, particle):
+    """Which words take the consonant form of a particle, given their final indexes"""
+    if np is not None:
+        finals = np.asarray(finals)
+        mask = finals > 0
+        if particle in RIEUL_AS_VOWEL:
+            mask &= finals != FINAL_RIEUL
+        return mask.tolist()
+    if particle in RIEUL_AS_VOWEL:
+        return [final > 0 and final != FINAL_RIEUL for final in finals]
+    return [final > 0 for final in finals]
+
+
+def particle_forms(words, particle):
+    """Get the correct form of a particle pair for every word"""
+    consonant_form, vowel_form = PARTICLES[particle]
+    return [consonant_form if consonant else vowel_form
+            for consonant in consonant_mask(final_indexes(words), particle)]
+
+
+def attach_particles(words, particle):
+    """Attach the correct form of a particle pair to every word"""
+    return [word + form for word, form in zip(words, particle_forms(words, particle))]
+
+
+def particle_form(word, particle):
+    """Get the correct form of a particle pair for a single word"""
+    return particle_forms([word], particle)[0]
+
+
+def blank_checks(lesson):
+    """Collect (word, form, location) for particles chosen or given around a blank"""
+    checks = []
+    for index, exercise in enumerate(lesson.get("exercises", [])):
+        location = f"exercise {index + 1}"
+        if exercise.get("type") == "multiple_choice":
+            # 친구___ 물을 마셔요. with the particle as the answer
+            match = BLANK_PATTERN.search(exercise.get("question", ""))
+            if match and match.group(1):
+                word = match.group(1).split(":")[-1]
+                checks.append((word, exercise["options"][exercise["correct"]], location))
+        elif exercise.get("type") == "syllable_choice":
+            # 친구가 ___을 마셔요. with the word as the answer
+            match = BLANK_PATTERN.search(exercise.get("sentence", ""))
+            if match and match.group(2):
+                word = exercise["syllable_options"][exercise["correct"]]
+                checks.append((word, match.group(2).strip(PUNCTUATION), location))
+    return checks
+
+
+def sentence_checks(lesson, lexicon):
+    """Collect (word, form, location) for vocabulary words followed by a particle in example sentences"""
+    checks = []
+    for index, sentence in enumerate(lesson.get("example_sentences", [])):
+        for token in sentence["korean"].split():
+            token = token.strip(PUNCTUATION)
+            if token in lexicon:
+                continue
+            for particle in SENTENCE_PARTICLES:
+                for form in PARTICLES[particle]:
+                    if token.endswith(form) and token[:-len(form)] in lexicon:
+                        checks.append((token[:-len(form)], form, f"example sentence {index + 1}"))
+    return checks
+
+
+def check_particles(lessons):
+    """Check every particle choice in the corpus, returning a list of problem dicts"""
+    lessons = list(lessons)
+    lexicon = {normalize(vocab["korean"]) for lesson in lessons for vocab in lesson.get("vocabulary", [])}
+
+    checks = []
+    for lesson in lessons:
+        number = lesson.get("lesson_number", 0)
+        for word, form, location in blank_checks(lesson) + sentence_checks(lesson, lexicon):
+            particle = FORM_PARTICLES.get(form)
+            if particle:
+                checks.append((number, location, word, form, particle))
+
+    # One vectorized pass over every checked word in the corpus
+    problems = []
+    expected_forms = {}
+    for particle in PARTICLES:
+        words = [word for _, _, word, _, p in checks if p == particle]
+        expected_forms[particle] = iter(particle_forms(words, particle))
+    for number, location, word, form, particle in checks:
+        expected = next(expected_forms[particle])
+        if form != expected:
+            problems.append({"lesson": number, "location": location, "word": word,
+                             "found": form, "expected": expected})
+    return problems
+
+
+def ending_description(final):
+    """Describe a word ending for exercise explanations"""
+    if final == NO_HANGUL:
+        return "has no Hangul ending"
+    if final == 0:
+        return "ends in a vowel"
+    if final == FINAL_RIEUL:
+        return "ends in ㄹ"
+    return "ends in a consonant"
+
+
+def generate_particle_exercises(vocabulary, particles=("이/가", "을/를", "은/는"), seed=None):
+    """Build one multiple choice particle exercise per vocabulary item and particle"""
+    rng = random.Random(seed)
+    finals = final_indexes([vocab["korean"] for vocab in vocabulary])
+    endings = [ending_description(final) for final in finals]
+    exercises = []
+    for particle in particles:
+        consonant_form, vowel_form = PARTICLES[particle]
+        others = [p for p in PARTICLES if p != particle and p not in RIEUL_AS_VOWEL]
+        for vocab, final, ending, consonant in zip(vocabulary, finals, endings, consonant_mask(finals, particle)):
+            if final == NO_HANGUL:
+                # No particle form is right after a word without Hangul
+                continue
+            form = consonant_form if consonant else vowel_form
+            options = [consonant_form, vowel_form] + list(PARTICLES[rng.choice(others)])
+            rng.shuffle(options)
+            exercises.append({
+                "type": "multiple_choice",
+                "question": f"Choose the correct {particle} particle: {vocab['korean']}{BLANK} ({vocab['english']})",
+                "options": options,
+                "correct": options.index(form),
+                "explanation": f"Use {form} after {vocab['korean']} ({ending})"
+            })
+    rng.shuffle(exercises)
+    return exercises
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or generate particle exercises for the whole course")
+    parser.add_argument("command", choices=("check", "generate"))
+    parser.add_argument("--lessons-dir", default="lessons")
+    parser.add_argument("--particles", default="이/가,을/를,은/는",
+                        help="comma separated particle pairs to generate")
+    parser.add_argument("--per-lesson", type=int, default=30, help="generated exercises per lesson")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    lesson_files = list(iter_lesson_files(args.lessons_dir))
+    if args.command == "check":
+        problems = check_particles(iter_lessons(lesson_files))
+        for problem in problems:
+            print(f"Lesson {problem['lesson']}, {problem['location']}: {problem['word']}{problem['found']} "
+                  f"should be {problem['word']}{problem['expected']}")
+        print(f"{len(problems)} particle problems found")
+        return
+
+    vocabulary = [vocab for lesson in iter_lessons(lesson_files) for vocab in lesson.get("vocabulary", [])]
+    exercises = generate_particle_exercises(vocabulary, args.particles.split(","), args.seed)
+    next_number = lesson_files[-1][0] + 1 if lesson_files else 1
+    for start in range(0, len(exercises), args.per_lesson):
+        part = start // args.per_lesson
+        write_lesson(args.lessons_dir, next_number + part, f"Particle Practice {part + 1}",
+                     [], exercises[start:start + args.per_lesson])
+    print(f"Generated {len(exercises)} particle exercises in "
+          f"{-(-len(exercises) // args.per_lesson)} lessons")
+
+
+if __name__ == "__main__":
+    main()
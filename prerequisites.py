@@ -0,0 +1,195 @@
+import heapq
+import json
+import os
+from pathlib import Path
+
+from lesson_compiler import CACHE_DIR_NAME, load_or_compile
+
+PREREQUISITES_FILE_NAME = "prerequisites.json"
+
+
+def find_cycles(prerequisites):
+    """Get the groups of lessons that require each other, each sorted.
+
+    Kahn's algorithm first removes every lesson whose prerequisites can all be
+    completed; the rest are on a cycle or only depend on one. Tarjan's
+    algorithm (iterative, so long chains do not hit the recursion limit)
+    then splits them into strongly connected components, and only the
+    components that loop back on themselves are cycles.
+    """
+    waiting = {lesson: len(required) for lesson, required in prerequisites.items()}
+    dependents = {}
+    for lesson, required in prerequisites.items():
+        for prerequisite in required:
+            dependents.setdefault(prerequisite, []).append(lesson)
+
+    ready = [lesson for lesson, count in waiting.items() if count == 0]
+    while ready:
+        lesson = ready.pop()
+        for dependent in dependents.get(lesson, ()):
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+    blocked = {lesson for lesson, count in waiting.items() if count > 0}
+
+    cycles = []
+    order = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    for root in sorted(blocked):
+        if root in order:
+            continue
+        work = [(root, iter(prerequisites[root]))]
+        order[root] = low[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            lesson, edges = work[-1]
+            for prerequisite in edges:
+                if prerequisite not in blocked:
+                    continue
+                if prerequisite not in order:
+                    order[prerequisite] = low[prerequisite] = len(order)
+                    stack.append(prerequisite)
+                    on_stack.add(prerequisite)
+                    work.append((prerequisite, iter(prerequisites[prerequisite])))
+                    break
+                if prerequisite in on_stack:
+                    low[lesson] = min(low[lesson], order[prerequisite])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[lesson])
+                if low[lesson] == order[lesson]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == lesson:
+                            break
+                    if len(component) > 1 or lesson in prerequisites[lesson]:
+                        cycles.append(sorted(component))
+    return sorted(cycles)
+
+
+class PrerequisiteGraph:
+    """Lesson prerequisites as a DAG, with unlocking kept up to date incrementally.
+
+    Each lesson keeps a count of its prerequisites that are not completed yet.
+    Completing a lesson only decrements the counts of the lessons that depend
+    on it, so the lessons it unlocks are found without walking the graph.
+    Available lessons (unlocked, not completed) sit in a heap, which makes
+    next_lesson() a peek.
+
+    Prerequisites that name missing lessons, and those that lessons on a
+    cycle have on each other, are dropped at load and reported in errors.
+    """
+
+    def __init__(self, prerequisites, completed_lessons=()):
+        self.errors = []
+        self.completed = set(completed_lessons)
+
+        lessons = set(prerequisites)
+        self.prerequisites = {}
+        for lesson, required in prerequisites.items():
+            required = set(required)
+            missing = required - lessons
+            if missing:
+                self.errors.append(f"Lesson {lesson} requires missing lessons {sorted(missing)}")
+                required -= missing
+            self.prerequisites[lesson] = sorted(required)
+        # Only the prerequisites inside a cycle are dropped; those leading out
+        # of it still apply, and lessons that depend on it stay locked
+        for cycle in find_cycles(self.prerequisites):
+            if len(cycle) == 1:
+                self.errors.append(f"Lesson {cycle[0]} requires itself; that prerequisite is ignored")
+            else:
+                self.errors.append(f"Prerequisite cycle between lessons {cycle}; "
+                                   f"their prerequisites on each other are ignored")
+            members = set(cycle)
+            for lesson in cycle:
+                self.prerequisites[lesson] = [prerequisite for prerequisite in self.prerequisites[lesson]
+                                              if prerequisite not in members]
+
+        self.dependents = {}
+        self.remaining = {}
+        for lesson, required in self.prerequisites.items():
+            for prerequisite in required:
+                self.dependents.setdefault(prerequisite, []).append(lesson)
+            self.remaining[lesson] = sum(1 for prerequisite in required if prerequisite not in self.completed)
+        self.available = [lesson for lesson, count in self.remaining.items()
+                          if count == 0 and lesson not in self.completed]
+        heapq.heapify(self.available)
+
+    def is_unlocked(self, lesson_number):
+        return self.remaining.get(lesson_number, 0) == 0
+
+    def missing_prerequisites(self, lesson_number):
+        """Get the prerequisites of a lesson that are not completed yet"""
+        return [prerequisite for prerequisite in self.prerequisites.get(lesson_number, ())
+                if prerequisite not in self.completed]
+
+    def mark_completed(self, lesson_number):
+        """Record a completed lesson, returning the lessons it unlocked"""
+        if lesson_number in self.completed:
+            return []
+        self.completed.add(lesson_number)
+        unlocked = []
+        for dependent in self.dependents.get(lesson_number, ()):
+            self.remaining[dependent] -= 1
+            if self.remaining[dependent] == 0 and dependent not in self.completed:
+                unlocked.append(dependent)
+                heapq.heappush(self.available, dependent)
+        return unlocked
+
+    def next_lesson(self):
+        """Get the lowest-numbered unlocked lesson that is not completed, or None"""
+        # Completed lessons are dropped lazily, each at most once
+        while self.available and self.available[0] in self.completed:
+            heapq.heappop(self.available)
+        return self.available[0] if self.available else None
+
+
+class PrerequisiteCache:
+    """Each lesson file's prerequisites, cached by file size and mtime.
+
+    Stored in lessons/.cache/prerequisites.json so that a lazy scan can lock
+    lessons without reading them: only files changed since the last scan are
+    read again, from their compiled sidecars.
+    """
+
+    def __init__(self, lessons_dir):
+        self.path = Path(lessons_dir) / CACHE_DIR_NAME / PREREQUISITES_FILE_NAME
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f)["files"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, IOError):
+            self.files = {}
+        self.seen = {}
+        self.changed = False
+
+    def get(self, dir_entry):
+        """Get the prerequisites of a lesson file found by os.scandir"""
+        stat = dir_entry.stat()
+        record = self.files.get(dir_entry.name)
+        if not record or record["size"] != stat.st_size or record["mtime_ns"] != stat.st_mtime_ns:
+            _, derived = load_or_compile(dir_entry.path)
+            record = {"prerequisites": derived["prerequisites"],
+                      "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            self.changed = True
+        self.seen[dir_entry.name] = record
+        return record["prerequisites"]
+
+    def save(self):
+        """Write the records of the files seen by get(), if any changed or were removed"""
+        if not self.changed and len(self.seen) == len(self.files):
+            return
+        self.files = self.seen
+        self.path.parent.mkdir(exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "files": self.files}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,202 @@
+import argparse
+import functools
+import re
+
+from hangul import SYLLABLE_BASE, SYLLABLE_LAST, FINAL_COUNT, MEDIAL_COUNT, normalize
+
+# Revised Romanization of each jamo, indexed like the syllable code points
+INITIALS = ("g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h")
+MEDIALS = ("a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo",
+           "u", "wo", "we", "wi", "yu", "eu", "ui", "i")
+# Finals as pronounced at the end of a word or before a consonant
+FINALS = ("", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l",
+          "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t")
+
+# Final consonant indexes (ㄱ ㄲ ㄳ ㄴ ㄵ ㄶ ㄷ ㄹ ㄺ ㄻ ㄼ ㄽ ㄾ ㄿ ㅀ ㅁ ㅂ ㅄ ㅅ ㅆ ㅇ ㅈ ㅊ ㅋ ㅌ ㅍ ㅎ)
+(F_NONE, F_G, F_KK, F_GS, F_N, F_NJ, F_NH, F_D, F_L, F_LG, F_LM, F_LB, F_LS, F_LT, F_LP, F_LH,
+ F_M, F_B, F_BS, F_S, F_SS, F_NG, F_J, F_CH, F_K, F_T, F_P, F_H) = range(FINAL_COUNT)
+# Initial consonant indexes
+(I_G, I_KK, I_N, I_D, I_TT, I_R, I_M, I_B, I_PP, I_S, I_SS, I_NG, I_J, I_JJ, I_CH, I_K, I_T, I_P,
+ I_H) = range(19)
+MEDIAL_I = 20
+
+# What each final becomes before a vowel (liaison): (part kept, part carried over)
+LIAISON = {
+    F_G: ("", "g"), F_KK: ("", "kk"), F_GS: ("k", "s"), F_N: ("", "n"), F_NJ: ("n", "j"),
+    F_NH: ("", "n"), F_D: ("", "d"), F_L: ("", "r"), F_LG: ("l", "g"), F_LM: ("l", "m"),
+    F_LB: ("l", "b"), F_LS: ("l", "s"), F_LT: ("l", "t"), F_LP: ("l", "p"), F_LH: ("", "r"),
+    F_M: ("", "m"), F_B: ("", "b"), F_BS: ("p", "s"), F_S: ("", "s"), F_SS: ("", "ss"),
+    F_NG: ("ng", ""), F_J: ("", "j"), F_CH: ("", "ch"), F_K: ("", "k"), F_T: ("", "t"),
+    F_P: ("", "p"), F_H: ("", ""),
+}
+# Palatalization before 이: 굳이 guji, 같이 gachi, 핥이다 halchida
+PALATAL = {F_D: ("", "j"), F_T: ("", "ch"), F_LT: ("l", "ch")}
+
+# Finals grouped by the sound they are pronounced as
+K_FINALS = {F_G, F_KK, F_GS, F_LG, F_K}
+T_FINALS = {F_D, F_S, F_SS, F_J, F_CH, F_T, F_H}
+P_FINALS = {F_B, F_BS, F_LP, F_P}
+H_FINALS = {F_H, F_NH, F_LH}
+ASPIRATED = {I_G: "k", I_D: "t", I_J: "ch"}
+
+
+def transition(final, initial):
+    """Romanize a final consonant followed by an initial consonant, applying sound changes"""
+    if final == F_NONE:
+        return "", INITIALS[initial]
+    if initial == I_NG:
+        return LIAISON[final]
+    if final in H_FINALS:
+        kept = "n" if final == F_NH else ("l" if final == F_LH else "")
+        # Aspiration: 좋고 joko, 많다 manta; ㅎ before ㄴ sounds as ㄴ: 놓는 nonneun
+        if initial in ASPIRATED:
+            return kept, ASPIRATED[initial]
+        if initial == I_N:
+            return ("l", "l") if final == F_LH else (kept or "n", "n")
+        if initial == I_S:
+            return kept, "s"
+    if initial in (I_N, I_M):
+        # Nasalization: 국물 gungmul, 있는 inneun, 합니다 hamnida
+        if final in K_FINALS:
+            return "ng", INITIALS[initial]
+        if final in T_FINALS:
+            return "n", INITIALS[initial]
+        if final in P_FINALS:
+            return "m", INITIALS[initial]
+    if initial == I_R:
+        # 신라 silla, 종로 jongno, 독립 dongnip, 법률 beomnyul
+        if final == F_N:
+            return "l", "l"
+        if final in (F_L, F_LG, F_LM, F_LB, F_LS, F_LT, F_LP):
+            return FINALS[final], "l"
+        if final in (F_M, F_NG):
+            return FINALS[final], "n"
+        if final in K_FINALS:
+            return "ng", "n"
+        if final in P_FINALS:
+            return "m", "n"
+        if final in T_FINALS:
+            return "n", "n"
+    if initial == I_N and final in (F_L, F_LB, F_LS, F_LT):
+        # ㄹ before ㄴ: 설날 seollal, 넓네 neolle
+        return "l", "l"
+    return FINALS[final], INITIALS[initial]
+
+
+# Every (final, next initial) pair, computed once
+TRANSITIONS = [[transition(final, initial) for initial in range(19)] for final in range(FINAL_COUNT)]
+
+COMPARE_IGNORE = re.compile(r"[\s\-'’.,!?\"()\[\]…~:;]")
+
+
+@functools.lru_cache(maxsize=100000)
+def romanize_word(word):
+    """Romanize one word (no spaces) with sound changes between its syllables"""
+    parts = []
+    final = F_NONE
+    for char in word:
+        code = ord(char) - SYLLABLE_BASE
+        if code < 0 or code > SYLLABLE_LAST - SYLLABLE_BASE:
+            parts.append(FINALS[final])
+            final = F_NONE
+            parts.append(char)
+            continue
+        initial, rest = divmod(code, MEDIAL_COUNT * FINAL_COUNT)
+        medial, next_final = divmod(rest, FINAL_COUNT)
+        if initial == I_NG and medial == MEDIAL_I and final in PALATAL:
+            kept, carried = PALATAL[final]
+        else:
+            kept, carried = TRANSITIONS[final][initial]
+        parts.append(kept)
+        parts.append(carried)
+        parts.append(MEDIALS[medial])
+        final = next_final
+    parts.append(FINALS[final])
+    return "".join(parts)
+
+
+def romanize(text):
+    """Romanize Korean text word by word, keeping punctuation"""
+    return " ".join(romanize_word(word) for word in normalize(text).split())
+
+
+def comparable(romanization):
+    """Reduce a romanization to letters only, for comparing hand-typed ones"""
+    return COMPARE_IGNORE.sub("", romanization).casefold()
+
+
+def missing_romanization(lesson):
+    """Generate romanization for items without one, as {section: {index: romanization}}.
+
+    Raises TypeError for items that are not objects, like the rest of the compiler.
+    """
+    generated = {}
+    for section in ("vocabulary", "example_sentences"):
+        missing = {}
+        for i, item in enumerate(lesson.get(section, [])):
+            if not isinstance(item, dict):
+                raise TypeError(f"{section} item {i} is not an object: {item!r}")
+            if not item.get("romanization"):
+                missing[str(i)] = romanize(item["korean"])
+        if missing:
+            generated[section] = missing
+    return generated
+
+
+def fill_romanization(lesson, generated=None):
+    """Add generated romanization to the items of a lesson that have none"""
+    if generated is None:
+        generated = missing_romanization(lesson)
+    for section, missing in generated.items():
+        items = lesson[section]
+        for i, romanization in missing.items():
+            items[int(i)]["romanization"] = romanization
+
+
+def check_romanization(lessons):
+    """Compare every romanization in the corpus with the generated one, returning mismatch dicts"""
+    mismatches = []
+    for lesson in lessons:
+        number = lesson.get("lesson_number", 0)
+        for section in ("vocabulary", "example_sentences"):
+            for item in lesson.get(section, []):
+                found = item.get("romanization")
+                if not found:
+                    continue
+                expected = romanize(item["korean"])
+                if comparable(found) != comparable(expected):
+                    # Hyphens mark a deliberate morpheme-by-morpheme spelling (jib-eseo)
+                    mismatches.append({"lesson": number, "korean": item["korean"], "found": found,
+                                       "expected": expected, "hyphenated": "-" in found})
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Revised Romanization or check it across the course")
+    parser.add_argument("words", nargs="*", help="Korean text to romanize (default: check every lesson)")
+    parser.add_argument("--lessons-dir", default="lessons")
+    parser.add_argument("--all", action="store_true",
+                        help="also list hyphenated (morpheme-by-morpheme) romanizations that differ")
+    args = parser.parse_args()
+
+    if args.words:
+        for text in args.words:
+            print(f"{text}: {romanize(text)}")
+        return
+
+    # Imported here: vocab_export imports lesson_manager, which imports this module
+    from vocab_export import iter_lesson_files, iter_lessons
+    mismatches = check_romanization(iter_lessons(iter_lesson_files(args.lessons_dir)))
+    hyphenated = sum(mismatch["hyphenated"] for mismatch in mismatches)
+    for mismatch in mismatches:
+        if args.all or not mismatch["hyphenated"]:
+            print(f"Lesson {mismatch['lesson']}: {mismatch['korean']} is romanized {mismatch['found']!r}, "
+                  f"expected {mismatch['expected']!r}")
+    print(f"{len(mismatches) - hyphenated} romanization mismatches found "
+          f"(spaces, punctuation and capitals are ignored)")
+    if hyphenated and not args.all:
+        print(f"{hyphenated} hyphenated romanizations also differ; use --all to list them")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import heapq
+import random
+
+
+class AdaptiveScheduler:
+    """Order exercises so that weak and long-unseen items come up first.
+
+    Every exercise sits in a heap keyed by the turn at which it is next due.
+    Answering an exercise reschedules it after a gap that shrinks with its
+    error rate, so missed items return soon and known ones drift to the back.
+    Each answer costs one heap push, O(log n). Ties are broken by historical
+    error rate, then by least recent attempt, then by a seeded shuffle, so a
+    session with the same seed and answers is reproducible.
+    """
+
+    def __init__(self, exercise_ids, stats_lookup=None, seed=None, min_gap=2):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.exercise_ids = list(exercise_ids)
+        self.min_gap = min_gap
+        self.turn = 0
+        self.checked_out = set()
+
+        count = len(self.exercise_ids)
+        self.attempts = [0] * count
+        self.errors = [0] * count
+        self.heap = []
+
+        order = list(range(count))
+        self.random.shuffle(order)
+        for position, index in enumerate(order):
+            stats = stats_lookup(self.exercise_ids[index]) if stats_lookup else None
+            last_attempt = 0.0
+            if stats:
+                self.attempts[index] = stats["attempts"]
+                self.errors[index] = stats["attempts"] - stats["correct"]
+                last_attempt = stats["last_attempt"]
+            heapq.heappush(self.heap, (0, -self.error_rate(index), last_attempt, position, index))
+
+    def __len__(self):
+        return len(self.exercise_ids)
+
+    def error_rate(self, index):
+        """Smoothed error rate; unseen exercises count as 50%"""
+        return (self.errors[index] + 1) / (self.attempts[index] + 2)
+
+    def next(self):
+        """Take the exercise index that is due next, or None if all are checked out"""
+        if not self.heap:
+            return None
+        index = heapq.heappop(self.heap)[-1]
+        self.checked_out.add(index)
+        return index
+
+    def record(self, index, correct):
+        """Record an answer and put the exercise back at its next due turn"""
+        if index not in self.checked_out:
+            return
+        self.checked_out.discard(index)
+        self.turn += 1
+        self.attempts[index] += 1
+        if not correct:
+            self.errors[index] += 1
+
+        error_rate = self.error_rate(index)
+        gap = self.min_gap + int((len(self) - 1) * (1 - error_rate) ** 2)
+        heapq.heappush(self.heap, (self.turn + gap, -error_rate, self.turn, self.random.random(), index))
@@ -0,0 +1,228 @@
+import argparse
+from collections import Counter
+
+from corpus_analyzer import CorpusAnalyzer
+from hangul import FINAL_RIEUL, compose, decompose, final_consonant, last_syllable, normalize
+
+PUNCTUATION = ".,!?\"'()[]…~:;"
+
+# Token kinds, used by the UI to colour each part of a word
+STEM_KINDS = ("noun", "verb")
+NOUN_ENDINGS = {
+    "particle": ("이", "가", "을", "를", "에", "에서", "에게", "한테", "께", "께서", "의", "와", "과",
+                 "하고", "로", "으로", "까지", "부터", "보다", "처럼", "랑", "이랑"),
+    "topic": ("은", "는", "도", "만"),
+    "copula": ("이에요", "예요", "입니다", "이다", "이었어요", "였어요", "이야"),
+}
+# Endings of 하다 verbs built on a noun (공부 + 해요)
+HADA_ENDINGS = ("해요", "했어요", "합니다", "했습니다", "하고", "해서", "하세요", "하면", "하지만")
+VERB_ENDINGS = ("아요", "어요", "았어요", "었어요", "습니다", "니다", "았습니다", "었습니다", "세요", "으세요",
+                "고", "지만", "아서", "어서", "면", "으면", "겠어요")
+
+# Forms that alternate on the final consonant of what comes before them,
+# as {form after a consonant: form after a vowel, or None if there is none}
+ALTERNATING = {"이": "가", "을": "를", "은": "는", "과": "와", "으로": "로", "이랑": "랑",
+               "이에요": "예요", "이었어요": "였어요", "이야": None,
+               "으세요": "세요", "으면": "면", "습니다": None}
+VOWEL_FORMS = {vowel: consonant for consonant, vowel in ALTERNATING.items() if vowel}
+
+# Medial indexes of ㅏ and ㅗ, which take 아 endings (앉아요, 봤어요) instead of 어
+BRIGHT_VOWELS = (0, 8)
+FINAL_BIEUP = 17
+
+
+def agrees(before, form):
+    """Check that an alternating form matches the final consonant of the text before it"""
+    final = final_consonant(before)
+    if final is None:
+        return True
+    if form in ALTERNATING:
+        return final > 0 and not (form in ("으로", "으세요", "으면") and final == FINAL_RIEUL)
+    if form in VOWEL_FORMS:
+        return final == 0 or (form in ("로", "세요", "면") and final == FINAL_RIEUL)
+    if form == "니다":
+        # ㅂ니다 is written into the stem's last syllable (갑니다, 감사합니다)
+        return final == FINAL_BIEUP and last_syllable(before) == before[-1]
+    if form[0] in "아어":
+        bright = decompose(last_syllable(before))[1] in BRIGHT_VOWELS
+        return (form[0] == "아") == bright
+    return True
+
+
+def split_word(word):
+    """Split leading and trailing punctuation off a word, as (prefix, core, suffix)"""
+    core = word.strip(PUNCTUATION)
+    if not core:
+        return word, "", ""
+    start = word.index(core)
+    return word[:start], core, word[start + len(core):]
+
+
+class Segmenter:
+    """Split Korean words into stems, particles, copula and verb endings.
+
+    Stems are matched against a lexicon (the course vocabulary, plus an
+    optional is_word callback such as a dictionary lookup) and the rest of
+    the word must parse as endings that agree with the stem's final
+    consonant. Results are memoized per word and per sentence, and
+    precompute() fills the memo in bulk so rendering never segments.
+    """
+
+    def __init__(self, vocabulary, is_word=None):
+        self.nouns = {normalize(korean) for korean in vocabulary}
+        self.is_word = is_word
+        self.words = {}
+        self.sentences = {}
+
+    def known(self, stem, kind, ending=""):
+        """Check if a stem is in the lexicon"""
+        lemma = self.lemma(stem, kind, ending)
+        return lemma in self.nouns or bool(self.is_word and self.is_word(lemma))
+
+    def lemma(self, stem, kind, ending=""):
+        """Get the dictionary form of a stem"""
+        if kind == "noun":
+            return stem
+        if ending in HADA_ENDINGS:
+            return stem + "하다"
+        if ending == "니다":
+            parts = decompose(stem[-1])
+            if parts is None:
+                # Not a Hangul syllable (jamo or Latin text), so there is no ㅂ to take off
+                return stem
+            initial, medial, _ = parts
+            return stem[:-1] + compose(initial, medial) + "다"
+        return stem + "다"
+
+    def noun_endings(self, stem, rest):
+        """Parse the rest of a noun as [particle][topic] or a copula, or return None"""
+        if not rest:
+            return []
+        for form in NOUN_ENDINGS["copula"]:
+            if rest == form and agrees(stem, form):
+                return [(form, "copula")]
+        for form in NOUN_ENDINGS["particle"] + ("",):
+            if not rest.startswith(form):
+                continue
+            tail = rest[len(form):]
+            if form and not agrees(stem, form):
+                continue
+            if not tail:
+                return [(form, "particle")] if form else None
+            if tail in NOUN_ENDINGS["topic"] and agrees(stem + form, tail):
+                return ([(form, "particle")] if form else []) + [(tail, "topic")]
+        return None
+
+    def parses(self, stem, rest):
+        """Yield (stem kind, [(ending, ending kind)]) for every valid reading of stem + rest"""
+        endings = self.noun_endings(stem, rest)
+        if endings is not None:
+            yield "noun", endings
+        if rest in HADA_ENDINGS:
+            yield "verb", [(rest, "ending")]
+        elif rest in VERB_ENDINGS and agrees(stem, rest):
+            yield "verb", [(rest, "ending")]
+
+    def segment_word(self, word):
+        """Get [(text, kind, lemma)] for one word without punctuation"""
+        tokens = self.words.get(word)
+        if tokens is not None:
+            return tokens
+
+        # The longest known stem wins; without one, the shortest stem that
+        # leaves valid endings (저 + 는, 먹 + 어요)
+        known = None
+        unknown = None
+        for end in range(len(word), 0, -1):
+            stem, rest = word[:end], word[end:]
+            for kind, endings in self.parses(stem, rest):
+                if self.known(stem, kind, rest):
+                    known = (stem, kind, endings)
+                    break
+                if endings and (unknown is None or unknown[0] != stem):
+                    unknown = (stem, kind, endings)
+            if known:
+                break
+
+        choice = known or unknown
+        if choice is None:
+            tokens = [(word, "noun", word)]
+        else:
+            stem, kind, endings = choice
+            last_ending = endings[-1][0] if endings else ""
+            tokens = [(stem, kind, self.lemma(stem, kind, last_ending))]
+            tokens.extend((text, ending_kind, text) for text, ending_kind in endings)
+        self.words[word] = tokens
+        return tokens
+
+    def segment(self, sentence):
+        """Get a sentence as a list of words, each a list of (text, kind, lemma) tokens"""
+        sentence = normalize(sentence)
+        result = self.sentences.get(sentence)
+        if result is not None:
+            return result
+
+        result = []
+        for word in sentence.split():
+            prefix, core, suffix = split_word(word)
+            tokens = [(prefix, "punctuation", None)] if prefix else []
+            if core:
+                tokens.extend(self.segment_word(core))
+            if suffix:
+                tokens.append((suffix, "punctuation", None))
+            result.append(tokens)
+        self.sentences[sentence] = result
+        return result
+
+    def precompute(self, sentences):
+        """Segment sentences in bulk ahead of rendering, returning how many were new"""
+        count = len(self.sentences)
+        for sentence in sentences:
+            self.segment(sentence)
+        return len(self.sentences) - count
+
+
+def corpus_segmenter(lessons_dir="lessons", is_word=None, parallel=False):
+    """Build a segmenter from the course vocabulary and segment every example sentence"""
+    analyzer = CorpusAnalyzer(lessons_dir)
+    analyzer.collect(parallel)
+    partials = analyzer.partials()
+    segmenter = Segmenter((korean for partial in partials for korean, _ in partial["vocabulary"]), is_word)
+    segmenter.precompute(sentence for partial in partials for sentence in partial["sentences"])
+    return segmenter
+
+
+def format_sentence(words):
+    return " ".join("+".join(text for text, kind, _ in tokens if kind != "punctuation") for tokens in words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segment example sentences into stems, particles and endings")
+    parser.add_argument("sentences", nargs="*", help="sentences to segment (default: every example sentence)")
+    parser.add_argument("--lessons-dir", default="lessons")
+    args = parser.parse_args()
+
+    segmenter = corpus_segmenter(args.lessons_dir, parallel=True)
+    if args.sentences:
+        for sentence in args.sentences:
+            words = segmenter.segment(sentence)
+            print(format_sentence(words))
+            for tokens in words:
+                for text, kind, lemma in tokens:
+                    if kind != "punctuation":
+                        print(f"  {text}\t{kind}\t{lemma}")
+        return
+
+    unknown = Counter()
+    for sentence, words in segmenter.sentences.items():
+        print(f"{sentence}\n  {format_sentence(words)}")
+        for tokens in words:
+            stems = [(text, kind, lemma) for text, kind, lemma in tokens if kind in STEM_KINDS]
+            if stems and stems[0][2] not in segmenter.nouns:
+                unknown[stems[0][2]] += 1
+    print(f"\n{len(segmenter.sentences)} sentences, stems not in the vocabulary: "
+          f"{', '.join(f'{lemma} ({count})' for lemma, count in unknown.most_common(30))}")
+
+
+if __name__ == "__main__":
+    main()
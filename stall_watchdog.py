@@ -0,0 +1,79 @@
+import logging
+import logging.handlers
+import sys
+import threading
+import time
+import traceback
+
+
+class StallWatchdog:
+    """Log the main thread's stack when the Tk event loop stops responding.
+
+    The main loop runs a heartbeat after() every interval. A watchdog thread
+    checks how long ago the last beat ran; once that exceeds interval plus
+    threshold it grabs the main thread's current stack with
+    sys._current_frames() and logs it to a rotating log file straight away,
+    so a main loop that never recovers is still reported. When the beats
+    resume, the stall's total duration is logged as well.
+    """
+
+    def __init__(self, root, threshold=0.05, interval=0.025, log_file="stalls.log",
+                 max_bytes=1024 * 1024, backup_count=3):
+        self.root = root
+        self.threshold = threshold
+        self.interval = interval
+        self.main_thread_id = threading.main_thread().ident
+        self.last_beat = time.monotonic()
+        self.after_id = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+        self.logger = logging.getLogger("korean_learning_app.stalls")
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                                           backupCount=backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+            self.logger.setLevel(logging.INFO)
+
+    def start(self):
+        self.last_beat = time.monotonic()
+        self.after_id = self.root.after(int(self.interval * 1000), self.beat)
+        self.thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def beat(self):
+        """Heartbeat on the Tk main loop"""
+        self.last_beat = time.monotonic()
+        self.after_id = self.root.after(int(self.interval * 1000), self.beat)
+
+    def watch(self):
+        """Watchdog thread: log stalls with where they happen as they start, and their length when they end"""
+        limit = self.interval + self.threshold
+        stall_beat = None
+        while not self.stopped.wait(self.threshold / 2):
+            last_beat = self.last_beat
+            if stall_beat is None:
+                waited = time.monotonic() - last_beat
+                if waited > limit:
+                    stall_beat = last_beat
+                    self.logger.info("Main loop not responding for %.0f ms in:\n%s",
+                                     (waited - self.interval) * 1000, self.main_thread_stack())
+            elif last_beat != stall_beat:
+                # Beats resumed: the stall lasted from the missed beat until this one
+                duration = last_beat - stall_beat - self.interval
+                self.logger.info("Main loop recovered after stalling for %.0f ms", duration * 1000)
+                stall_beat = None
+
+    def main_thread_stack(self):
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return "  (main thread stack unavailable)\n"
+        return "".join(traceback.format_stack(frame, limit=30))
@@ -0,0 +1,282 @@
+import argparse
+import functools
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+# Recorded app methods and how their arguments are stored. Exercise dicts are
+# not stored; on replay the current exercise is passed in again.
+RECORDED_ACTIONS = {
+    "select_lesson": lambda args: [args[0]],
+    "show_lesson_selection": lambda args: [],
+    "show_lesson_overview": lambda args: [],
+    "show_vocabulary": lambda args: [],
+    "show_grammar": lambda args: [],
+    "show_exercises": lambda args: [],
+    "show_drill": lambda args: [],
+    "drill_input": lambda args: list(args),
+    "prev_vocab_page": lambda args: [],
+    "next_vocab_page": lambda args: [],
+    "check_multiple_choice": lambda args: [args[1]],
+    "check_syllable_choice": lambda args: [args[1]],
+    "add_syllable": lambda args: [args[0]],
+    "update_built_word": lambda args: [args[0]],
+    "clear_built_word": lambda args: [],
+    "check_word_building": lambda args: [],
+    "next_exercise": lambda args: [],
+    "restart_exercises": lambda args: [],
+    "toggle_adaptive_order": lambda args: [],
+    "show_vocabulary_review": lambda args: [],
+    "show_grammar_reference": lambda args: [],
+    "switch_vocab_mode": lambda args: [args[0]],
+}
+
+# Actions that take the current exercise as their first or only argument
+EXERCISE_ACTIONS = {"check_multiple_choice", "check_syllable_choice", "check_word_building"}
+
+# Callbacks of background loads; screens they show are part of the action that started the load
+BACKGROUND_CALLBACKS = ("on_startup_data_loaded", "on_lesson_loaded", "on_learned_vocabulary_loaded")
+
+
+class ActionRecorder:
+    """Record user-level actions on a KoreanLearningApp as JSON lines.
+
+    Recorded methods are wrapped on the app instance before it is initialized,
+    so button commands and lambdas go through the wrappers. Calls made from
+    inside another recorded action (show_vocabulary from next_vocab_page) or
+    from a background load callback are not recorded separately.
+
+    The first line holds the starting progress, attempt statistics and the
+    random seed that adaptive exercise orders are drawn from, so a replay
+    sees the same exercises in the same order.
+    """
+
+    def __init__(self, app, output_file):
+        self.app = app
+        self.output = open(output_file, 'w', encoding='utf-8')
+        self.started = time.monotonic()
+        self.depth = 0
+
+        seed = random.randrange(2 ** 32)
+        random.seed(seed)
+        self.write({"progress": read_json("progress.json"), "attempt_stats": read_json("attempt_stats.json"),
+                    "seed": seed})
+
+        for name, serialize in RECORDED_ACTIONS.items():
+            setattr(app, name, self.wrap(name, getattr(app, name), serialize))
+        for name in BACKGROUND_CALLBACKS:
+            setattr(app, name, self.wrap(name, getattr(app, name), None))
+
+    def wrap(self, name, method, serialize):
+        @functools.wraps(method)
+        def recorded(*args):
+            if self.depth == 0 and serialize:
+                self.write({"t": round(time.monotonic() - self.started, 3),
+                            "action": name, "args": serialize(args)})
+            self.depth += 1
+            try:
+                return method(*args)
+            finally:
+                self.depth -= 1
+        return recorded
+
+    def write(self, record):
+        self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.output.flush()
+
+    def close(self):
+        self.output.close()
+
+
+def read_json(path):
+    """Read a JSON file, or None if it does not exist"""
+    path = Path(path)
+    return json.loads(path.read_text(encoding='utf-8')) if path.exists() else None
+
+
+def load_recording(recording_file):
+    """Read a recording into (starting state, list of actions)"""
+    with open(recording_file, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records or "progress" not in records[0]:
+        raise ValueError(f"{recording_file} is not a UI recording")
+    return records[0], records[1:]
+
+
+def wait_until_idle(app, timeout=10.0):
+    """Process Tk events until no background task or render chunk is pending and the screen is drawn"""
+    deadline = time.monotonic() + timeout
+    while True:
+        app.root.update()
+        if not app.io.pending and not app.renderer.pending:
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError("Background tasks did not finish")
+        time.sleep(0.001)
+    app.root.update_idletasks()
+
+
+def replay_action(app, record):
+    """Run one recorded action on the app"""
+    args = list(record["args"])
+    if record["action"] in EXERCISE_ACTIONS:
+        args.insert(0, app.current_lesson["exercises"][app.current_exercise_index])
+    elif record["action"] == "add_syllable":
+        args.append(app.current_lesson["exercises"][app.current_exercise_index])
+    elif record["action"] == "update_built_word":
+        # Typed text arrives through the Hangul input; put the composer in the same state
+        app.word_input.composer.clear()
+        app.word_input.composer.insert(args[0])
+    getattr(app, record["action"])(*args)
+
+
+def replay(start, actions):
+    """Replay actions in a fresh app as fast as possible, returning {action: [latency seconds]}"""
+    import tkinter as tk
+    from korean_learning_app import KoreanLearningApp
+
+    for path, data in (("progress.json", start["progress"]), ("attempt_stats.json", start.get("attempt_stats"))):
+        if data is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+    if start.get("seed") is not None:
+        random.seed(start["seed"])
+
+    started = time.perf_counter()
+    root = tk.Tk()
+    app = KoreanLearningApp(root)
+    latencies = {"startup": []}
+    while app.lesson_manager is None:
+        wait_until_idle(app)
+    latencies["startup"].append(time.perf_counter() - started)
+
+    try:
+        for record in actions:
+            started = time.perf_counter()
+            replay_action(app, record)
+            wait_until_idle(app)
+            latencies.setdefault(record["action"], []).append(time.perf_counter() - started)
+    finally:
+        app.on_close()
+    return latencies
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def latency_report(latencies):
+    """Summarize latencies per action in milliseconds"""
+    report = {}
+    for action, values in latencies.items():
+        values = sorted(values)
+        report[action] = {
+            "count": len(values),
+            "p50": percentile(values, 0.50) * 1000,
+            "p90": percentile(values, 0.90) * 1000,
+            "p99": percentile(values, 0.99) * 1000,
+            "max": values[-1] * 1000,
+        }
+    return report
+
+
+def start_virtual_display():
+    """Start Xvfb on a free display number and point DISPLAY at it"""
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("Xvfb not found; install it or run with a display")
+    display = 99
+    while Path(f"/tmp/.X11-unix/X{display}").exists():
+        display += 1
+    process = subprocess.Popen([xvfb, f":{display}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 5
+    while not Path(f"/tmp/.X11-unix/X{display}").exists():
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError("Xvfb failed to start")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{display}"
+    return process
+
+
+def record_session(output_file):
+    """Run the app normally while recording actions to output_file"""
+    import tkinter as tk
+    from korean_learning_app import KoreanLearningApp
+
+    root = tk.Tk()
+    app = KoreanLearningApp.__new__(KoreanLearningApp)
+    recorder = ActionRecorder(app, output_file)
+    app.__init__(root)
+    try:
+        root.mainloop()
+    finally:
+        recorder.close()
+
+
+def replay_session(recording_file, repeat=1):
+    """Replay a recording repeat times in a scratch folder, returning the latency report"""
+    start, actions = load_recording(recording_file)
+    lessons_dir = Path("lessons").resolve()
+    original_dir = os.getcwd()
+
+    latencies = {}
+    with tempfile.TemporaryDirectory(prefix="ui_replay_") as work_dir:
+        # Progress and attempt logs are written to the scratch folder, not the user's
+        os.symlink(lessons_dir, Path(work_dir) / "lessons")
+        os.chdir(work_dir)
+        try:
+            for _ in range(repeat):
+                for path in ("progress.json", "attempts.log", "attempt_stats.json"):
+                    if os.path.exists(path):
+                        os.remove(path)
+                for action, values in replay(start, actions).items():
+                    latencies.setdefault(action, []).extend(values)
+        finally:
+            os.chdir(original_dir)
+    return latency_report(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record app sessions and replay them to measure UI latency")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="run the app and record actions")
+    record_parser.add_argument("output", help="recording file to write")
+    replay_parser = subparsers.add_parser("replay", help="replay a recording and report latencies")
+    replay_parser.add_argument("recording", help="recording file to replay")
+    replay_parser.add_argument("--repeat", type=int, default=5, help="number of replays")
+    replay_parser.add_argument("--xvfb", action="store_true", help="run under a virtual X display")
+    replay_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_session(args.output)
+        return
+
+    display = start_virtual_display() if args.xvfb else None
+    try:
+        report = replay_session(args.recording, args.repeat)
+    finally:
+        if display:
+            display.terminate()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'action':<24}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for action, stats in sorted(report.items()):
+        print(f"{action:<24}{stats['count']:>7}{stats['p50']:>10.1f}{stats['p90']:>10.1f}"
+              f"{stats['p99']:>10.1f}{stats['max']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import bisect
+import tkinter as tk
+import tkinter.font as tkfont
+
+CARD_BG = '#f9fafb'
+CARD_BORDER = '#1f2937'
+
+# Fonts and colors match the label-based cards used elsewhere in the app
+KOREAN_FONT = ('Arial', 18, 'bold')
+KOREAN_LARGE_FONT = ('Arial', 20, 'bold')
+ROMANIZATION_FONT = ('Arial', 14, 'italic')
+ENGLISH_FONT = ('Arial', 16)
+LESSON_FONT = ('Arial', 12)
+HEADER_FONT = ('Arial', 18, 'bold')
+
+KOREAN_COLOR = '#dc2626'
+MUTED_COLOR = '#6b7280'
+TEXT_COLOR = '#1f2937'
+
+# Card layouts:
+#   "stacked" - korean / [romanization] / english on three lines (lesson vocabulary)
+#   "inline"  - korean [romanization] - english on one line (review by lesson)
+#   "detail"  - korean [romanization] over english ... (lesson) (review all words)
+CARD_LAYOUTS = ("stacked", "inline", "detail")
+
+
+class TextMetrics:
+    """Cache font objects, line heights and measured text widths"""
+
+    def __init__(self, root):
+        self.root = root
+        self.fonts = {}
+        self.linespaces = {}
+        self.widths = {}
+
+    def font(self, spec):
+        """Get a cached Font object for a font tuple"""
+        font = self.fonts.get(spec)
+        if font is None:
+            font = tkfont.Font(root=self.root, font=spec)
+            self.fonts[spec] = font
+        return font
+
+    def linespace(self, spec):
+        """Get the line height of a font"""
+        height = self.linespaces.get(spec)
+        if height is None:
+            height = self.font(spec).metrics("linespace")
+            self.linespaces[spec] = height
+        return height
+
+    def measure(self, spec, text):
+        """Get the pixel width of text in a font"""
+        key = (spec, text)
+        width = self.widths.get(key)
+        if width is None:
+            width = self.font(spec).measure(text)
+            self.widths[key] = width
+        return width
+
+
+_shared_metrics = {}
+
+
+def get_text_metrics(widget):
+    """Get the text metrics cache shared by all canvases of a Tk root"""
+    root = widget.winfo_toplevel()
+    key = str(root.tk)
+    if key not in _shared_metrics:
+        _shared_metrics[key] = TextMetrics(root)
+    return _shared_metrics[key]
+
+
+class VocabCardCanvas(tk.Canvas):
+    """Draw vocabulary cards as canvas items instead of nested frames and labels.
+
+    Rows are ("header", text) or ("card", vocab) tuples, where vocab is a dict or
+    a reference that the optional resolve callable turns into one when the row
+    is drawn or clicked. Row heights are computed up front from cached font
+    metrics, but items are only created for rows that are in (or near) the
+    visible region, so long lists scroll smoothly. Cards with an "image" are
+    given a thumbnail through image_loader(path, size, callback) when they
+    are first drawn.
+    """
+
+    def __init__(self, parent, layout="stacked", on_click=None, fit=False,
+                 padx=10, overscan=400, resolve=None, image_loader=None, **kwargs):
+        kwargs.setdefault("bg", '#ffffff')
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(parent, **kwargs)
+        if layout not in CARD_LAYOUTS:
+            raise ValueError(f"Unknown card layout: {layout}")
+
+        self.layout = layout
+        self.on_click = on_click
+        self.resolve = resolve
+        self.image_loader = image_loader
+        self.fit = fit
+        self.padx = padx
+        self.overscan = overscan
+        self.metrics = get_text_metrics(self)
+
+        self.rows = []
+        self.offsets = []
+        self.heights = []
+        self.total_height = 0
+        self.drawn = {}
+        self.layout_cache = {}
+        self.row_images = {}
+        self.generation = 0
+
+        self.bind("<Configure>", self.on_configure)
+        self.bind("<Button-1>", self.on_button_click)
+        self.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.bind("<Button-4>", lambda e: self.yview_scroll(-3, "units"))
+        self.bind("<Button-5>", lambda e: self.yview_scroll(3, "units"))
+
+    def set_rows(self, rows, keep_position=False):
+        """Replace the rows shown on the canvas, optionally keeping the scroll offset"""
+        top = self.canvasy(0)
+        self.delete("all")
+        self.drawn = {}
+        self.layout_cache = {}
+        self.row_images = {}
+        self.generation += 1
+        self.rows = list(rows)
+
+        self.offsets = []
+        self.heights = []
+        y = 0
+        for kind, _ in self.rows:
+            height, gap = self.row_height(kind)
+            self.offsets.append(y + gap)
+            self.heights.append(height)
+            y += gap + height + gap
+        self.total_height = y
+
+        if self.fit:
+            self.configure(height=self.total_height)
+        self.configure(scrollregion=(0, 0, self.content_width(), self.total_height))
+        if keep_position and self.total_height:
+            self.yview_moveto(top / self.total_height)
+        else:
+            self.yview_moveto(0)
+        self.render_visible()
+
+    def row_height(self, kind):
+        """Get (height, vertical gap) of a row without measuring its text"""
+        m = self.metrics
+        if kind == "header":
+            return m.linespace(HEADER_FONT) + 20, 5
+        if self.layout == "stacked":
+            height = (10 + m.linespace(KOREAN_LARGE_FONT) + 5 +
+                      m.linespace(ROMANIZATION_FONT) + m.linespace(ENGLISH_FONT) + 10)
+            return height, 10
+        if self.layout == "inline":
+            line = max(m.linespace(KOREAN_FONT), m.linespace(ROMANIZATION_FONT),
+                       m.linespace(ENGLISH_FONT))
+            return 10 + line + 10, 5
+        top = max(m.linespace(KOREAN_FONT), m.linespace(ROMANIZATION_FONT))
+        bottom = max(m.linespace(ENGLISH_FONT), m.linespace(LESSON_FONT))
+        return 8 + top + bottom + 8, 3
+
+    def content_width(self):
+        """Get the drawable width, falling back to the requested width before mapping"""
+        width = self.winfo_width()
+        if width <= 1:
+            width = int(self.cget("width"))
+        return width
+
+    def layout_row(self, index):
+        """Get the cached text items of a row relative to its top-left corner"""
+        items = self.layout_cache.get(index)
+        if items is not None:
+            return items
+
+        kind, data = self.rows[index]
+        if kind == "card" and self.resolve:
+            data = self.resolve(data)
+        m = self.metrics
+        x = 15
+        if kind == "header":
+            items = [(0, 10, data, HEADER_FONT, TEXT_COLOR, "nw")]
+        elif self.layout == "stacked":
+            y = 10
+            items = [(x, y, data["korean"], KOREAN_LARGE_FONT, KOREAN_COLOR, "nw")]
+            y += m.linespace(KOREAN_LARGE_FONT) + 5
+            items.append((x, y, f"[{data['romanization']}]", ROMANIZATION_FONT, MUTED_COLOR, "nw"))
+            y += m.linespace(ROMANIZATION_FONT)
+            items.append((x, y, data["english"], ENGLISH_FONT, TEXT_COLOR, "nw"))
+        elif self.layout == "inline":
+            rom_text = f"[{data['romanization']}]"
+            rom_x = x + m.measure(KOREAN_FONT, data["korean"]) + 10
+            eng_x = rom_x + m.measure(ROMANIZATION_FONT, rom_text) + 10
+            middle = self.heights[index] // 2
+            items = [
+                (x, middle, data["korean"], KOREAN_FONT, KOREAN_COLOR, "w"),
+                (rom_x, middle, rom_text, ROMANIZATION_FONT, MUTED_COLOR, "w"),
+                (eng_x, middle, f"- {data['english']}", ENGLISH_FONT, TEXT_COLOR, "w"),
+            ]
+        else:
+            rom_text = f"[{data['romanization']}]"
+            rom_x = x + m.measure(KOREAN_FONT, data["korean"]) + 10
+            top = max(m.linespace(KOREAN_FONT), m.linespace(ROMANIZATION_FONT))
+            items = [
+                (x, 8 + top // 2, data["korean"], KOREAN_FONT, KOREAN_COLOR, "w"),
+                (rom_x, 8 + top // 2, rom_text, ROMANIZATION_FONT, MUTED_COLOR, "w"),
+                (x, 8 + top, data["english"], ENGLISH_FONT, TEXT_COLOR, "nw"),
+            ]
+            if data.get("lesson"):
+                # Right-aligned, so the x position is resolved against the card width when drawn;
+                # cards with an image keep the thumbnail's corner free
+                lesson_x = -(15 + self.heights[index] - 12) if data.get("image") and self.image_loader else -15
+                items.append((lesson_x, 8 + top, f"({data['lesson']})", LESSON_FONT, MUTED_COLOR, "ne"))
+
+        self.layout_cache[index] = items
+        return items
+
+    def visible_range(self):
+        """Get the (first, last) row indexes intersecting the visible region plus overscan"""
+        if not self.rows:
+            return 0, -1
+        top = self.canvasy(0) - self.overscan
+        bottom = self.canvasy(0) + max(self.winfo_height(), 1) + self.overscan
+        first = max(bisect.bisect_right(self.offsets, top) - 1, 0)
+        last = min(bisect.bisect_right(self.offsets, bottom), len(self.rows) - 1)
+        return first, last
+
+    def render_visible(self):
+        """Create items for newly visible rows and drop rows that scrolled far away"""
+        first, last = self.visible_range()
+        for index in list(self.drawn):
+            if index < first or index > last:
+                self.delete(f"row{index}")
+                del self.drawn[index]
+                self.row_images.pop(index, None)
+        for index in range(first, last + 1):
+            if index not in self.drawn:
+                self.draw_row(index)
+
+    def draw_row(self, index):
+        """Draw a single row at its precomputed offset"""
+        kind, _ = self.rows[index]
+        tag = f"row{index}"
+        left = self.padx
+        right = self.content_width() - self.padx
+        top = self.offsets[index]
+
+        if kind == "card":
+            self.create_rectangle(left, top, right, top + self.heights[index],
+                                  fill=CARD_BG, outline=CARD_BORDER, width=1,
+                                  tags=(tag, "card_bg"))
+        for x, y, text, font, fill, anchor in self.layout_row(index):
+            x = right + x if x < 0 else left + x
+            self.create_text(x, top + y, text=text, font=font, fill=fill,
+                             anchor=anchor, tags=(tag,))
+        self.drawn[index] = True
+        if kind == "card" and self.image_loader:
+            self.request_image(index, right, top)
+
+    def request_image(self, index, right, top):
+        """Ask for a card's thumbnail and draw it if the card is still shown when it arrives"""
+        data = self.rows[index][1]
+        if self.resolve:
+            data = self.resolve(data)
+        path = data.get("image")
+        if not path:
+            return
+
+        size = self.heights[index] - 12
+        generation = self.generation
+
+        def show(photo):
+            if self.generation != generation or index not in self.drawn or index in self.row_images:
+                return
+            # Keep a reference: the cache may drop the image while it is on screen
+            self.row_images[index] = photo
+            self.create_image(right - 6, top + 6, image=photo, anchor="ne", tags=(f"row{index}",))
+
+        self.image_loader(path, size, show)
+
+    def row_at(self, y):
+        """Hit-test a canvas y coordinate, returning the row index or None"""
+        index = bisect.bisect_right(self.offsets, y) - 1
+        if index < 0 or y > self.offsets[index] + self.heights[index]:
+            return None
+        return index
+
+    def yview(self, *args):
+        result = super().yview(*args)
+        if args:
+            self.render_visible()
+        return result
+
+    def yview_scroll(self, number, what):
+        super().yview_scroll(number, what)
+        self.render_visible()
+
+    def on_configure(self, event):
+        """Redraw visible rows when the canvas is resized"""
+        self.configure(scrollregion=(0, 0, event.width, self.total_height))
+        self.delete("all")
+        self.drawn = {}
+        self.row_images = {}
+        self.generation += 1
+        self.render_visible()
+
+    def on_mouse_wheel(self, event):
+        self.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+    def on_button_click(self, event):
+        """Dispatch clicks on cards to the on_click callback"""
+        if not self.on_click:
+            return
+        x = self.canvasx(event.x)
+        if x < self.padx or x > self.content_width() - self.padx:
+            return
+        index = self.row_at(self.canvasy(event.y))
+        if index is not None and self.rows[index][0] == "card":
+            data = self.rows[index][1]
+            self.on_click(self.resolve(data) if self.resolve else data)
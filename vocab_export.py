@@ -0,0 +1,125 @@
+import argparse
+import csv
+import json
+import os
+from pathlib import Path
+
+from lesson_manager import LESSON_FILE_PATTERN, LessonManager
+from romanization import fill_romanization
+
+EXPORT_FORMATS = ("csv", "tsv", "anki")
+
+# Anki (2.1.54+) reads these header lines when importing a plain text file
+ANKI_HEADER = "#separator:tab\n#html:false\n#columns:Front\tBack\tTags\n"
+
+
+def format_for_path(path):
+    """Guess the export format from a file extension (.csv, .tsv, anything else: anki)"""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".tsv", ".tab"):
+        return "tsv"
+    return "anki"
+
+
+def iter_lesson_files(lessons_dir="lessons", lesson_numbers=None):
+    """Yield (lesson number, path) for lesson files in number order"""
+    if lesson_numbers is not None:
+        for number in sorted(lesson_numbers):
+            lesson_file = Path(lessons_dir) / f"lesson_{number:02d}.json"
+            if lesson_file.exists():
+                yield number, lesson_file
+        return
+
+    numbered = []
+    for entry in os.scandir(lessons_dir):
+        match = LESSON_FILE_PATTERN.match(entry.name)
+        if match:
+            numbered.append((int(match.group(1)), entry.path))
+    yield from sorted(numbered)
+
+
+def iter_lessons(lesson_files):
+    """Load lessons one at a time, generating romanization where it is missing"""
+    for number, lesson_file in lesson_files:
+        try:
+            with open(lesson_file, 'r', encoding='utf-8') as f:
+                lesson = json.load(f)
+            fill_romanization(lesson)
+        except (json.JSONDecodeError, KeyError, TypeError, IOError) as e:
+            print(f"Error reading {lesson_file}: {e}")
+            continue
+        yield lesson
+
+
+def iter_vocabulary(lessons):
+    """Yield (lesson number, lesson title, vocab) for every vocabulary item"""
+    for lesson in lessons:
+        number = lesson.get("lesson_number", 0)
+        title = lesson.get("lesson_title", "Unknown")
+        for vocab in lesson.get("vocabulary", []):
+            yield number, title, vocab
+
+
+def iter_rows(items, fmt):
+    """Turn vocabulary items into output rows, header first"""
+    if fmt == "anki":
+        for number, _, vocab in items:
+            back = f"{vocab['english']} [{vocab['romanization']}]" if vocab["romanization"] else vocab["english"]
+            yield vocab["korean"], back, f"lesson_{number:02d}"
+        return
+
+    yield "korean", "romanization", "english", "lesson"
+    for number, title, vocab in items:
+        yield vocab["korean"], vocab["romanization"], vocab["english"], f"Lesson {number}: {title}"
+
+
+def write_rows(rows, output, fmt):
+    """Stream rows to an open text file, returning the number of data rows"""
+    if fmt == "anki":
+        output.write(ANKI_HEADER)
+    writer = csv.writer(output, delimiter="," if fmt == "csv" else "\t", lineterminator="\n")
+    count = 0
+    for row in rows:
+        # Anki and TSV readers treat embedded tabs and newlines as field/record breaks
+        if fmt != "csv":
+            row = [" ".join(field.split()) for field in row]
+        writer.writerow(row)
+        count += 1
+    return count if fmt == "anki" else count - 1
+
+
+def export_vocabulary(path, fmt=None, lessons_dir="lessons", lesson_numbers=None):
+    """Export vocabulary from some (default: all) lessons, returning the number of items"""
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    rows = iter_rows(iter_vocabulary(iter_lessons(iter_lesson_files(lessons_dir, lesson_numbers))), fmt)
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        count = write_rows(rows, f, fmt)
+    os.replace(tmp_path, path)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export vocabulary to CSV, TSV or Anki text")
+    parser.add_argument("output", help="output file")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="output format (default: from file extension)")
+    parser.add_argument("--learned", action="store_true",
+                        help="only completed lessons plus the current lesson")
+    args = parser.parse_args()
+
+    lesson_numbers = None
+    if args.learned:
+        lesson_numbers = LessonManager(lazy_scan=True).get_learned_lessons()
+
+    count = export_vocabulary(args.output, args.format, lesson_numbers=lesson_numbers)
+    print(f"Exported {count} vocabulary items to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
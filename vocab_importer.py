@@ -0,0 +1,182 @@
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from hangul import normalize
+
+VOCAB_FIELDS = ("korean", "romanization", "english")
+
+
+def vocab_key(korean, english):
+    """Get the deduplication key of a vocabulary entry as a 64-bit int"""
+    text = f"{normalize(korean)}\t{normalize(english).casefold()}"
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), "big")
+
+
+def parse_chunk(lines, delimiter, columns):
+    """Parse and normalize a chunk of raw lines (worker process).
+
+    Returns (key, korean, romanization, english) tuples; rows without a Korean
+    word or an English meaning are dropped.
+    """
+    entries = []
+    for row in csv.reader(lines, delimiter=delimiter):
+        korean, romanization, english = (row[i].strip() if i < len(row) else "" for i in columns)
+        korean = normalize(korean)
+        english = normalize(english)
+        if not korean or not english:
+            continue
+        entries.append((vocab_key(korean, english), korean, normalize(romanization), english))
+    return entries
+
+
+def read_chunks(source, chunk_rows):
+    """Yield lists of raw lines, only cutting between complete CSV records"""
+    chunk = []
+    in_quotes = False
+    for line in source:
+        chunk.append(line)
+        # An odd number of quotes leaves a quoted field open across the newline
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+        if len(chunk) >= chunk_rows and not in_quotes:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def detect_columns(header, delimiter):
+    """Map korean/romanization/english to column indexes from a header line"""
+    names = [name.strip().lower() for name in next(csv.reader([header], delimiter=delimiter))]
+    if not all(field in names for field in ("korean", "english")):
+        return None
+    return tuple(names.index(field) if field in names else len(names) + 1 for field in VOCAB_FIELDS)
+
+
+def existing_vocab_keys(lessons_dir):
+    """Build the dedup index from vocabulary already in the lessons folder"""
+    keys = set()
+    highest = 0
+    for lesson_file in Path(lessons_dir).glob("lesson_*.json"):
+        try:
+            with open(lesson_file, 'r', encoding='utf-8') as f:
+                lesson = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error reading {lesson_file}: {e}")
+            continue
+        highest = max(highest, lesson.get("lesson_number", 0))
+        for vocab in lesson.get("vocabulary", []):
+            keys.add(vocab_key(vocab["korean"], vocab["english"]))
+    return keys, highest
+
+
+def write_lesson(lessons_dir, lesson_number, title, vocabulary, exercises=None):
+    """Atomically write a lesson without grammar in the standard schema"""
+    lesson = {
+        "lesson_number": lesson_number,
+        "lesson_title": title,
+        "grammar_rules": [],
+        "vocabulary": vocabulary,
+        "example_sentences": [],
+        "exercises": exercises or []
+    }
+    lesson_file = Path(lessons_dir) / f"lesson_{lesson_number:02d}.json"
+    tmp_file = lesson_file.with_name(lesson_file.name + ".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(lesson, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_file, lesson_file)
+    return lesson_file
+
+
+def parsed_entries(source_file, delimiter, columns, chunk_rows, workers):
+    """Stream parsed entries in input order with a bounded number of chunks in flight"""
+    with open(source_file, 'r', encoding='utf-8-sig', newline='') as source:
+        header = source.readline()
+        header_columns = detect_columns(header, delimiter)
+        if header_columns is None:
+            # No header row: the first line is data
+            lines = itertools.chain([header], source)
+        else:
+            columns = header_columns
+            lines = source
+
+        max_in_flight = (workers or os.cpu_count() or 1) * 2
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for chunk in read_chunks(lines, chunk_rows):
+                in_flight.append(executor.submit(parse_chunk, chunk, delimiter, columns))
+                if len(in_flight) >= max_in_flight:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+
+def import_vocabulary(source_file, lessons_dir="lessons", lesson_size=50,
+                      title="Imported Vocabulary", delimiter=None, columns=(0, 1, 2),
+                      chunk_rows=5000, workers=None):
+    """Import a CSV/TSV vocabulary file into new lesson files, returning a summary"""
+    lessons_dir = Path(lessons_dir)
+    lessons_dir.mkdir(exist_ok=True)
+    if delimiter is None:
+        delimiter = "\t" if Path(source_file).suffix.lower() in (".tsv", ".tab") else ","
+
+    seen, lesson_number = existing_vocab_keys(lessons_dir)
+    summary = {"rows": 0, "duplicates": 0, "imported": 0, "lessons": []}
+    batch = []
+
+    def flush():
+        nonlocal lesson_number
+        lesson_number += 1
+        part = len(summary["lessons"]) + 1
+        write_lesson(lessons_dir, lesson_number, f"{title} {part}", batch)
+        summary["lessons"].append(lesson_number)
+        batch.clear()
+
+    for key, korean, romanization, english in parsed_entries(source_file, delimiter, columns,
+                                                             chunk_rows, workers):
+        summary["rows"] += 1
+        if key in seen:
+            summary["duplicates"] += 1
+            continue
+        seen.add(key)
+        batch.append({"korean": korean, "romanization": romanization, "english": english})
+        summary["imported"] += 1
+        if len(batch) >= lesson_size:
+            flush()
+    if batch:
+        flush()
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a CSV/TSV vocabulary list into lesson files")
+    parser.add_argument("source", help="CSV or TSV file with korean, romanization, english columns")
+    parser.add_argument("--lessons-dir", default="lessons")
+    parser.add_argument("--lesson-size", type=int, default=50, help="vocabulary items per lesson")
+    parser.add_argument("--title", default="Imported Vocabulary", help="lesson title prefix")
+    parser.add_argument("--delimiter", default=None, help="field delimiter (default: from file extension)")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="rows per parse task")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+    if args.lesson_size < 1:
+        parser.error("--lesson-size must be at least 1")
+
+    summary = import_vocabulary(args.source, args.lessons_dir, args.lesson_size, args.title,
+                                args.delimiter, chunk_rows=args.chunk_rows, workers=args.workers)
+    lessons = summary["lessons"]
+    print(f"Read {summary['rows']} rows: {summary['imported']} imported, "
+          f"{summary['duplicates']} duplicates skipped")
+    if lessons:
+        print(f"Created lessons {lessons[0]}-{lessons[-1]} ({len(lessons)} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import argparse
+import heapq
+import sys
+import threading
+import tracemalloc
+from array import array
+
+
+class VocabEntry:
+    """Lightweight view of one vocabulary table row"""
+
+    __slots__ = ("table", "id", "lesson")
+
+    def __init__(self, table, vocab_id, lesson=None):
+        self.table = table
+        self.id = vocab_id
+        self.lesson = lesson
+
+    def __getitem__(self, field):
+        if field == "lesson":
+            return self.lesson
+        return self.table.columns[field][self.id]
+
+    def get(self, field, default=None):
+        try:
+            value = self[field]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def to_dict(self):
+        """Get the entry in the lesson file vocabulary format"""
+        return {field: self[field] for field in VocabTable.FIELDS}
+
+
+class VocabList:
+    """Read-only list of a lesson's vocabulary, as table entries built on access from an id array"""
+
+    __slots__ = ("table", "ids")
+
+    def __init__(self, table, ids):
+        self.table = table
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [VocabEntry(self.table, vocab_id) for vocab_id in self.ids[index]]
+        return VocabEntry(self.table, self.ids[index])
+
+    def __iter__(self):
+        return (VocabEntry(self.table, vocab_id) for vocab_id in self.ids)
+
+
+class VocabTable:
+    """Global vocabulary table shared by all lessons.
+
+    Each distinct (korean, romanization, english) entry is stored once, as
+    interned strings in parallel column lists, and is referenced by an integer
+    id. Lessons keep compact arrays of ids instead of dicts, wrapped in a
+    VocabList wherever they are read like the lesson file's list.
+    """
+
+    FIELDS = ("korean", "romanization", "english")
+
+    def __init__(self):
+        self.korean = []
+        self.romanization = []
+        self.english = []
+        # Optional image path per entry (None for most words)
+        self.image = []
+        self.columns = {
+            "korean": self.korean,
+            "romanization": self.romanization,
+            "english": self.english,
+            "image": self.image
+        }
+        self.index = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.korean)
+
+    def add(self, korean, romanization, english, image=None):
+        """Get the id of an entry, adding it if it is new"""
+        key = (korean, romanization, english, image)
+        vocab_id = self.index.get(key)
+        if vocab_id is None:
+            vocab_id = len(self.korean)
+            key = (sys.intern(korean), sys.intern(romanization), sys.intern(english), image)
+            self.korean.append(key[0])
+            self.romanization.append(key[1])
+            self.english.append(key[2])
+            self.image.append(image)
+            self.index[key] = vocab_id
+        return vocab_id
+
+    def add_all(self, vocabulary):
+        """Add a lesson's vocabulary dicts, returning their ids as a compact array"""
+        with self.lock:
+            return array('I', (self.add(v["korean"], v["romanization"], v["english"], v.get("image"))
+                               for v in vocabulary))
+
+    def entry(self, vocab_id, lesson=None):
+        """Get a view of an entry, optionally tagged with the lesson it is shown under"""
+        return VocabEntry(self, vocab_id, lesson)
+
+
+# Sort orders offered by the vocabulary review
+SORT_ORDERS = ("korean", "english", "lesson")
+
+
+class VocabViews:
+    """Cached sorted views of loaded lesson vocabulary, one per sort order.
+
+    Each view is a sorted list of (key, lesson number, position, vocab id)
+    tuples built from the collation keys precomputed by the lesson compiler.
+    Adding a lesson sorts only its own words and merges them into each view,
+    so the full list is never re-sorted.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.lessons = {}
+        self.views = {order: [] for order in SORT_ORDERS}
+        self.lock = threading.Lock()
+
+    def has_lesson(self, lesson_number):
+        return lesson_number in self.lessons
+
+    def add_lesson(self, lesson):
+        """Merge a loaded lesson's vocabulary into every view"""
+        lesson_number = lesson["lesson_number"]
+        vocab_ids = lesson["vocab_ids"]
+        sort_keys = lesson["derived"]["vocabulary"]
+        title = f"Lesson {lesson_number}: {lesson.get('lesson_title', 'Unknown')}"
+
+        with self.lock:
+            if lesson_number in self.lessons:
+                return
+            self.lessons[lesson_number] = (title, vocab_ids)
+            batches = {
+                "korean": sorted((keys["sort_korean"], lesson_number, i, vocab_id)
+                                 for i, (keys, vocab_id) in enumerate(zip(sort_keys, vocab_ids))),
+                "english": sorted((keys["sort_english"], lesson_number, i, vocab_id)
+                                  for i, (keys, vocab_id) in enumerate(zip(sort_keys, vocab_ids))),
+                "lesson": [(lesson_number, lesson_number, i, vocab_id)
+                           for i, vocab_id in enumerate(vocab_ids)]
+            }
+            # Views are replaced rather than mutated so readers never see a partial merge
+            for order, batch in batches.items():
+                self.views[order] = list(heapq.merge(self.views[order], batch))
+
+    def get(self, order, lesson_numbers):
+        """Get (vocab id, lesson title) references in sort order, limited to some lessons"""
+        lesson_numbers = set(lesson_numbers)
+        lessons = self.lessons
+        return [(vocab_id, lessons[lesson_number][0])
+                for _, lesson_number, _, vocab_id in self.views[order]
+                if lesson_number in lesson_numbers]
+
+    def by_lesson(self, lesson_numbers):
+        """Get {lesson title: vocab ids} for lessons with vocabulary, in lesson order"""
+        return {self.lessons[n][0]: self.lessons[n][1]
+                for n in sorted(lesson_numbers)
+                if n in self.lessons and self.lessons[n][1]}
+
+
+def measure_memory(entries, distinct):
+    """Compare lesson dicts (plus review copies) against the table on a synthetic corpus"""
+    lesson_size = 50
+    words = [(f"단어{i}", f"daneo{i}", f"word {i}") for i in range(distinct)]
+
+    def corpus():
+        # Build fresh strings, as json.load would for every lesson file
+        for i in range(entries):
+            korean, romanization, english = words[i % distinct]
+            yield "".join(korean), "".join(romanization), "".join(english)
+
+    tracemalloc.start()
+    lessons = []
+    for i, (korean, romanization, english) in enumerate(corpus()):
+        if i % lesson_size == 0:
+            lessons.append([])
+        lessons[-1].append({"korean": korean, "romanization": romanization, "english": english})
+    review = []
+    for n, vocabulary in enumerate(lessons):
+        for vocab in vocabulary:
+            vocab_with_lesson = vocab.copy()
+            vocab_with_lesson["lesson"] = f"Lesson {n}"
+            review.append(vocab_with_lesson)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del lessons, review
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = VocabTable()
+    lesson_ids = []
+    for i, (korean, romanization, english) in enumerate(corpus()):
+        if i % lesson_size == 0:
+            lesson_ids.append(array('I'))
+        lesson_ids[-1].append(table.add(korean, romanization, english))
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return dict_bytes, table_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure vocabulary memory use on a synthetic corpus")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=200_000, help="distinct words in the corpus")
+    args = parser.parse_args()
+
+    dict_bytes, table_bytes = measure_memory(args.entries, args.distinct)
+    print(f"{args.entries} entries ({args.distinct} distinct)")
+    print(f"  dicts + review copies: {dict_bytes / 2**20:8.1f} MiB")
+    print(f"  vocab table + id arrays: {table_bytes / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()